@@ -0,0 +1,118 @@
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+
+ANALYSIS_CACHE_PATH = os.path.join(".cache", "analysis_cache.sqlite")
+
+
+def content_hash(*parts):
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def analysis_fingerprint(analysis_type, identifier, source_hash, prompt_version):
+    """Analiz türü, kaynak kimliği, içerik özeti (transkript hash'i / HEAD SHA) ve prompt sürümünden anahtar üretir."""
+    return content_hash(analysis_type, identifier, source_hash, prompt_version)
+
+
+def _connect():
+    os.makedirs(os.path.dirname(ANALYSIS_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(ANALYSIS_CACHE_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS results (
+            fingerprint TEXT PRIMARY KEY,
+            analysis_type TEXT NOT NULL,
+            identifier TEXT NOT NULL,
+            title TEXT,
+            result TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lookups (
+            analysis_type TEXT PRIMARY KEY,
+            hits INTEGER NOT NULL DEFAULT 0,
+            misses INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    return conn
+
+
+def _record_lookup(conn, analysis_type, hit):
+    column = "hits" if hit else "misses"
+    conn.execute("INSERT OR IGNORE INTO lookups (analysis_type) VALUES (?)", (analysis_type,))
+    conn.execute(f"UPDATE lookups SET {column} = {column} + 1 WHERE analysis_type = ?", (analysis_type,))
+
+
+def get_cached_analysis(fingerprint, analysis_type):
+    """Kayıtlı analizi döner ve isabet/ıska sayacını günceller; önbellek okunamazsa None döner."""
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT title, result, created_at FROM results WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                _record_lookup(conn, analysis_type, row is not None)
+                if row:
+                    conn.execute("UPDATE results SET hits = hits + 1 WHERE fingerprint = ?", (fingerprint,))
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Analiz önbelleği okunamadı: {e}")
+        return None
+    if not row:
+        return None
+    return {"title": row[0], "result": row[1], "created_at": row[2]}
+
+
+def put_cached_analysis(fingerprint, analysis_type, identifier, title, result):
+    if not result:
+        return
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (fingerprint, analysis_type, identifier, title, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (fingerprint, analysis_type, identifier, title, result, datetime.now().isoformat())
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Analiz önbelleğe yazılamadı: {e}")
+
+
+def get_analysis_cache_stats(analysis_types=None):
+    """Toplam isabet oranı ve önbellek sayesinde yapılmayan Gemini çağrısı sayısı."""
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT analysis_type, hits, misses FROM lookups").fetchall()
+        entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    finally:
+        conn.close()
+    if analysis_types:
+        rows = [row for row in rows if row[0] in analysis_types]
+    hits = sum(row[1] for row in rows)
+    misses = sum(row[2] for row in rows)
+    lookups = hits + misses
+    return {
+        "entries": entries,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "gemini_calls_avoided": hits
+    }
+
+
+def format_analysis_cache_caption(analysis_types=None):
+    stats = get_analysis_cache_stats(analysis_types)
+    return (
+        f"♻️ Analiz önbelleği: isabet oranı {stats['hit_rate']:.0%} ({stats['hits']}/{stats['hits'] + stats['misses']}) · "
+        f"kaçınılan Gemini çağrısı: {stats['gemini_calls_avoided']}"
+    )
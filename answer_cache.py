@@ -0,0 +1,90 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+import numpy as np
+
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_HOURS", "24")) * 3600
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256"))
+
+
+def _normalize(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+class SemanticAnswerCache:
+    """Soru vektörlerine göre eşleşen, doküman hash'i ile sınırlı, TTL ve LRU tahliyeli cevap önbelleği.
+
+    Kayıtlar aynı doküman kümesi (`create_document_hash`) için geçerlidir; notlar değişince eski kayıtlar
+    hiçbir soruyla eşleşmez ve LRU sırasıyla düşer.
+    """
+
+    def __init__(self, embeddings, threshold=ANSWER_CACHE_THRESHOLD, ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+                 max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def embed(self, question):
+        return _normalize(self.embeddings.embed_query(question.strip()))
+
+    def _drop_expired(self, now):
+        expired = [key for key, entry in self.entries.items() if now - entry["created_at"] > self.ttl_seconds]
+        for key in expired:
+            del self.entries[key]
+
+    def lookup(self, question, doc_hash, vector=None):
+        """Eşik üstü en benzer kaydı `(kayıt, benzerlik)` olarak döner; yoksa `(None, en iyi benzerlik)`."""
+        vector = self.embed(question) if vector is None else vector
+        with self._lock:
+            self._drop_expired(time.time())
+            best_key, best_score = None, 0.0
+            for key, entry in self.entries.items():
+                if entry["doc_hash"] != doc_hash:
+                    continue
+                score = float(np.dot(entry["vector"], vector))
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is not None and best_score >= self.threshold:
+                self.entries.move_to_end(best_key)
+                self.hits += 1
+                return self.entries[best_key], best_score
+            self.misses += 1
+            return None, best_score
+
+    def store(self, question, doc_hash, answer, sources=None, vector=None):
+        vector = self.embed(question) if vector is None else vector
+        with self._lock:
+            self.entries[uuid.uuid4().hex] = {
+                "question": question,
+                "doc_hash": doc_hash,
+                "vector": vector,
+                "answer": answer,
+                "sources": list(sources or []),
+                "created_at": time.time()
+            }
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -17,7 +17,7 @@ from pdf_utils import create_pdf_from_analysis, generate_pdf_download_button
 from quick_look import render_quick_look
 from detailed_analysis import render_detailed_analysis
 from document_utils import render_documents_page, save_user_notes, save_preliminary_analysis, get_saved_notes_list
-from transcript_utils import get_enhanced_transcript
+from transcript_utils import get_enhanced_transcript, get_transcript_sections
 from github_utils import extract_github_repo_info, generate_github_analysis_prompt
 from user_profile import ask_user_profile
 
@@ -66,7 +66,8 @@ elif menu == "📊 Detaylı Analiz":
     render_detailed_analysis(
         model=model,
         get_transcript_fn=get_enhanced_transcript,
-        save_fn=save_user_notes
+        save_fn=save_user_notes,
+        get_sections_fn=get_transcript_sections
     )
 
 elif menu == "🗂️ Dokümanlar":
@@ -0,0 +1,39 @@
+import sys
+import time
+from embedding_backends import (
+    create_huggingface_embeddings, OnnxEmbeddings, cosine_agreement, synthetic_note_texts,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_THREADS, EMBEDDING_COSINE_TOLERANCE
+)
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _time_backend(embeddings, texts):
+    embeddings.embed_documents(texts[:EMBEDDING_BATCH_SIZE])
+    start = time.perf_counter()
+    embeddings.embed_documents(texts)
+    return time.perf_counter() - start
+
+
+def main(count=2000):
+    texts = synthetic_note_texts(count)
+    print(f"Sentetik korpus: {len(texts)} chunk, batch={EMBEDDING_BATCH_SIZE}, threads={EMBEDDING_THREADS or 'varsayılan'}")
+
+    backends = {
+        "huggingface": create_huggingface_embeddings(MODEL_NAME),
+        "onnx-fp32": OnnxEmbeddings(MODEL_NAME, quantize=False),
+        "onnx-int8": OnnxEmbeddings(MODEL_NAME, quantize=True),
+    }
+    reference = backends["huggingface"]
+    sample = texts[:256]
+
+    print(f"{'backend':<14}{'süre (s)':>10}{'chunk/s':>10}{'min cos':>10}{'ort cos':>10}")
+    for name, embeddings in backends.items():
+        elapsed = _time_backend(embeddings, texts)
+        min_cosine, mean_cosine = cosine_agreement(embeddings, reference, sample)
+        status = "" if min_cosine >= 1 - EMBEDDING_COSINE_TOLERANCE else "  (tolerans dışı)"
+        print(f"{name:<14}{elapsed:>10.2f}{len(texts) / elapsed:>10.1f}{min_cosine:>10.4f}{mean_cosine:>10.4f}{status}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
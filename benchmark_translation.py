@@ -0,0 +1,28 @@
+import sys
+import time
+from embedding_backends import synthetic_note_texts
+from translation_utils import LocalTranslator, translate_lines, TRANSLATION_BATCH_CHARS, TRANSLATION_WORKERS
+
+
+def main(count=1000, latency=0.05):
+    lines = synthetic_note_texts(count, sentences_per_text=1)
+    print(f"Sentetik altyazı: {len(lines)} satır, çağrı gecikmesi={latency * 1000:.0f} ms, "
+          f"batch={TRANSLATION_BATCH_CHARS} karakter, workers={TRANSLATION_WORKERS}")
+
+    print(f"{'yöntem':<12}{'süre (s)':>10}{'çağrı':>8}")
+    sequential = LocalTranslator(latency=latency)
+    start = time.perf_counter()
+    for line in lines:
+        sequential(line)
+    print(f"{'satır satır':<12}{time.perf_counter() - start:>10.2f}{sequential.calls:>8}")
+
+    batched = LocalTranslator(latency=latency, transform=str.upper)
+    start = time.perf_counter()
+    translated = translate_lines(lines, batched)
+    elapsed = time.perf_counter() - start
+    aligned = all(out == line.upper() for out, line in zip(translated, lines))
+    print(f"{'toplu':<12}{elapsed:>10.2f}{batched.calls:>8}{'' if aligned else '  (satır eşlemesi bozuk)'}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
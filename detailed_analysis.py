@@ -1,105 +1,208 @@
-import streamlit as st
-from youtube_api import get_video_details, get_top_comments
-from utils import is_valid_url, is_safe_url, extract_video_id
-from video_analyst import generate_detailed_analysis_prompt
-
-def detailed_analysis_introduction():
-    st.header("📊 Detaylı Analiz")
-    st.markdown(
-        """
-        <div style="background-color:#f7f3ff; padding: 20px; border-radius: 10px; border-left: 5px solid #9b59b6;">
-            <p><strong>Detaylı Analiz</strong> modülü, özellikle İngilizce gibi yabancı dillerde sunulan YouTube eğitim videolarını Türkçe ve anlaşılır bir şekilde takip edebilmek için geliştirilmiştir.<br>
-            YouTube altyazıları çoğu zaman hızlı üretildiği için yer yer eksik ya da dil bilgisel olarak yetersiz kalabilir.<br>
-            Bu araç, videolardaki transkriptleri yapay zekâ desteğiyle temizleyip düzenleyerek anlamlı, bölümlenmiş ve okunabilir dokümanlara dönüştürür.
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    st.markdown("""
-        [![YouTube](https://img.shields.io/badge/-YouTube-red?logo=youtube&logoColor=white&style=flat-square)](https://www.youtube.com)
-        """, unsafe_allow_html=True)
-
-
-def render_detailed_analysis(model, get_transcript_fn, save_fn):
-    detailed_analysis_introduction()
-
-    if "detailed_analysis_result" in st.session_state:
-        st.markdown(st.session_state.detailed_analysis_result)
-        st.success("✅ Detaylı analiz tamamlandı!")
-        st.markdown("---")
-
-    col1, col2 = st.columns([9, 1])
-    with col1:
-        video_url_detailed = st.text_input("", placeholder="🎥 YouTube video linkini gir...", key="detailed_analysis_url", label_visibility="collapsed")
-    with col2:
-        detailed_btn = st.button("➤", key="detailed_analysis_btn", help="Detaylı Analiz Yap")
-
-    if detailed_btn:
-        if not is_valid_url(video_url_detailed):
-            st.error("❌ Bu geçerli bir YouTube linki değil.")
-        elif not is_safe_url(video_url_detailed):
-            st.error("🚨 Güvenli olmayan bir link algılandı.")
-        else:
-            video_id = extract_video_id(video_url_detailed)
-            if video_id:
-                details = get_video_details([video_id])
-                if details:
-                    video_info = details[0]
-                    comments = get_top_comments(video_id)
-
-                    st.session_state.video_info = video_info
-                    st.session_state.video_id = video_id
-                    st.session_state.current_video_id = video_id
-
-                    for key in ["detailed_analysis_result", "detailed_analysis_video_title"]:
-                        st.session_state.pop(key, None)
-
-                    try:
-                        with st.spinner("⏳ Analiz süreci başladı. Birkaç dakika sürebilir, dilediğiniz gibi arka planda başka işlerinize devam edebilirsiniz."):
-                            result = get_transcript_fn(video_id)
-
-                            if result and result[0]:
-                                transcript, strategy = result
-                                if strategy == "long_video":
-                                    st.warning("⚠️ Bu video 45+ dakika uzunluğunda. En anlamlı 45 dakikalık kısım seçildi.")
-                            else:
-                                st.warning("⚠️ Transkript bulunamadı, video açıklaması kullanılıyor...")
-                                st.info("💡 Bu durum şu nedenlerle olabilir:\n• Video'da konuşma yok\n• Video sahibi transkript özelliğini kapatmış\n• Video çok yeni (transkript henüz oluşturulmamış)")
-                                transcript = video_info.get("description", "")
-
-                            detailed_prompt = generate_detailed_analysis_prompt(
-                                title=video_info["title"],
-                                description=video_info.get("description", ""),
-                                comments=[],
-                                transcript=transcript,
-                                user_language="tr"
-                            )
-
-                            detailed_response = model.generate_content(detailed_prompt)
-                            st.session_state.detailed_analysis_result = detailed_response.text
-                            st.session_state.detailed_analysis_video_title = video_info["title"]
-
-                        st.markdown(st.session_state.detailed_analysis_result)
-                        st.success("✅ Detaylı analiz tamamlandı!")
-
-                        saved_file = save_fn(
-                            video_id=video_id,
-                            video_title=video_info["title"],
-                            analysis_result=st.session_state.detailed_analysis_result,
-                            source_url=video_url_detailed
-                        )
-
-                        if saved_file:
-                            st.markdown("---")
-                            st.info("💡 Bu analiz otomatik olarak kaydedildi. Tüm analizlerinize '🗂️ Dokümanlar' menüsünden ulaşabilirsiniz.")
-                        else:
-                            st.error("❌ Analiz kaydedilirken hata oluştu.")
-
-                    except Exception as e:
-                        if "500" in str(e) or "internal error" in str(e).lower():
-                            st.error("❌ API hatası: Video çok uzun veya transkript çok büyük. Lütfen daha kısa bir video deneyin.")
-                            st.info("💡 Öneriler: 30 dakikadan kısa videolar daha iyi sonuç verir.")
-                        else:
-                            st.error(f"❌ Detaylı analiz hatası: {e}")
-            else:
-                st.error("⚠️ Video ID çıkarılamadı.")
\ No newline at end of file
+import streamlit as st
+from youtube_api import get_video_details, get_top_comments
+from utils import is_valid_url, is_safe_url, extract_video_id, parse_iso8601_duration
+from video_analyst import generate_detailed_analysis_prompt, DETAILED_ANALYSIS_PROMPT_VERSION, MAP_REDUCE_PROMPT_VERSION
+from map_reduce import group_sections, analyze_sections, build_reduce_prompt, MAP_REDUCE_ENABLED, LONG_VIDEO_SECONDS
+from metrics import timed_stream, gemini_text_stream, format_ttft_caption
+from translation_memory import get_translation_memory
+from transcript_utils import transcript_hash
+from token_budget import get_token_counter, prompt_overhead, record_prompt_tokens, DETAILED_PROMPT_TOKEN_BUDGET
+from analysis_cache import (
+    analysis_fingerprint, content_hash, get_cached_analysis, put_cached_analysis, format_analysis_cache_caption
+)
+
+def detailed_analysis_introduction():
+    st.header("📊 Detaylı Analiz")
+    st.markdown(
+        """
+        <div style="background-color:#f7f3ff; padding: 20px; border-radius: 10px; border-left: 5px solid #9b59b6;">
+            <p><strong>Detaylı Analiz</strong> modülü, özellikle İngilizce gibi yabancı dillerde sunulan YouTube eğitim videolarını Türkçe ve anlaşılır bir şekilde takip edebilmek için geliştirilmiştir.<br>
+            YouTube altyazıları çoğu zaman hızlı üretildiği için yer yer eksik ya da dil bilgisel olarak yetersiz kalabilir.<br>
+            Bu araç, videolardaki transkriptleri yapay zekâ desteğiyle temizleyip düzenleyerek anlamlı, bölümlenmiş ve okunabilir dokümanlara dönüştürür.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    st.markdown("""
+        [![YouTube](https://img.shields.io/badge/-YouTube-red?logo=youtube&logoColor=white&style=flat-square)](https://www.youtube.com)
+        """, unsafe_allow_html=True)
+
+
+def render_detailed_analysis(model, get_transcript_fn, save_fn, get_sections_fn=None):
+    detailed_analysis_introduction()
+
+    if "detailed_analysis_result" in st.session_state:
+        st.markdown(st.session_state.detailed_analysis_result)
+        st.success("✅ Detaylı analiz tamamlandı!")
+        st.markdown("---")
+
+    col1, col2 = st.columns([9, 1])
+    with col1:
+        video_url_detailed = st.text_input("", placeholder="🎥 YouTube video linkini gir...", key="detailed_analysis_url", label_visibility="collapsed")
+    with col2:
+        detailed_btn = st.button("➤", key="detailed_analysis_btn", help="Detaylı Analiz Yap")
+    use_cache = not st.checkbox("🔁 Yeniden analiz et (kayıtlı sonucu kullanma)", key="detailed_analysis_rerun")
+
+    if detailed_btn:
+        if not is_valid_url(video_url_detailed):
+            st.error("❌ Bu geçerli bir YouTube linki değil.")
+        elif not is_safe_url(video_url_detailed):
+            st.error("🚨 Güvenli olmayan bir link algılandı.")
+        else:
+            video_id = extract_video_id(video_url_detailed)
+            if video_id:
+                details = get_video_details([video_id])
+                if details:
+                    video_info = details[0]
+                    comments = get_top_comments(video_id)
+
+                    st.session_state.video_info = video_info
+                    st.session_state.video_id = video_id
+                    st.session_state.current_video_id = video_id
+
+                    for key in ["detailed_analysis_result", "detailed_analysis_video_title"]:
+                        st.session_state.pop(key, None)
+
+                    try:
+                        with st.spinner("⏳ Analiz süreci başladı. Birkaç dakika sürebilir, dilediğiniz gibi arka planda başka işlerinize devam edebilirsiniz."):
+                            progress_bar = st.progress(0.0, text="📝 Transkript işleniyor...")
+                            report_progress = lambda ratio: progress_bar.progress(
+                                ratio, text=f"📝 Transkript işleniyor... %{ratio * 100:.0f}"
+                            )
+                            sections = None
+                            use_map_reduce = (
+                                MAP_REDUCE_ENABLED and get_sections_fn is not None and
+                                parse_iso8601_duration(video_info.get("duration")) > LONG_VIDEO_SECONDS
+                            )
+                            build_prompt = lambda transcript_text: generate_detailed_analysis_prompt(
+                                title=video_info["title"],
+                                description=video_info.get("description", ""),
+                                comments=[],
+                                transcript=transcript_text,
+                                user_language="tr"
+                            )
+                            prompt_version = (
+                                f"{DETAILED_ANALYSIS_PROMPT_VERSION}+mr{MAP_REDUCE_PROMPT_VERSION}"
+                                if use_map_reduce else DETAILED_ANALYSIS_PROMPT_VERSION
+                            )
+                            # Parmak izi ham transkriptten alınır; kayıtlı analiz varsa temizleme/çeviri hattı hiç çalışmaz
+                            raw_hash = transcript_hash(video_id)
+                            fingerprint = analysis_fingerprint(
+                                "detailed", video_id, content_hash(raw_hash, DETAILED_PROMPT_TOKEN_BUDGET), prompt_version
+                            )
+                            cached = get_cached_analysis(fingerprint, "detailed") if use_cache and raw_hash else None
+
+                            result = None
+                            if cached:
+                                progress_bar.empty()
+                            elif use_map_reduce:
+                                # Bölümler henüz üretilmedi; map adımı onları hat ilerledikçe tüketecek
+                                sections, strategy = get_sections_fn(video_id, progress_callback=report_progress)
+                                st.info("📚 Uzun video: transkriptin tamamı bölüm bölüm analiz edilip birleştirilecek.")
+                            else:
+                                transcript_budget = DETAILED_PROMPT_TOKEN_BUDGET - prompt_overhead(build_prompt, get_token_counter())
+                                result = get_transcript_fn(video_id, progress_callback=report_progress, max_tokens=transcript_budget)
+                                progress_bar.empty()
+                                if result and result[0]:
+                                    transcript, strategy = result
+                                    if strategy == "long_video":
+                                        st.warning("⚠️ Bu video 45+ dakika uzunluğunda. En anlamlı 45 dakikalık kısım seçildi.")
+                                    _render_translation_memory_caption()
+                                else:
+                                    progress_bar.empty()
+                                    st.warning("⚠️ Transkript bulunamadı, video açıklaması kullanılıyor...")
+                                    st.info("💡 Bu durum şu nedenlerle olabilir:\n• Video'da konuşma yok\n• Video sahibi transkript özelliğini kapatmış\n• Video çok yeni (transkript henüz oluşturulmamış)")
+                                    transcript = video_info.get("description", "")
+                                detailed_prompt = build_prompt(transcript)
+                                if not raw_hash:
+                                    fingerprint = analysis_fingerprint("detailed", video_id, content_hash(transcript), prompt_version)
+
+                        if cached:
+                            st.session_state.detailed_analysis_result = cached["result"]
+                            st.session_state.detailed_analysis_video_title = video_info["title"]
+                            st.markdown(cached["result"])
+                            st.success("✅ Detaylı analiz tamamlandı!")
+                            st.info(f"♻️ Transkript değişmediği için {cached['created_at'][:16].replace('T', ' ')} tarihli kayıtlı analiz gösteriliyor. "
+                                    "Yeniden çalıştırmak için '🔁 Yeniden analiz et' kutusunu işaretleyin.")
+                            st.caption(format_analysis_cache_caption(("detailed",)))
+                            return
+
+                        if sections is not None:
+                            detailed_prompt = _run_map_reduce(model, video_id, video_info["title"], sections, use_cache)
+                            progress_bar.empty()
+                            _render_translation_memory_caption()
+                            if detailed_prompt is None:
+                                return
+
+                        usage = {}
+                        st.session_state.detailed_analysis_result = st.write_stream(
+                            timed_stream(gemini_text_stream(model, detailed_prompt, usage), "detailed_analysis")
+                        )
+                        st.session_state.detailed_analysis_video_title = video_info["title"]
+                        put_cached_analysis(
+                            fingerprint, "detailed", video_id, video_info["title"], st.session_state.detailed_analysis_result
+                        )
+
+                        st.success("✅ Detaylı analiz tamamlandı!")
+                        ttft_caption = format_ttft_caption("detailed_analysis")
+                        if ttft_caption:
+                            st.caption(ttft_caption)
+                        estimated_tokens, actual_tokens = record_prompt_tokens(
+                            detailed_prompt, usage.get("prompt_tokens"), get_token_counter(), "detailed_analysis"
+                        )
+                        if actual_tokens:
+                            st.caption(f"🔢 Prompt: {actual_tokens} token (tahmin {estimated_tokens})")
+
+                        saved_file = save_fn(
+                            video_id=video_id,
+                            video_title=video_info["title"],
+                            analysis_result=st.session_state.detailed_analysis_result,
+                            source_url=video_url_detailed
+                        )
+
+                        if saved_file:
+                            st.markdown("---")
+                            st.info("💡 Bu analiz otomatik olarak kaydedildi. Tüm analizlerinize '🗂️ Dokümanlar' menüsünden ulaşabilirsiniz.")
+                        else:
+                            st.error("❌ Analiz kaydedilirken hata oluştu.")
+
+                    except Exception as e:
+                        if "500" in str(e) or "internal error" in str(e).lower():
+                            st.error("❌ API hatası: Video çok uzun veya transkript çok büyük. Lütfen daha kısa bir video deneyin.")
+                            st.info("💡 Öneriler: 30 dakikadan kısa videolar daha iyi sonuç verir.")
+                        else:
+                            st.error(f"❌ Detaylı analiz hatası: {e}")
+            else:
+                st.error("⚠️ Video ID çıkarılamadı.")
+
+
+def _render_translation_memory_caption():
+    memory_stats = get_translation_memory().stats()
+    if memory_stats["hits"] + memory_stats["misses"]:
+        st.caption(
+            f"🧠 Çeviri belleği: {memory_stats['entries']} kayıt · "
+            f"isabet oranı {memory_stats['hit_rate']:.0%}"
+        )
+
+
+def _run_map_reduce(model, video_id, title, sections, use_cache=True):
+    """Bölümler transkript hattından geldikçe analize gönderilir; birleştirme prompt'unu, başarısız bölüm varsa None döner."""
+    progress_bar = st.progress(0.0, text="🧩 Bölümler hazırlandıkça analiz ediliyor...")
+    section_analyses, failed, cached_count = analyze_sections(
+        model, video_id, title, group_sections(sections),
+        progress_callback=lambda ratio: progress_bar.progress(ratio, text=f"🧩 Bölümler analiz ediliyor... %{ratio * 100:.0f}"),
+        use_cache=use_cache
+    )
+    progress_bar.empty()
+    group_count = len(section_analyses) + len(failed)
+    if cached_count:
+        st.caption(f"♻️ {cached_count}/{group_count} bölüm analizi önbellekten alındı.")
+
+    if failed:
+        failed_ranges = ", ".join(
+            f"{int(section['start']//60):02d}:{int(section['start']%60):02d}" for section, _ in failed
+        )
+        st.error(f"❌ {len(failed)} bölüm analiz edilemedi ({failed_ranges}). Tamamlanan bölümler kaydedildi; "
+                 "tekrar denediğinizde yalnızca bu bölümler analiz edilecek.")
+        return None
+    return build_reduce_prompt(title, section_analyses)
@@ -1,246 +1,338 @@
-import os
-import json
-import streamlit as st
-from pdf_utils import generate_pdf_download_button
-from datetime import datetime
-
-def render_documents_page(get_saved_notes_list):
-    st.header("🗂️ Dokümanlar")
-    st.markdown(
-        """
-        <div style="background-color:#f7f3ff; padding: 20px; border-radius: 10px; border-left: 5px solid #9b59b6;">
-            <p><strong>Tüm analizlerinizi</strong> bu bölümde listeleyebilir, başlığa, içeriğe veya tarihe göre arama yapabilirsiniz.</p>
-            <p>🧾 İsterseniz geçmiş analizlerinizi PDF olarak indirebilir veya tamamen silebilirsiniz.</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-    saved_notes = get_saved_notes_list()
-
-    if not saved_notes:
-        st.info("📊 Henüz kaydedilmiş analiz bulunmuyor. Detaylı video analizi yaptıktan sonra analizleriniz burada görünecek.")
-        return
-    st.write("\n")
-    type_filter = st.radio("📁 Doküman Türü:", ["Tümü", "Hızlı Bakış", "Detaylı Analiz"], horizontal=True)
-    search_option, search_term, search_btn = _render_search_box()
-
-    filtered_by_type = _filter_by_type(saved_notes, type_filter)
-    display_notes = _filter_notes(filtered_by_type, search_option, search_term) if search_btn and search_term else [(note, None) for note in filtered_by_type]
-
-    st.markdown("---")
-    st.subheader("📚 Tüm Analizler")
-    st.caption(f"🧾 {len(display_notes)} kayıt bulundu")
-
-    if not display_notes:
-        st.info("📊 Gösterilecek analiz bulunmuyor.")
-        return
-
-    _render_notes_list(display_notes)
-
-
-def _render_search_box():
-    col1, col2, col3 = st.columns([2, 4, 1])
-    with col1:
-        search_option = st.selectbox("🔍 Arama türü:", ["Video başlığına göre", "Analiz içeriğine göre", "Tarihe göre"])
-    with col2:
-        if search_option == "Video başlığına göre":
-            search_term = st.text_input("📝 Video başlığında ara:", placeholder="Örnek: LangChain, Python, AI...")
-        elif search_option == "Analiz içeriğine göre":
-            search_term = st.text_input("📝 Analiz içeriğinde ara:", placeholder="Örnek: önemli, hatırla, araştır...")
-        else:
-            search_term = st.date_input("📅 Tarih seçin:")
-    with col3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        search_btn = st.button("🔍", help="Ara")
-    return search_option, search_term, search_btn
-
-
-def _filter_by_type(notes, selected_type):
-    if selected_type == "Tümü":
-        return notes
-    elif selected_type == "Hızlı Bakış":
-        return [note for note in notes if note['analysis_type'] != 'detailed']
-    else:
-        return [note for note in notes if note['analysis_type'] == 'detailed']
-
-
-def _filter_notes(saved_notes, search_option, search_term):
-    filtered_notes = []
-    for note in saved_notes:
-        try:
-            with open(note['filepath'], 'r', encoding='utf-8') as f:
-                note_data = json.load(f)
-            if search_option == "Video başlığına göre":
-                if search_term.lower() in note_data.get('video_title', '').lower() or search_term.lower() in note_data.get('title', '').lower():
-                    filtered_notes.append((note, note_data))
-            elif search_option == "Analiz içeriğine göre":
-                if search_term.lower() in note_data.get('analysis_result', '').lower():
-                    filtered_notes.append((note, note_data))
-            else:
-                if str(search_term) in note_data.get('created_at', '')[:10]:
-                    filtered_notes.append((note, note_data))
-        except:
-            continue
-    if not filtered_notes:
-        st.warning("🔍 Arama kriterlerinize uygun analiz bulunamadı.")
-    return filtered_notes
-
-
-def _render_notes_list(display_notes):
-    for i, (note, note_data) in enumerate(display_notes):
-        if note_data is None:
-            try:
-                with open(note['filepath'], 'r', encoding='utf-8') as f:
-                    note_data = json.load(f)
-            except:
-                continue
-
-        with st.expander(f"{note['title']} - {note['updated_at'][:10]}"):
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(note_data.get('combined_document', 'Analiz bulunamadı'))
-            with col2:
-                _render_note_metadata(note_data)
-                generate_pdf_download_button(note_data, i)
-                if st.button(f"🗑️ Sil", key=f"delete_note_{i}"):
-                    try:
-                        os.remove(note['filepath'])
-                        st.success("✅ Analiz silindi!")
-                        st.rerun()
-                    except:
-                        st.error("❌ Analiz silinirken hata oluştu.")
-
-
-def _render_note_metadata(note_data):
-    created_date = note_data.get('created_at', '')[:10]
-    st.markdown(f"**📅 Tarih:** {created_date}")
-    analysis_type = note_data.get('analysis_type', 'detailed')
-
-    if analysis_type == 'detailed':
-        video_id = note_data.get('video_id', '')
-        if video_id:
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            st.markdown(f"**🎥 Video:** [🔗 YouTube'da İzle]({url})")
-            st.video(url, start_time=0)
-    elif analysis_type == 'youtube_preliminary':
-        identifier = note_data.get('identifier', '')
-        if identifier:
-            url = f"https://www.youtube.com/watch?v={identifier}"
-            st.markdown(f"**🎥 Video:** [🔗 YouTube'da İzle]({url})")
-            st.video(url, start_time=0)
-    elif analysis_type == 'github_preliminary':
-        identifier = note_data.get('identifier', '')
-        if identifier:
-            url = identifier if 'github.com' in identifier else f"https://github.com/{identifier}"
-            st.markdown(f"**🔗 GitHub:** [📂 Repository'yi Görüntüle]({url})")
-            _render_github_preview(identifier)
-    else:
-        st.markdown(f"**🔍 Analiz Türü:** {analysis_type.replace('_', ' ').title()}")
-        st.markdown(f"**🆔 Tanımlayıcı:** {note_data.get('identifier', '')}")
-
-
-def _render_github_preview(identifier):
-    if '/' in identifier and 'github.com' not in identifier:
-        owner, repo = identifier.split('/', 1)
-        api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        try:
-            response = requests.get(api_url)
-            if response.status_code == 200:
-                repo_data = response.json()
-                st.markdown(f"**📊 Stars:** {repo_data.get('stargazers_count', 0)}")
-                st.markdown(f"**🌿 Forks:** {repo_data.get('forks_count', 0)}")
-                st.markdown(f"**💻 Language:** {repo_data.get('language', 'N/A')}")
-        except:
-            pass
-
-def save_user_notes(video_id, video_title, analysis_result, source_url=None):
-    import os, json
-    from datetime import datetime
-
-    os.makedirs("notes", exist_ok=True)
-    filename = f"notes/{video_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-
-    combined_document = f"""# 📊 Video Analizi: {video_title}\n\n{analysis_result}\n\n---\n*Kaynak: {source_url if source_url else "Bilinmeyen"}*\n*Oluşturulma Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}*"""
-
-    notes_data = {
-        "video_id": video_id,
-        "video_title": video_title,
-        "analysis_result": analysis_result,
-        "source_url": source_url,
-        "combined_document": combined_document,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "filepath": filename
-    }
-
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(notes_data, f, ensure_ascii=False, indent=2)
-        return filename if os.path.exists(filename) else None
-    except Exception:
-        return None
-
-
-def save_preliminary_analysis(analysis_type, identifier, title, analysis_result, source_url=None):
-    os.makedirs("notes", exist_ok=True)
-    filename = f"notes/{analysis_type}_{identifier}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    combined_document = f"""# 🚀 Hızlı Bakış: {title}
-
-{analysis_result}
-
-"""
-    notes_data = {
-        "analysis_type": analysis_type,
-        "identifier": identifier,
-        "title": title,
-        "analysis_result": analysis_result,
-        "source_url": source_url,
-        "combined_document": combined_document,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "filepath": filename
-    }
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(notes_data, f, ensure_ascii=False, indent=2)
-        return filename if os.path.exists(filename) else None
-    except:
-        return None
-
-
-def get_saved_notes_list():
-    try:
-        if not os.path.exists("notes"):
-            return []
-
-        notes_list = []
-        for filename in os.listdir("notes"):
-            if filename.endswith(".json"):
-                filepath = os.path.join("notes", filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        title = data.get('title', data.get('video_title', 'Bilinmeyen'))
-                        analysis_type = data.get('analysis_type', 'detailed')
-                        if analysis_type == 'youtube_preliminary':
-                            title = f"🚀 Hızlı Bakış: {title}"
-                        elif analysis_type == 'github_preliminary':
-                            title = f"🚀 Hızlı Bakış: {title}"
-                        else:
-                            title = f"📊 Detaylı Analiz: {title}"
-
-                        notes_list.append({
-                            "filename": filename,
-                            "title": title,
-                            "created_at": data.get("created_at", ""),
-                            "updated_at": data.get("updated_at", ""),
-                            "filepath": filepath,
-                            "analysis_type": analysis_type
-                        })
-                except:
-                    continue
-
-        return sorted(notes_list, key=lambda x: x["updated_at"], reverse=True)
-    except:
+import os
+import math
+import json
+import streamlit as st
+from pdf_utils import generate_pdf_download_button, invalidate_note_pdf
+from pdf_cache import get_pdf_cache_stats
+from pdf_export import export_notes_zip, remove_export
+from notes_index import refresh_notes_index, list_indexed_notes, index_note, remove_note_from_index, search_notes, is_detailed_note
+from notes_archive import note_filename, load_note, merge_note_versions, NOTES_SAVE_MODE
+from github_utils import github_get, GITHUB_API_BASE
+from github_cache import format_github_quota_caption
+from datetime import datetime
+
+SEARCH_OPTION_FIELDS = {
+    "Video başlığına göre": "title",
+    "Analiz içeriğine göre": "content",
+    "Tarihe göre": "date"
+}
+PAGE_SIZE_OPTIONS = [10, 25, 50]
+TYPE_FILTER_DETAILED = {
+    "Tümü": None,
+    "Hızlı Bakış": False,
+    "Detaylı Analiz": True
+}
+
+
+def render_documents_page(get_saved_notes_list):
+    st.header("🗂️ Dokümanlar")
+    st.markdown(
+        """
+        <div style="background-color:#f7f3ff; padding: 20px; border-radius: 10px; border-left: 5px solid #9b59b6;">
+            <p><strong>Tüm analizlerinizi</strong> bu bölümde listeleyebilir, başlığa, içeriğe veya tarihe göre arama yapabilirsiniz.</p>
+            <p>🧾 İsterseniz geçmiş analizlerinizi PDF olarak indirebilir veya tamamen silebilirsiniz.</p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    saved_notes = get_saved_notes_list()
+
+    if not saved_notes:
+        st.info("📊 Henüz kaydedilmiş analiz bulunmuyor. Detaylı video analizi yaptıktan sonra analizleriniz burada görünecek.")
+        return
+    st.write("\n")
+    type_filter = st.radio("📁 Doküman Türü:", ["Tümü", "Hızlı Bakış", "Detaylı Analiz"], horizontal=True)
+    search_option, search_term, search_btn = _render_search_box()
+
+    if search_btn:
+        st.session_state.notes_search = (search_option, search_term) if search_term else None
+        st.session_state.notes_page = 1
+    active_search = st.session_state.get("notes_search")
+
+    if active_search:
+        total, fetch_page = _search_pager(*active_search, detailed=TYPE_FILTER_DETAILED[type_filter])
+    else:
+        filtered_by_type = _filter_by_type(saved_notes, TYPE_FILTER_DETAILED[type_filter])
+        total = len(filtered_by_type)
+
+        def fetch_page(offset, limit):
+            return filtered_by_type[offset:] if limit is None else filtered_by_type[offset:offset + limit]
+
+    st.markdown("---")
+    st.subheader("📚 Tüm Analizler")
+    st.caption(f"🧾 {total} kayıt bulundu")
+
+    if not total:
+        st.info("📊 Gösterilecek analiz bulunmuyor.")
+        return
+
+    _render_bulk_export(total, fetch_page)
+    _render_notes_list(total, fetch_page)
+
+
+def _render_search_box():
+    col1, col2, col3 = st.columns([2, 4, 1])
+    with col1:
+        search_option = st.selectbox("🔍 Arama türü:", ["Video başlığına göre", "Analiz içeriğine göre", "Tarihe göre"])
+    with col2:
+        if search_option == "Video başlığına göre":
+            search_term = st.text_input("📝 Video başlığında ara:", placeholder="Örnek: LangChain, Python, AI...")
+        elif search_option == "Analiz içeriğine göre":
+            search_term = st.text_input("📝 Analiz içeriğinde ara:", placeholder="Örnek: önemli, hatırla, araştır...")
+        else:
+            search_term = st.date_input("📅 Tarih seçin:")
+    with col3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        search_btn = st.button("🔍", help="Ara")
+    return search_option, search_term, search_btn
+
+
+def _filter_by_type(notes, detailed):
+    if detailed is None:
+        return notes
+    return [note for note in notes if is_detailed_note(note) == detailed]
+
+
+def _search_pager(search_option, search_term, detailed=None):
+    """Arama sonuçlarını sayfa sayfa FTS sorgusundan çeker; `(toplam, fetch_page(offset, limit))` döner."""
+    field = SEARCH_OPTION_FIELDS[search_option]
+
+    def fetch_page(offset, limit):
+        try:
+            return search_notes(search_term, field=field, limit=limit, offset=offset, detailed=detailed)[0]
+        except:
+            return []
+
+    try:
+        _, total = search_notes(search_term, field=field, limit=0, detailed=detailed)
+    except:
+        total = 0
+    if not total:
+        st.warning("🔍 Arama kriterlerinize uygun analiz bulunamadı.")
+    return total, fetch_page
+
+
+def _render_bulk_export(total, fetch_page):
+    with st.expander(f"📦 Toplu PDF Dışa Aktarma ({total} kayıt)"):
+        if st.button("📦 Listelenen analizleri ZIP olarak hazırla", key="bulk_export_btn"):
+            notes = fetch_page(0, None)
+            progress = st.progress(0.0, text="📄 PDF'ler hazırlanıyor...")
+
+            def update_progress(done, total):
+                progress.progress(done / total if total else 1.0, text=f"📄 {done}/{total} PDF hazır")
+
+            _clear_bulk_export()
+            try:
+                zip_path, failed = export_notes_zip(notes, progress_callback=update_progress)
+                # Oturumda yalnızca diskteki ZIP'in yolu tutulur
+                st.session_state.bulk_export_zip = zip_path
+                if failed:
+                    st.warning(f"⚠️ {len(failed)} analiz için PDF oluşturulamadı.")
+            except Exception as e:
+                st.error(f"❌ Toplu dışa aktarma hatası: {e}")
+
+        zip_path = st.session_state.get("bulk_export_zip")
+        if zip_path and not os.path.exists(zip_path):
+            st.session_state.pop("bulk_export_zip")
+        elif zip_path:
+            with open(zip_path, "rb") as zip_file:
+                st.download_button(
+                    label="⬇️ ZIP İndir",
+                    data=zip_file,
+                    file_name=f"analizler_{datetime.now().strftime('%Y%m%d')}.zip",
+                    mime="application/zip",
+                    key="bulk_export_download",
+                    on_click=_clear_bulk_export
+                )
+
+
+def _clear_bulk_export():
+    """İndirilen veya yenisiyle değiştirilen ZIP'i diskten ve oturumdan kaldırır."""
+    remove_export(st.session_state.pop("bulk_export_zip", None))
+
+
+def _render_notes_list(total, fetch_page):
+    col1, col2, _ = st.columns([1, 1, 3])
+    with col1:
+        page_size = st.selectbox("📄 Sayfa başına kayıt:", PAGE_SIZE_OPTIONS, key="notes_page_size")
+    page_count = max(1, math.ceil(total / page_size))
+    if st.session_state.get("notes_page", 1) > page_count:
+        st.session_state.notes_page = 1
+    with col2:
+        page = st.number_input(f"📑 Sayfa (1-{page_count}):", min_value=1, max_value=page_count, step=1, key="notes_page")
+
+    for note in fetch_page((page - 1) * page_size, page_size):
+        _render_note_item(note, None)
+
+    pdf_stats = get_pdf_cache_stats()
+    st.caption(f"📄 PDF önbelleği: {pdf_stats['hits']} isabet, {pdf_stats['misses']} yeniden oluşturma, {pdf_stats['entries']} dosya")
+
+
+@st.fragment
+def _render_note_item(note, note_data):
+    if note_data is None:
+        try:
+            with open(note['filepath'], 'r', encoding='utf-8') as f:
+                note_data = json.load(f)
+        except:
+            return
+
+    with st.expander(f"{note['title']} - {note['updated_at'][:10]}"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(note_data.get('combined_document', 'Analiz bulunamadı'))
+        with col2:
+            _render_note_metadata(note_data)
+            generate_pdf_download_button(note_data, note['filename'])
+            if st.button(f"🗑️ Sil", key=f"delete_note_{note['filename']}"):
+                try:
+                    delete_note(note['filepath'])
+                    st.success("✅ Analiz silindi!")
+                    st.rerun()
+                except:
+                    st.error("❌ Analiz silinirken hata oluştu.")
+
+
+def _render_note_metadata(note_data):
+    created_date = note_data.get('created_at', '')[:10]
+    st.markdown(f"**📅 Tarih:** {created_date}")
+    analysis_type = note_data.get('analysis_type', 'detailed')
+
+    if analysis_type == 'detailed':
+        video_id = note_data.get('video_id', '')
+        if video_id:
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            st.markdown(f"**🎥 Video:** [🔗 YouTube'da İzle]({url})")
+            st.video(url, start_time=0)
+    elif analysis_type == 'youtube_preliminary':
+        identifier = note_data.get('identifier', '')
+        if identifier:
+            url = f"https://www.youtube.com/watch?v={identifier}"
+            st.markdown(f"**🎥 Video:** [🔗 YouTube'da İzle]({url})")
+            st.video(url, start_time=0)
+    elif analysis_type == 'github_preliminary':
+        identifier = note_data.get('identifier', '')
+        if identifier:
+            repo_path = _github_repo_path(identifier)
+            st.markdown(f"**🔗 GitHub:** [📂 Repository'yi Görüntüle](https://github.com/{repo_path})")
+            _render_github_preview(repo_path)
+    else:
+        st.markdown(f"**🔍 Analiz Türü:** {analysis_type.replace('_', ' ').title()}")
+        st.markdown(f"**🆔 Tanımlayıcı:** {note_data.get('identifier', '')}")
+
+
+def _github_repo_path(identifier):
+    """Not tanımlayıcısını `owner/repo` biçimine çevirir; ön analizler `owner_repo` olarak kaydedilir
+    (GitHub kullanıcı adlarında alt çizgi bulunamaz)."""
+    if 'github.com' in identifier:
+        return '/'.join(identifier.split('github.com/', 1)[-1].strip('/').split('/')[:2])
+    if '/' in identifier:
+        return identifier
+    return identifier.replace('_', '/', 1)
+
+
+def _render_github_preview(repo_path):
+    if '/' not in repo_path:
+        return
+    try:
+        response = github_get(f"{GITHUB_API_BASE}/repos/{repo_path}")
+        if response.status_code == 200:
+            repo_data = response.json()
+            st.markdown(f"**📊 Stars:** {repo_data.get('stargazers_count', 0)}")
+            st.markdown(f"**🌿 Forks:** {repo_data.get('forks_count', 0)}")
+            st.markdown(f"**💻 Language:** {repo_data.get('language', 'N/A')}")
+        st.caption(format_github_quota_caption())
+    except:
+        pass
+
+def save_user_notes(video_id, video_title, analysis_result, source_url=None):
+    os.makedirs("notes", exist_ok=True)
+    filename = note_filename("detailed", video_id)
+
+    combined_document = f"""# 📊 Video Analizi: {video_title}\n\n{analysis_result}\n\n---\n*Kaynak: {source_url if source_url else "Bilinmeyen"}*\n*Oluşturulma Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}*"""
+
+    notes_data = {
+        "video_id": video_id,
+        "video_title": video_title,
+        "analysis_result": analysis_result,
+        "source_url": source_url,
+        "combined_document": combined_document,
+        "created_at": datetime.now().isoformat(),
+        "updated_at": datetime.now().isoformat(),
+        "filepath": filename
+    }
+    return _write_note(filename, notes_data)
+
+
+def save_preliminary_analysis(analysis_type, identifier, title, analysis_result, source_url=None):
+    os.makedirs("notes", exist_ok=True)
+    filename = note_filename(analysis_type, identifier)
+    combined_document = f"""# 🚀 Hızlı Bakış: {title}
+
+{analysis_result}
+
+"""
+    notes_data = {
+        "analysis_type": analysis_type,
+        "identifier": identifier,
+        "title": title,
+        "analysis_result": analysis_result,
+        "source_url": source_url,
+        "combined_document": combined_document,
+        "created_at": datetime.now().isoformat(),
+        "updated_at": datetime.now().isoformat(),
+        "filepath": filename
+    }
+    return _write_note(filename, notes_data)
+
+
+def _write_note(filename, notes_data):
+    """Upsert modunda aynı analizin dosyasını günceller; gövde değişmemişse dosyaya dokunmaz."""
+    existing = load_note(filename) if NOTES_SAVE_MODE == "upsert" else None
+    notes_data = merge_note_versions(existing, notes_data)
+    if notes_data is None:
+        return filename
+
+    _invalidate_existing_note_pdf(filename)
+    try:
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(notes_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, filename)
+        index_note(filename, notes_data)
+        _update_note_vectors(filename)
+        return filename if os.path.exists(filename) else None
+    except:
+        return None
+
+
+def _invalidate_existing_note_pdf(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            invalidate_note_pdf(json.load(f))
+    except:
+        pass
+
+
+def _update_note_vectors(filepath, deleted=False):
+    try:
+        from rag_chatbot import update_note_vectors
+        update_note_vectors(filepath, deleted=deleted)
+    except Exception as e:
+        print(f"Vektör indeksi güncellenemedi ({filepath}): {e}")
+
+
+def delete_note(filepath):
+    _invalidate_existing_note_pdf(filepath)
+    os.remove(filepath)
+    remove_note_from_index(filepath)
+    _update_note_vectors(filepath, deleted=True)
+
+
+def get_saved_notes_list():
+    try:
+        refresh_notes_index()
+        return list_indexed_notes()
+    except:
         return []
\ No newline at end of file
@@ -0,0 +1,175 @@
+import os
+import random
+import inspect
+import traceback
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.embeddings import HuggingFaceEmbeddings
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+EMBEDDING_COSINE_TOLERANCE = float(os.getenv("EMBEDDING_COSINE_TOLERANCE", "0.02"))
+EMBEDDING_MAX_SEQ_LENGTH = 256
+ONNX_MODEL_DIR = os.path.join(".cache", "onnx")
+
+_backend_status = {"requested": EMBEDDING_BACKEND, "active": "huggingface", "error": None}
+
+_SYNTHETIC_SUBJECTS = [
+    "LangChain", "FAISS indeksi", "Streamlit arayüzü", "Python listesi", "REST API", "Docker imajı",
+    "PyTorch modeli", "SQL sorgusu", "React bileşeni", "Gemini modeli", "vektör veritabanı", "CI pipeline"
+]
+_SYNTHETIC_PHRASES = [
+    "Bu bölümde {s} nasıl kurulur adım adım gösteriliyor.",
+    "Şimdi {s} için gerekli ayarları yapıyoruz ve çıktıyı kontrol ediyoruz.",
+    "Okay, so now let's go ahead and configure the {s}.",
+    "{s} kullanılırken sık yapılan hatalar ve çözümleri anlatılıyor.",
+    "The speaker compares {s} with the previous approach and measures latency.",
+    "`pip install` komutu ile {s} bağımlılıkları yükleniyor.",
+    "Finally, the {s} is deployed and tested with real data.",
+    "İğne, şişe, çığ, ölçü gibi Türkçe karakterler {s} örneğinde korunuyor.",
+]
+
+
+def synthetic_note_texts(count, seed=42, sentences_per_text=8):
+    """Benchmark ve doğrulama için not chunk'larına benzeyen sentetik Türkçe/İngilizce metinler üretir."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_SYNTHETIC_PHRASES).format(s=rng.choice(_SYNTHETIC_SUBJECTS)) for _ in range(sentences_per_text))
+        for _ in range(count)
+    ]
+
+
+def create_huggingface_embeddings(model_name, normalize=True, batch_size=EMBEDDING_BATCH_SIZE, threads=EMBEDDING_THREADS):
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={'device': 'cpu'},
+        encode_kwargs={'normalize_embeddings': normalize, 'batch_size': batch_size}
+    )
+
+
+def export_onnx_model(model_name, quantize=True, model_dir=ONNX_MODEL_DIR):
+    """Modeli bir kez ONNX'e çevirir ve istenirse dinamik int8 kuantizasyon uygular; dosya yolunu döner."""
+    target_dir = os.path.join(model_dir, model_name.replace("/", "__"))
+    fp32_path = os.path.join(target_dir, "model.onnx")
+    int8_path = os.path.join(target_dir, "model.int8.onnx")
+
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+        os.makedirs(target_dir, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).eval()
+        dummy = tokenizer(["örnek cümle"], return_tensors="pt")
+        input_names = list(dummy.keys())
+        # Yeni torch sürümlerinde varsayılan dynamo dışa aktarıcısı ek olarak onnxscript ister
+        export_kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+            opset_version=14,
+            **export_kwargs
+        )
+
+    if not quantize:
+        return fp32_path
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEmbeddings(Embeddings):
+    """Aynı sentence-transformers modelini ONNX Runtime üzerinde (varsayılan olarak int8) çalıştırır."""
+
+    def __init__(self, model_name, normalize=True, batch_size=EMBEDDING_BATCH_SIZE, threads=EMBEDDING_THREADS, quantize=True):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        self.model_name = model_name
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            export_onnx_model(model_name, quantize=quantize),
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _encode(self, texts):
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True, truncation=True, max_length=EMBEDDING_MAX_SEQ_LENGTH, return_tensors="np"
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in encoded if name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        return np.vstack(batches) if batches else np.empty((0, 0), dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return self._encode(list(texts)).tolist()
+
+    def embed_query(self, text):
+        return self._encode([text])[0].tolist()
+
+
+def cosine_agreement(candidate, reference, texts):
+    left = np.asarray(candidate.embed_documents(texts), dtype=np.float32)
+    right = np.asarray(reference.embed_documents(texts), dtype=np.float32)
+    left /= np.clip(np.linalg.norm(left, axis=1, keepdims=True), 1e-12, None)
+    right /= np.clip(np.linalg.norm(right, axis=1, keepdims=True), 1e-12, None)
+    similarities = (left * right).sum(axis=1)
+    return float(similarities.min()), float(similarities.mean())
+
+
+def validate_embedding_backend(candidate, reference, texts=None, tolerance=EMBEDDING_COSINE_TOLERANCE):
+    """Aday backend'in vektörleri referansa en kötü durumda `1 - tolerance` kosinüs benzerliği kadar yakınsa True döner."""
+    texts = texts or synthetic_note_texts(64)
+    min_cosine, mean_cosine = cosine_agreement(candidate, reference, texts)
+    return min_cosine >= 1 - tolerance, min_cosine, mean_cosine
+
+
+def create_embedding_backend(model_name, backend=EMBEDDING_BACKEND, normalize=True):
+    """(embeddings, önbellek için model etiketi) döner; ONNX backend doğrulamadan geçemezse HuggingFace'e düşer."""
+    reference = create_huggingface_embeddings(model_name, normalize=normalize)
+    if backend != "onnx":
+        return reference, model_name
+
+    _backend_status["requested"] = backend
+    try:
+        candidate = OnnxEmbeddings(model_name, normalize=normalize)
+        is_valid, min_cosine, mean_cosine = validate_embedding_backend(candidate, reference)
+    except Exception as e:
+        _backend_status["error"] = f"ONNX embedding backend başlatılamadı: {type(e).__name__}: {e}"
+        print(f"UYARI: {_backend_status['error']} — HuggingFace kullanılıyor. "
+              "(`pip install onnx onnxruntime transformers torch` kurulu mu?)")
+        traceback.print_exc()
+        return reference, model_name
+
+    if not is_valid:
+        _backend_status["error"] = f"ONNX embedding vektörleri toleransın dışında (min kosinüs {min_cosine:.4f})"
+        print(f"UYARI: {_backend_status['error']} — HuggingFace kullanılıyor.")
+        return reference, model_name
+    _backend_status.update({"active": "onnx", "error": None})
+    return candidate, f"{model_name}@onnx-int8"
+
+
+def get_embedding_backend_status():
+    """İstenen ve fiilen kullanılan embedding backend'i; ONNX'ten HuggingFace'e düşüldüyse sebebiyle birlikte."""
+    return dict(_backend_status)
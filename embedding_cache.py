@@ -0,0 +1,224 @@
+import os
+import re
+import glob
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+EMBEDDING_CACHE_DIR = os.path.join(".cache", "embeddings")
+VECTORS_FILENAME = "vectors.bin"
+OFFSETS_FILENAME = "offsets.sqlite"
+READ_RETRIES = 3
+
+
+def text_key(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Chunk metni değişmedikçe vektörü tekrar hesaplamayan, memory-mapped dosyada tutulan embedding önbelleği.
+
+    Vektörler (model, normalizasyon, sha256(metin)) anahtarıyla `vectors.bin` içinde satır satır saklanır;
+    satır numaraları SQLite ofset tablosundadır. Okuma `np.memmap` ile salt okunur yapılır, böylece aynı
+    makinedeki süreçler sayfaları paylaşır.
+
+    `compact` satırları yeniden numaralandırdığı için vektörleri yeni nesil bir dosyaya yazar ve nesil
+    numarasını ofsetlerle aynı işlemde günceller; okuyucular ofsetleri ve nesli tek bir okuma işleminde alıp
+    o nesle ait dosyayı okur, dosya bu arada silinmişse yeniden dener.
+    """
+
+    def __init__(self, base, model_name, normalize=True, dtype="float32", cache_dir=EMBEDDING_CACHE_DIR):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Desteklenmeyen vektör tipi: {dtype}")
+        self.base = base
+        self.model_name = model_name
+        self.normalize = normalize
+        self.dtype = np.dtype(dtype)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.cache_dir = os.path.join(cache_dir, f"{slug}_{'norm' if normalize else 'raw'}_{dtype}")
+        self.offsets_path = os.path.join(self.cache_dir, OFFSETS_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS offsets (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.offsets_path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _meta(self, conn, name):
+        row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _lookup(self, conn, keys):
+        rows = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows.update(conn.execute(f"SELECT key, row FROM offsets WHERE key IN ({placeholders})", batch).fetchall())
+        return rows
+
+    def _vectors_path(self, generation):
+        name = VECTORS_FILENAME if not generation else f"vectors.{generation}.bin"
+        return os.path.join(self.cache_dir, name)
+
+    def _read_rows(self, path, rows, dim, row_count):
+        """Kayıtlı satır sayısı kadarını eşler; eşzamanlı eklemelerle büyüyen dosya sonu okunmaz."""
+        if not rows:
+            return np.empty((0, dim), dtype=np.float32)
+        vectors = np.memmap(path, dtype=self.dtype, mode="r", shape=(row_count, dim))
+        return np.asarray(vectors[rows], dtype=np.float32)
+
+    def _read_cached(self, keys):
+        """Önbellekte bulunan anahtarlar için {anahtar: vektör} döner."""
+        for attempt in range(READ_RETRIES):
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN")
+                found = self._lookup(conn, keys)
+                dim = self._meta(conn, "dim")
+                row_count = self._meta(conn, "rows") or 0
+                generation = self._meta(conn, "generation") or 0
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+            if not found:
+                return {}
+            try:
+                matrix = self._read_rows(self._vectors_path(generation), list(found.values()), dim, row_count)
+            except FileNotFoundError:
+                # Okuma sırasında compact yeni nesle geçti; ofsetler yeniden okunur
+                if attempt == READ_RETRIES - 1:
+                    raise
+                continue
+            return dict(zip(found.keys(), matrix))
+
+    def _append(self, items):
+        """Eksik vektörleri dosyanın sonuna ekler; SQLite yazma kilidi süreçler arası sıralamayı sağlar."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = self._lookup(conn, [key for key, _ in items])
+            items = [(key, vector) for key, vector in items if key not in existing]
+            if items:
+                dim = len(items[0][1])
+                stored_dim = self._meta(conn, "dim")
+                if stored_dim is not None and stored_dim != dim:
+                    raise ValueError(f"Embedding boyutu değişmiş: {stored_dim} != {dim}")
+                next_row = self._meta(conn, "rows") or 0
+                vectors_path = self._vectors_path(self._meta(conn, "generation") or 0)
+                matrix = np.asarray([vector for _, vector in items], dtype=self.dtype)
+                mode = "r+b" if os.path.exists(vectors_path) else "wb"
+                with open(vectors_path, mode) as f:
+                    f.seek(next_row * dim * self.dtype.itemsize)
+                    f.write(matrix.tobytes())
+                conn.executemany(
+                    "INSERT INTO offsets (key, row) VALUES (?, ?)",
+                    [(key, next_row + i) for i, (key, _) in enumerate(items)]
+                )
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dim', ?)", (dim,))
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('rows', ?)", (next_row + len(items),))
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def embed_documents(self, texts):
+        if not texts:
+            return []
+        keys = [text_key(text) for text in texts]
+        found = self._read_cached(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        with self._stats_lock:
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        computed = {}
+        if missing:
+            vectors = self.base.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._append(list(computed.items()))
+
+        return [found[key].tolist() if key in found else list(computed[key]) for key in keys]
+
+    def embed_query(self, text):
+        return self.base.embed_query(text)
+
+    def compact(self, live_texts):
+        """Artık hiçbir chunk'a ait olmayan vektörleri atarak yeni nesil bir dosyaya yazar."""
+        live_keys = {text_key(text) for text in live_texts}
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            dim = self._meta(conn, "dim")
+            generation = self._meta(conn, "generation") or 0
+            entries = conn.execute("SELECT key, row FROM offsets ORDER BY row").fetchall()
+            kept = [(key, row) for key, row in entries if key in live_keys]
+            removed = len(entries) - len(kept)
+            if removed and dim:
+                matrix = self._read_rows(
+                    self._vectors_path(generation), [row for _, row in kept], dim, self._meta(conn, "rows") or 0
+                ).astype(self.dtype)
+                new_path = self._vectors_path(generation + 1)
+                tmp_path = f"{new_path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(matrix.tobytes())
+                os.replace(tmp_path, new_path)
+                conn.execute("DELETE FROM offsets")
+                conn.executemany("INSERT INTO offsets (key, row) VALUES (?, ?)", [(key, i) for i, (key, _) in enumerate(kept)])
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('rows', ?)", (len(kept),))
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('generation', ?)", (generation + 1,))
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        if removed and dim:
+            self._remove_old_generations(generation + 1)
+        return removed
+
+    def _remove_old_generations(self, current):
+        """Eski nesil dosyaları siler; hâlâ açık olduğu için silinemeyenler bir sonraki compact'ta denenir."""
+        current_path = self._vectors_path(current)
+        for path in [self._vectors_path(0)] + glob.glob(os.path.join(self.cache_dir, "vectors.*.bin")):
+            if path != current_path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            entries = conn.execute("SELECT COUNT(*) FROM offsets").fetchone()[0]
+            vectors_path = self._vectors_path(self._meta(conn, "generation") or 0)
+        finally:
+            conn.close()
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+        }
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import requests
+
+GITHUB_CACHE_PATH = os.path.join(".cache", "github_http.sqlite")
+GITHUB_CACHE_TTL_SECONDS = int(os.getenv("GITHUB_CACHE_TTL_SECONDS", "300"))
+GITHUB_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "2000"))
+STALE_ON_STATUS = {403, 429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_stats = {"fresh_hits": 0, "revalidated": 0, "stale_served": 0, "misses": 0}
+_rate_limit = {}
+
+
+class CachedResponse:
+    """Önbellekten dönen yanıt; kodun kullandığı `requests.Response` alanlarını taklit eder."""
+
+    def __init__(self, status_code, content, headers, from_cache):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _connect():
+    os.makedirs(os.path.dirname(GITHUB_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(GITHUB_CACHE_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS responses (
+            cache_key TEXT PRIMARY KEY,
+            body BLOB NOT NULL,
+            content_type TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses(fetched_at)")
+    return conn
+
+
+def _cache_key(session, url, headers):
+    """URL, Accept ve kimlik (token hash'i) birlikte anahtarlanır; token'la alınan yanıt anonim oturuma verilmez."""
+    accept = headers.get("Accept") or session.headers.get("Accept", "")
+    authorization = headers.get("Authorization") or session.headers.get("Authorization")
+    identity = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16] if authorization else "anon"
+    return f"{url}|{accept}|{identity}"
+
+
+def _prune(conn, max_entries):
+    conn.execute(
+        "DELETE FROM responses WHERE cache_key IN "
+        "(SELECT cache_key FROM responses ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)", (max_entries,)
+    )
+
+
+def _record_rate_limit(response):
+    headers = response.headers
+    if "X-RateLimit-Remaining" not in headers:
+        return
+    with _lock:
+        _rate_limit.update({
+            "limit": int(headers.get("X-RateLimit-Limit", 0)),
+            "remaining": int(headers["X-RateLimit-Remaining"]),
+            "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            "resource": headers.get("X-RateLimit-Resource", "core")
+        })
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def cached_get(session, url, headers=None, timeout=None, ttl_seconds=GITHUB_CACHE_TTL_SECONDS,
+               max_entries=GITHUB_CACHE_MAX_ENTRIES):
+    """GET isteğini ETag/Last-Modified ile önbelleğe alır.
+
+    TTL içindeki kayıtlar ağa çıkmadan döner; süresi geçmiş kayıtlar `If-None-Match` / `If-Modified-Since`
+    ile doğrulanır (304 yanıtları GitHub rate limitinden düşmez). Doğrulama rate limit, sunucu veya ağ
+    hatasıyla sonuçlanırsa eski kayıt döner. Sadece 200 yanıtları saklanır; en eski kayıtlar
+    `max_entries` aşılınca silinir.
+    """
+    headers = dict(headers or {})
+    cache_key = _cache_key(session, url, headers)
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT body, content_type, etag, last_modified, fetched_at FROM responses WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+    if row:
+        body, content_type, etag, last_modified, fetched_at = row
+        cached_headers = {"Content-Type": content_type or ""}
+        if time.time() - fetched_at < ttl_seconds:
+            _count("fresh_hits")
+            return CachedResponse(200, body, cached_headers, True)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        if not row:
+            raise
+        _count("stale_served")
+        return CachedResponse(200, body, cached_headers, True)
+    _record_rate_limit(response)
+
+    if response.status_code in STALE_ON_STATUS and row:
+        _count("stale_served")
+        return CachedResponse(200, body, cached_headers, True)
+
+    if response.status_code == 304 and row:
+        _count("revalidated")
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("UPDATE responses SET fetched_at = ? WHERE cache_key = ?", (time.time(), cache_key))
+        finally:
+            conn.close()
+        return CachedResponse(200, body, cached_headers, True)
+
+    _count("misses")
+    if response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (cache_key, body, content_type, etag, last_modified, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key, response.content, response.headers.get("Content-Type"),
+                     response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time())
+                )
+                _prune(conn, max_entries)
+        finally:
+            conn.close()
+    return response
+
+
+def get_github_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["rate_limit"] = dict(_rate_limit)
+    requests_made = stats["revalidated"] + stats["misses"]
+    lookups = stats["fresh_hits"] + requests_made
+    stats["network_saved_ratio"] = stats["fresh_hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def format_github_quota_caption():
+    stats = get_github_cache_stats()
+    rate_limit = stats["rate_limit"]
+    quota = f"{rate_limit['remaining']}/{rate_limit['limit']} kaldı" if rate_limit else "henüz bilinmiyor"
+    return (
+        f"🐙 GitHub API kotası: {quota} · önbellek: {stats['fresh_hits']} taze, "
+        f"{stats['revalidated']} doğrulandı (304), {stats['stale_served']} eski kayıt, {stats['misses']} indirildi"
+    )
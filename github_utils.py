@@ -1,99 +1,263 @@
-import requests
-import base64
-from urllib.parse import urlparse
-
-def extract_github_repo_info(github_url):
-    try:
-        parsed_url = urlparse(github_url)
-        path_parts = parsed_url.path.strip('/').split('/')
-        if len(path_parts) < 2:
-            return None, "Geçersiz GitHub URL formatı"
-
-        owner, repo = path_parts[:2]
-        api_base = "https://api.github.com"
-        repo_url = f"{api_base}/repos/{owner}/{repo}"
-        readme_url = f"{api_base}/repos/{owner}/{repo}/readme"
-        contents_url = f"{api_base}/repos/{owner}/{repo}/contents"
-
-        repo_response = requests.get(repo_url)
-        if repo_response.status_code != 200:
-            return None, f"Repository bulunamadı: {repo_response.status_code}"
-        repo_data = repo_response.json()
-
-        readme_content = ""
-        try:
-            readme_response = requests.get(readme_url)
-            if readme_response.status_code == 200:
-                readme_data = readme_response.json()
-                readme_content = base64.b64decode(readme_data['content']).decode('utf-8')
-        except:
-            readme_content = "README bulunamadı"
-
-        important_files = {}
-        try:
-            contents_response = requests.get(contents_url)
-            if contents_response.status_code == 200:
-                contents = contents_response.json()
-                important_file_names = [
-                    'requirements.txt', 'pyproject.toml', 'package.json', 'setup.py',
-                    'main.py', 'app.py', 'index.py', 'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle'
-                ]
-                for file_info in contents:
-                    file_name = file_info['name'].lower()
-                    if file_name in important_file_names:
-                        try:
-                            file_response = requests.get(file_info['download_url'])
-                            if file_response.status_code == 200:
-                                important_files[file_name] = file_response.text[:2000]
-                        except:
-                            important_files[file_name] = "Dosya okunamadı"
-        except:
-            important_files = {}
-
-        return {
-            'owner': owner,
-            'repo': repo,
-            'name': repo_data.get('name', ''),
-            'description': repo_data.get('description', ''),
-            'language': repo_data.get('language', ''),
-            'stars': repo_data.get('stargazers_count', 0),
-            'forks': repo_data.get('forks_count', 0),
-            'topics': repo_data.get('topics', []),
-            'readme': readme_content,
-            'important_files': important_files,
-            'created_at': repo_data.get('created_at', ''),
-            'updated_at': repo_data.get('updated_at', ''),
-            'homepage': repo_data.get('homepage', ''),
-            'license': repo_data.get('license', {}).get('name', '') if repo_data.get('license') else ''
-        }, None
-
-    except Exception as e:
-        return None, f"GitHub repository analizi hatası: {str(e)}"
-
-
-def generate_github_analysis_prompt(repo_info):
-    important_files_text = ""
-    for filename, content in repo_info['important_files'].items():
-        important_files_text += f"\n📄 {filename}:\n{content}\n"
-
-    prompt = f"""
-    Bu repository hakkında kısa analiz yap:
-    
-    📌 Repository: {repo_info['name']}
-    👤 Owner: {repo_info['owner']}
-    📝 Açıklama: {repo_info['description']}
-    💻 Ana Dil: {repo_info['language']}
-    ⭐ Yıldız: {repo_info['stars']}
-    🍴 Fork: {repo_info['forks']}
-    
-    📖 README:
-    {repo_info['readme'][:2000] if repo_info['readme'] else 'README bulunamadı'}
-    
-    Bu proje gerçekte ne yapıyor?
-    Hangi teknolojileri kullanıyor?
-    Ben ne için bu projeyi kullanmalıyım?
-    Bana gerçekten faydalı olur mu?
-    
-    Kısa paragraflar halinde, akıcı bir şekilde cevap ver. Her başlık altında maksimum 2-3 cümle olsun. Madde madde yazma. Doğrudan analiz içeriğine başla.
-    """
-    return prompt
+import os
+import time
+import base64
+import fnmatch
+import requests
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, quote
+from metrics import record_metric
+from github_cache import cached_get
+
+GITHUB_ANALYSIS_PROMPT_VERSION = "2"
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "10"))
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "8"))
+IMPORTANT_FILE_NAMES = [
+    'requirements.txt', 'pyproject.toml', 'package.json', 'setup.py',
+    'main.py', 'app.py', 'index.py', 'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle'
+]
+GITHUB_SNAPSHOT_ENABLED = os.getenv("GITHUB_SNAPSHOT", "1") == "1"
+GITHUB_SNAPSHOT_PATTERNS = [
+    pattern.strip() for pattern in os.getenv(
+        "GITHUB_SNAPSHOT_PATTERNS",
+        ",".join(IMPORTANT_FILE_NAMES + [
+            '__main__.py', 'cli.py', 'main.go', 'main.rs', 'lib.rs', 'index.js', 'index.ts',
+            'Dockerfile', 'docker-compose.yml', 'Makefile'
+        ])
+    ).split(",") if pattern.strip()
+]
+GITHUB_SNAPSHOT_MAX_FILES = int(os.getenv("GITHUB_SNAPSHOT_MAX_FILES", "20"))
+GITHUB_SNAPSHOT_BUDGET_CHARS = int(os.getenv("GITHUB_SNAPSHOT_BUDGET_CHARS", "16000"))
+SNAPSHOT_FILE_CHARS = 2000
+SNAPSHOT_MAX_FILE_BYTES = 512 * 1024
+SNAPSHOT_EXCLUDED_DIRS = {'node_modules', 'vendor', 'third_party', 'dist', 'build', 'site-packages', '.git'}
+
+
+@lru_cache(maxsize=1)
+def get_github_session():
+    """Bağlantıları yeniden kullanan paylaşımlı oturum; GITHUB_TOKEN varsa daha yüksek rate limit için eklenir."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=GITHUB_MAX_WORKERS, pool_maxsize=GITHUB_MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/vnd.github+json", "User-Agent": "fikir-galaksisi"})
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
+def github_get(url, headers=None):
+    """ETag önbelleği üzerinden GET; taze kayıtlar ağa çıkmadan, eskiyenler koşullu istekle döner."""
+    return cached_get(get_github_session(), url, headers=headers, timeout=GITHUB_TIMEOUT)
+
+
+def get_repo_head_sha(owner, repo):
+    """Varsayılan dalın HEAD commit SHA'sını döner; alınamazsa None."""
+    try:
+        response = github_get(
+            f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/HEAD",
+            headers={"Accept": "application/vnd.github.sha"}
+        )
+        if response.status_code == 200:
+            return response.text.strip()
+    except:
+        pass
+    return None
+
+
+def _fetch_readme(readme_url):
+    try:
+        readme_response = github_get(readme_url)
+        if readme_response.status_code == 200:
+            return base64.b64decode(readme_response.json()['content']).decode('utf-8')
+        return ""
+    except:
+        return "README bulunamadı"
+
+
+def _fetch_contents(contents_url):
+    try:
+        contents_response = github_get(contents_url)
+        if contents_response.status_code == 200:
+            return contents_response.json()
+    except:
+        pass
+    return []
+
+
+def _fetch_important_file(file_info):
+    try:
+        file_response = github_get(file_info['download_url'])
+        if file_response.status_code == 200:
+            return file_response.text[:2000]
+    except:
+        pass
+    return "Dosya okunamadı"
+
+
+def snapshot_path_matches(path, patterns=GITHUB_SNAPSHOT_PATTERNS):
+    """`/` içermeyen desenler her derinlikteki dosya adına, içerenler repo köküne göre tam yola uygulanır."""
+    parts = path.split('/')
+    if any(part in SNAPSHOT_EXCLUDED_DIRS for part in parts[:-1]):
+        return False
+    name = parts[-1].lower()
+    return any(
+        fnmatch.fnmatch(path.lower(), pattern.lower()) if '/' in pattern else fnmatch.fnmatch(name, pattern.lower())
+        for pattern in patterns
+    )
+
+
+def _fetch_raw_file(owner, repo, ref, path):
+    try:
+        file_response = github_get(f"{GITHUB_RAW_BASE}/{owner}/{repo}/{quote(ref)}/{quote(path)}")
+        if file_response.status_code == 200:
+            return file_response.text[:SNAPSHOT_FILE_CHARS]
+    except:
+        pass
+    return "Dosya okunamadı"
+
+
+def fetch_repo_snapshot(owner, repo, ref, pool, patterns=GITHUB_SNAPSHOT_PATTERNS, max_files=GITHUB_SNAPSHOT_MAX_FILES,
+                        budget_chars=GITHUB_SNAPSHOT_BUDGET_CHARS):
+    """Git ağacını tek özyinelemeli çağrıyla alır, desenlere uyan dosyaları `{yol: içerik}` olarak döner.
+
+    Alt dizinlerdeki manifest ve giriş dosyaları da yakalanır; sığ yollar önceliklidir, boyutlar ağaçta
+    bilindiği için yalnızca `max_files` / `budget_chars` sınırına sığan dosyalar indirilir. GitHub çok büyük
+    ağaçları kısaltırsa kök dizin listesi de eklenir. Ağaç alınamazsa None döner.
+    """
+    tree_response = github_get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{quote(ref)}?recursive=1")
+    if tree_response.status_code != 200:
+        return None
+    tree = tree_response.json()
+    entries = {
+        entry['path']: entry.get('size', 0) for entry in tree.get('tree', [])
+        if entry.get('type') == 'blob' and snapshot_path_matches(entry['path'], patterns)
+    }
+    if tree.get('truncated'):
+        for item in _fetch_contents(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents"):
+            if isinstance(item, dict) and item.get('type') == 'file' and snapshot_path_matches(item['name'], patterns):
+                entries.setdefault(item['name'], item.get('size', 0))
+
+    selected, used = [], 0
+    for path, size in sorted(entries.items(), key=lambda item: (item[0].count('/'), item[0])):
+        cost = min(size, SNAPSHOT_FILE_CHARS)
+        if len(selected) >= max_files or size > SNAPSHOT_MAX_FILE_BYTES or used + cost > budget_chars:
+            continue
+        selected.append(path)
+        used += cost
+    return dict(zip(selected, pool.map(lambda path: _fetch_raw_file(owner, repo, ref, path), selected)))
+
+
+def _fetch_snapshot_files(owner, repo, ref, pool):
+    try:
+        return fetch_repo_snapshot(owner, repo, ref, pool)
+    except Exception as e:
+        print(f"GitHub snapshot alınamadı: {e}")
+        return None
+
+
+def _fetch_root_important_files(pool, contents_url):
+    important_names = {name.lower() for name in IMPORTANT_FILE_NAMES}
+    matches = [
+        file_info for file_info in _fetch_contents(contents_url)
+        if isinstance(file_info, dict) and file_info.get('name', '').lower() in important_names
+        and file_info.get('download_url')
+    ]
+    return dict(zip(
+        [file_info['name'].lower() for file_info in matches],
+        pool.map(_fetch_important_file, matches)
+    ))
+
+
+def extract_github_repo_info(github_url):
+    try:
+        parsed_url = urlparse(github_url)
+        path_parts = parsed_url.path.strip('/').split('/')
+        if len(path_parts) < 2:
+            return None, "Geçersiz GitHub URL formatı"
+
+        owner, repo = path_parts[:2]
+        repo_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
+        readme_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/readme"
+        contents_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents"
+        timings = {}
+        started_at = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=GITHUB_MAX_WORKERS) as pool:
+            repo_future = pool.submit(github_get, repo_url)
+            readme_future = pool.submit(_fetch_readme, readme_url)
+
+            # Dosya istekleri repo doğrulanmadan başlatılmaz; ağaç varsayılan dal üzerinden okunur
+            repo_response = repo_future.result()
+            if repo_response.status_code != 200:
+                return None, f"Repository bulunamadı: {repo_response.status_code}"
+            repo_data = repo_response.json()
+            timings['metadata'] = time.perf_counter() - started_at
+
+            phase_start = time.perf_counter()
+            ref = repo_data.get('default_branch') or 'HEAD'
+            important_files = _fetch_snapshot_files(owner, repo, ref, pool) if GITHUB_SNAPSHOT_ENABLED else None
+            if important_files is None:
+                # Snapshot kapalı veya alınamadı: yalnızca kök dizindeki dosyalar tek tek indirilir
+                important_files = _fetch_root_important_files(pool, contents_url)
+            timings['files'] = time.perf_counter() - phase_start
+            readme_content = readme_future.result()
+
+        timings['total'] = time.perf_counter() - started_at
+        for phase, seconds in timings.items():
+            record_metric(f"github_fetch.{phase}_ms", seconds * 1000)
+
+        return {
+            'owner': owner,
+            'repo': repo,
+            'name': repo_data.get('name', ''),
+            'description': repo_data.get('description', ''),
+            'language': repo_data.get('language', ''),
+            'stars': repo_data.get('stargazers_count', 0),
+            'forks': repo_data.get('forks_count', 0),
+            'topics': repo_data.get('topics', []),
+            'readme': readme_content,
+            'important_files': important_files,
+            'created_at': repo_data.get('created_at', ''),
+            'updated_at': repo_data.get('updated_at', ''),
+            'homepage': repo_data.get('homepage', ''),
+            'license': repo_data.get('license', {}).get('name', '') if repo_data.get('license') else '',
+            'timings': timings
+        }, None
+
+    except Exception as e:
+        return None, f"GitHub repository analizi hatası: {str(e)}"
+
+
+def generate_github_analysis_prompt(repo_info):
+    important_files_text = ""
+    for filename, content in repo_info['important_files'].items():
+        important_files_text += f"\n📄 {filename}:\n{content}\n"
+
+    prompt = f"""
+    Bu repository hakkında kısa analiz yap:
+    
+    📌 Repository: {repo_info['name']}
+    👤 Owner: {repo_info['owner']}
+    📝 Açıklama: {repo_info['description']}
+    💻 Ana Dil: {repo_info['language']}
+    ⭐ Yıldız: {repo_info['stars']}
+    🍴 Fork: {repo_info['forks']}
+    
+    📖 README:
+    {repo_info['readme'][:2000] if repo_info['readme'] else 'README bulunamadı'}
+    
+    📂 Önemli dosyalar (manifestler ve giriş noktaları):
+    {important_files_text if important_files_text else 'Önemli dosya bulunamadı'}
+    
+    Bu proje gerçekte ne yapıyor?
+    Hangi teknolojileri kullanıyor?
+    Ben ne için bu projeyi kullanmalıyım?
+    Bana gerçekten faydalı olur mu?
+    
+    Kısa paragraflar halinde, akıcı bir şekilde cevap ver. Her başlık altında maksimum 2-3 cümle olsun. Madde madde yazma. Doğrudan analiz içeriğine başla.
+    """
+    return prompt
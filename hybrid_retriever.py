@@ -0,0 +1,109 @@
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+from typing import Any, List
+from langchain.schema.retriever import BaseRetriever
+from langchain.callbacks.manager import CallbackManagerForRetrieverRun
+from langchain.docstore.document import Document
+from notes_index import turkish_fold
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+_WORD_RE = re.compile(r"\w+")
+_DOTTED_RE = re.compile(r"\w+(?:[./:-]\w+)+")
+
+
+def tokenize(text):
+    """Kelime tokenlarına ek olarak `st.write_stream`, `langchain/faiss` gibi bileşik teknik terimleri de tek token olarak tutar."""
+    folded = turkish_fold(text)
+    return _WORD_RE.findall(folded) + _DOTTED_RE.findall(folded)
+
+
+class KeywordIndex:
+    """Chunk kimliği bazında eklenip silinebilen bellek içi BM25 indeksi."""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, doc_id, text):
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+
+    def remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def search(self, query, k):
+        doc_count = len(self.doc_terms)
+        if not doc_count:
+            return []
+        avg_length = self.total_length / doc_count
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / norm
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=RRF_K):
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1.0 / (rrf_k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def _doc_id(doc):
+    return f"{doc.metadata.get('file_path')}#{doc.metadata.get('chunk_id')}"
+
+
+class HybridRetriever(BaseRetriever):
+    """FAISS ve BM25 sonuçlarını reciprocal rank fusion ile birleştiren retriever."""
+
+    vectorstore: Any
+    keyword_index: Any
+    k: int = 4
+    fetch_k: int = 20
+    rrf_k: int = RRF_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        dense_docs = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        docs_by_id = {_doc_id(doc): doc for doc in dense_docs}
+        dense_ranking = list(docs_by_id)
+        keyword_ranking = [doc_id for doc_id, _ in self.keyword_index.search(query, self.fetch_k)]
+
+        results = []
+        for doc_id in reciprocal_rank_fusion([dense_ranking, keyword_ranking], self.rrf_k):
+            doc = docs_by_id.get(doc_id) or self.vectorstore.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                results.append(doc)
+            if len(results) >= self.k:
+                break
+        return results
@@ -0,0 +1,95 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from video_analyst import generate_section_analysis_prompt, generate_map_reduce_prompt
+
+MAP_REDUCE_ENABLED = os.getenv("DETAILED_MAP_REDUCE", "1") == "1"
+MAP_REDUCE_CONCURRENCY = int(os.getenv("MAP_REDUCE_CONCURRENCY", "4"))
+MAP_REDUCE_GROUP_CHARS = int(os.getenv("MAP_REDUCE_GROUP_CHARS", "40000"))
+MAP_REDUCE_CACHE_DIR = os.path.join(".cache", "map_reduce")
+LONG_VIDEO_SECONDS = 30 * 60
+
+
+def _merge_group(group):
+    return {"start": group[0]["start"], "end": group[-1]["end"], "text": "\n".join(section["text"] for section in group)}
+
+
+def group_sections(sections, max_chars=MAP_REDUCE_GROUP_CHARS):
+    """Ardışık bölümleri bölmeden, metni `max_chars`'ı aşmayan gruplarda birleştirir; her grup dolduğu anda üretilir."""
+    current, size = [], 0
+    for section in sections:
+        length = len(section["text"])
+        if current and size + length > max_chars:
+            yield _merge_group(current)
+            current, size = [], 0
+        current.append(section)
+        size += length
+    if current:
+        yield _merge_group(current)
+
+
+def _cache_path(video_id, prompt):
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return os.path.join(MAP_REDUCE_CACHE_DIR, video_id, f"{key}.md")
+
+
+def _analyze_section(model, video_id, prompt, use_cache=True):
+    path = _cache_path(video_id, prompt)
+    if use_cache:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read(), True
+        except OSError:
+            pass
+
+    text = model.generate_content(prompt).text
+    if not text:
+        raise ValueError("Boş yanıt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return text, False
+
+
+def analyze_sections(model, video_id, title, sections_iter, concurrency=MAP_REDUCE_CONCURRENCY, progress_callback=None,
+                     use_cache=True):
+    """Map adımı: her bölüm grubunu eşzamanlı analiz eder, sonuçları bölüm bazında diske yazar.
+
+    `sections` bir generator olabilir; her grup üretildiği anda havuza gönderilir, böylece transkript hattı
+    sonraki bölümleri hazırlarken ilk bölümlerin analizi sürer. `(analizler, başarısızlar, önbellekten gelen
+    sayısı)` döner; başarısız bölümler tekrar denendiğinde yalnızca onlar için model çağrılır.
+    """
+    sections = []
+    failed = []
+    cached_count = 0
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {}
+        for i, section in enumerate(sections_iter):
+            sections.append(section)
+            prompt = generate_section_analysis_prompt(title, section["text"], i + 1)
+            futures[pool.submit(_analyze_section, model, video_id, prompt, use_cache)] = i
+        analyses = [None] * len(sections)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                analyses[i], from_cache = future.result()
+                cached_count += from_cache
+            except Exception as e:
+                failed.append((sections[i], str(e)))
+            done += 1
+            if progress_callback:
+                progress_callback(done / len(sections))
+
+    failed.sort(key=lambda item: item[0]["start"])
+    return [(section, analysis) for section, analysis in zip(sections, analyses) if analysis], failed, cached_count
+
+
+def build_reduce_prompt(title, section_analyses):
+    return generate_map_reduce_prompt(title, [
+        (section["start"], section["end"], analysis) for section, analysis in section_analyses
+    ])
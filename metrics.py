@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import threading
+from collections import defaultdict, deque
+
+METRICS_PATH = os.path.join(".cache", "metrics.jsonl")
+METRICS_SUMMARY_WINDOW = 200
+METRICS_MAX_BYTES = int(os.getenv("METRICS_MAX_MB", "5")) * 1024 * 1024
+
+_write_lock = threading.Lock()
+_recent = None
+
+
+def record_metric(name, value, **tags):
+    """Metriği `.cache/metrics.jsonl` dosyasına tek satır olarak ekler; hata uygulamayı durdurmaz."""
+    entry = {"name": name, "value": round(float(value), 3), "ts": time.time()}
+    if tags:
+        entry["tags"] = tags
+    try:
+        os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+        with _write_lock:
+            with open(METRICS_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                size = f.tell()
+            if size > METRICS_MAX_BYTES:
+                # Tek yedekle döndürülür; özetler bellekteki son kayıtlardan hesaplandığı için etkilenmez
+                os.replace(METRICS_PATH, f"{METRICS_PATH}.1")
+            if _recent is not None:
+                _recent[name].append(entry["value"])
+    except Exception as e:
+        print(f"Metrik kaydedilemedi ({name}): {e}")
+
+
+def _load_recent(window):
+    """Süreç başına bir kez, dosyadaki son kayıtları metrik adına göre pencerelere yükler."""
+    global _recent
+    with _write_lock:
+        if _recent is not None:
+            return _recent
+        recent = defaultdict(lambda: deque(maxlen=window))
+        for path in (f"{METRICS_PATH}.1", METRICS_PATH):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        recent[entry["name"]].append(entry["value"])
+                    except (ValueError, KeyError):
+                        continue
+        _recent = recent
+        return _recent
+
+
+def _percentile(values, ratio):
+    index = min(len(values) - 1, max(0, int(round(ratio * (len(values) - 1)))))
+    return values[index]
+
+
+def get_metric_summary(name, window=METRICS_SUMMARY_WINDOW):
+    """Son `window` kaydın sayısını, ortalamasını, p50 ve p95 değerlerini döner; kayıt yoksa None.
+
+    Dosya süreç başına yalnızca ilk çağrıda okunur; sonraki kayıtlar bellekteki pencerelere eklenir.
+    """
+    with _write_lock:
+        values = list(_recent.get(name, ())) if _recent is not None else None
+    if values is None:
+        values = list(_load_recent(METRICS_SUMMARY_WINDOW).get(name, ()))
+    values = values[-window:]
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "count": len(values),
+        "avg": sum(values) / len(values),
+        "p50": _percentile(ordered, 0.5),
+        "p95": _percentile(ordered, 0.95)
+    }
+
+
+def timed_stream(chunks, metric_prefix):
+    """Metin parçalarını olduğu gibi iletir; ilk token süresini (`<prefix>.ttft_ms`) ve toplam süreyi kaydeder.
+
+    Süre ilk parça istendiği anda başlar; `chunks` tembel bir üreteç olduğundan bu, model isteğinin gönderildiği andır.
+    """
+    start = time.perf_counter()
+    first_token_at = None
+    for text in chunks:
+        if not text:
+            continue
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+            record_metric(f"{metric_prefix}.ttft_ms", (first_token_at - start) * 1000)
+        yield text
+    record_metric(f"{metric_prefix}.total_ms", (time.perf_counter() - start) * 1000)
+
+
+def gemini_text_stream(model, prompt, usage=None):
+    """`generate_content(stream=True)` yanıtını metin parçaları olarak üretir; metni olmayan parçaları atlar.
+
+    `usage` sözlüğü verilirse akıştaki `usage_metadata` ile doldurulur (`prompt_tokens`, `output_tokens`);
+    böylece token sayısı için ayrıca `count_tokens` çağrısı gerekmez.
+    """
+    response = model.generate_content(prompt, stream=True)
+    for chunk in response:
+        metadata = getattr(chunk, "usage_metadata", None)
+        if usage is not None and metadata and metadata.prompt_token_count:
+            usage["prompt_tokens"] = metadata.prompt_token_count
+            usage["output_tokens"] = metadata.candidates_token_count
+        try:
+            text = chunk.text
+        except ValueError:
+            continue
+        yield text
+
+
+def format_ttft_caption(metric_prefix):
+    summary = get_metric_summary(f"{metric_prefix}.ttft_ms")
+    if not summary:
+        return None
+    return f"⏱️ İlk token: ort. {summary['avg']:.0f} ms · p95 {summary['p95']:.0f} ms ({summary['count']} istek)"
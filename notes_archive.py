@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import hashlib
+from collections import defaultdict
+from datetime import datetime
+from notes_index import NOTES_DIR, note_path
+
+NOTES_SAVE_MODE = os.getenv("NOTES_SAVE_MODE", "upsert")
+NOTES_MAX_VERSIONS = int(os.getenv("NOTES_MAX_VERSIONS", "5"))
+PRESERVED_FIELDS = ("user_notes",)
+
+
+def result_hash(text):
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def note_key(data):
+    analysis_type = data.get('analysis_type', 'detailed')
+    return analysis_type, data.get('identifier') or data.get('video_id', '')
+
+
+def note_filename(analysis_type, identifier, notes_dir=NOTES_DIR, mode=NOTES_SAVE_MODE):
+    """Upsert modunda (analysis_type, identifier) başına sabit, append modunda zaman damgalı dosya yolu."""
+    stem = identifier if analysis_type == 'detailed' else f"{analysis_type}_{identifier}"
+    if mode == "append":
+        stem = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    return note_path(notes_dir, f"{stem}.json")
+
+
+def load_note(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _note_bodies(data):
+    """Notun güncel gövdesi ve sürüm geçmişi, yeniden eskiye."""
+    current = {
+        "analysis_result": data.get('analysis_result', ''),
+        "result_hash": data.get('result_hash') or result_hash(data.get('analysis_result')),
+        "source_url": data.get('source_url'),
+        "created_at": data.get('updated_at') or data.get('created_at', '')
+    }
+    return [current] + list(data.get('versions', []))
+
+
+def _dedupe_versions(bodies, max_versions):
+    seen, kept = set(), []
+    for body in bodies:
+        if body["result_hash"] in seen:
+            continue
+        seen.add(body["result_hash"])
+        kept.append(body)
+    return kept[:max_versions + 1]
+
+
+def merge_note_versions(existing, incoming, max_versions=NOTES_MAX_VERSIONS):
+    """Yeni analizi mevcut kaydın üzerine yazar, önceki gövdeleri sınırlı geçmişe taşır; gövde değişmemişse None döner."""
+    incoming = dict(incoming)
+    incoming["result_hash"] = result_hash(incoming.get('analysis_result'))
+    if existing is None:
+        incoming.setdefault("versions", [])
+        return incoming
+
+    previous = _note_bodies(existing)
+    if previous[0]["result_hash"] == incoming["result_hash"]:
+        return None
+
+    bodies = _dedupe_versions(_note_bodies(incoming)[:1] + previous, max_versions)
+    incoming["versions"] = bodies[1:]
+    incoming["created_at"] = existing.get('created_at', incoming.get('created_at'))
+    for field in PRESERVED_FIELDS:
+        if field in existing and field not in incoming:
+            incoming[field] = existing[field]
+    return incoming
+
+
+def compact_notes_archive(notes_dir=NOTES_DIR, max_versions=NOTES_MAX_VERSIONS, dry_run=False):
+    """Aynı (analysis_type, identifier) için biriken zaman damgalı kopyaları tek dosyada, sürüm geçmişiyle birleştirir."""
+    groups = defaultdict(list)
+    if os.path.exists(notes_dir):
+        for name in sorted(os.listdir(notes_dir)):
+            if not name.endswith(".json"):
+                continue
+            filepath = note_path(notes_dir, name)
+            data = load_note(filepath)
+            if data is not None:
+                groups[note_key(data)].append((filepath, data))
+
+    report = {"groups": 0, "removed_files": [], "written_files": [], "duplicate_bodies": 0}
+    for (analysis_type, identifier), items in groups.items():
+        target = note_filename(analysis_type, identifier, notes_dir, mode="upsert")
+        if len(items) == 1 and items[0][0] == target:
+            continue
+
+        items.sort(key=lambda item: item[1].get('updated_at') or item[1].get('created_at', ''), reverse=True)
+        bodies = []
+        for _, data in items:
+            bodies.extend(_note_bodies(data))
+        bodies.sort(key=lambda body: body.get("created_at") or "", reverse=True)
+        unique = _dedupe_versions(bodies, len(bodies))
+        report["duplicate_bodies"] += len(bodies) - len(unique)
+
+        merged = dict(items[0][1])
+        merged.update({
+            "analysis_result": unique[0]["analysis_result"],
+            "result_hash": unique[0]["result_hash"],
+            "versions": unique[1:max_versions + 1],
+            "created_at": min(data.get('created_at') or merged.get('created_at', '') for _, data in items),
+            "filepath": target
+        })
+        for field in PRESERVED_FIELDS:
+            if field not in merged:
+                for _, data in items:
+                    if data.get(field):
+                        merged[field] = data[field]
+                        break
+
+        report["groups"] += 1
+        report["written_files"].append(target)
+        report["removed_files"].extend(filepath for filepath, _ in items if filepath != target)
+        if dry_run:
+            continue
+
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, target)
+        for filepath, _ in items:
+            if filepath != target:
+                os.remove(filepath)
+    return report
+
+
+def main(argv):
+    dry_run = "--dry-run" in argv
+    report = compact_notes_archive(dry_run=dry_run)
+    prefix = "[deneme] " if dry_run else ""
+    print(f"{prefix}{report['groups']} analiz birleştirildi, {len(report['removed_files'])} kopya dosya kaldırıldı, "
+          f"{report['duplicate_bodies']} aynı içerikli sürüm atıldı.")
+    for filepath in report["removed_files"]:
+        print(f"  - {filepath}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
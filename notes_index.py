@@ -0,0 +1,264 @@
+import os
+import re
+import json
+import sqlite3
+
+NOTES_DIR = "notes"
+INDEX_PATH = os.path.join(".cache", "notes_index.sqlite")
+SCHEMA_VERSION = 2
+
+SEARCH_FIELDS = ("title", "content", "date")
+DETAILED_ANALYSIS_TYPE = "detailed"
+
+_TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i",
+    "Ş": "s", "ş": "s",
+    "Ğ": "g", "ğ": "g",
+    "Ç": "c", "ç": "c",
+    "Ö": "o", "ö": "o",
+    "Ü": "u", "ü": "u",
+})
+
+
+def normalize_note_path(filepath):
+    """İndeks anahtarı olarak kullanılan not yolunu platformdan bağımsız `notes/<ad>.json` biçimine getirir."""
+    return os.path.normpath(filepath).replace(os.sep, "/")
+
+
+def note_path(notes_dir, name):
+    return normalize_note_path(os.path.join(notes_dir, name))
+
+
+def turkish_fold(text):
+    """Büyük/küçük harf ve Türkçe karakter farklarını arama için eşitler (İ/ı/I/i, ş/s, ğ/g...)."""
+    return (text or "").translate(_TURKISH_FOLD).lower()
+
+
+def _connect():
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.execute("DROP TABLE IF EXISTS notes")
+        conn.execute("DROP TABLE IF EXISTS notes_fts")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS notes (
+            filepath TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            title TEXT,
+            analysis_type TEXT,
+            identifier TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notes_updated_at ON notes(updated_at)")
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+            filepath UNINDEXED, title, content, date,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    return conn
+
+
+def format_note_title(data):
+    title = data.get('title', data.get('video_title', 'Bilinmeyen'))
+    analysis_type = data.get('analysis_type', 'detailed')
+    if analysis_type in ('youtube_preliminary', 'github_preliminary'):
+        return f"🚀 Hızlı Bakış: {title}"
+    return f"📊 Detaylı Analiz: {title}"
+
+
+def _build_row(filepath, data, stat):
+    return (
+        filepath,
+        os.path.basename(filepath),
+        stat.st_mtime,
+        stat.st_size,
+        format_note_title(data),
+        data.get('analysis_type', 'detailed'),
+        data.get('identifier', data.get('video_id', '')),
+        data.get('created_at', ''),
+        data.get('updated_at', ''),
+    )
+
+
+def _build_fts_row(filepath, data):
+    content = "\n\n".join(filter(None, [data.get('analysis_result', ''), data.get('user_notes', '')]))
+    return (
+        filepath,
+        turkish_fold(f"{data.get('video_title', '')} {data.get('title', '')}"),
+        turkish_fold(content),
+        data.get('created_at', '')[:10],
+    )
+
+
+def _upsert_fts_rows(conn, fts_rows):
+    conn.executemany("DELETE FROM notes_fts WHERE filepath = ?", [(row[0],) for row in fts_rows])
+    conn.executemany("INSERT INTO notes_fts (filepath, title, content, date) VALUES (?, ?, ?, ?)", fts_rows)
+
+
+def _upsert_rows(conn, rows):
+    conn.executemany("""
+        INSERT INTO notes (filepath, filename, mtime, size, title, analysis_type, identifier, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(filepath) DO UPDATE SET
+            filename=excluded.filename, mtime=excluded.mtime, size=excluded.size,
+            title=excluded.title, analysis_type=excluded.analysis_type, identifier=excluded.identifier,
+            created_at=excluded.created_at, updated_at=excluded.updated_at
+    """, rows)
+
+
+def refresh_notes_index(notes_dir=NOTES_DIR):
+    """Sadece eklenen, değişen veya silinen not dosyalarını indekse yansıtır."""
+    on_disk = {}
+    if os.path.exists(notes_dir):
+        with os.scandir(notes_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    on_disk[note_path(notes_dir, entry.name)] = entry.stat()
+
+    conn = _connect()
+    try:
+        with conn:
+            indexed = {
+                filepath: (mtime, size)
+                for filepath, mtime, size in conn.execute("SELECT filepath, mtime, size FROM notes")
+            }
+
+            removed = [(filepath,) for filepath in indexed if filepath not in on_disk]
+            if removed:
+                conn.executemany("DELETE FROM notes WHERE filepath = ?", removed)
+                conn.executemany("DELETE FROM notes_fts WHERE filepath = ?", removed)
+
+            rows, fts_rows = [], []
+            for filepath, stat in on_disk.items():
+                if indexed.get(filepath) == (stat.st_mtime, stat.st_size):
+                    continue
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                rows.append(_build_row(filepath, data, stat))
+                fts_rows.append(_build_fts_row(filepath, data))
+            if rows:
+                _upsert_rows(conn, rows)
+                _upsert_fts_rows(conn, fts_rows)
+    finally:
+        conn.close()
+
+
+def index_note(filepath, data=None):
+    filepath = normalize_note_path(filepath)
+    try:
+        if data is None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        stat = os.stat(filepath)
+        conn = _connect()
+        try:
+            with conn:
+                _upsert_rows(conn, [_build_row(filepath, data, stat)])
+                _upsert_fts_rows(conn, [_build_fts_row(filepath, data)])
+        finally:
+            conn.close()
+    except (OSError, ValueError, sqlite3.Error) as e:
+        # Dosya kaydedildi ama indeks güncellenemedi; bir sonraki refresh_notes_index mtime farkından düzeltir
+        print(f"Not indekse yazılamadı ({filepath}): {e}")
+
+
+def remove_note_from_index(filepath):
+    filepath = normalize_note_path(filepath)
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM notes WHERE filepath = ?", (filepath,))
+                conn.execute("DELETE FROM notes_fts WHERE filepath = ?", (filepath,))
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Not indeksten silinemedi ({filepath}): {e}")
+
+
+_NOTE_COLUMNS = "n.filename, n.title, n.created_at, n.updated_at, n.filepath, n.analysis_type, n.identifier, n.mtime, n.size"
+
+
+def _rows_to_notes(rows):
+    return [
+        {
+            "filename": filename,
+            "title": title,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "filepath": filepath,
+            "analysis_type": analysis_type,
+            "identifier": identifier,
+            "mtime": mtime,
+            "size": size
+        }
+        for filename, title, created_at, updated_at, filepath, analysis_type, identifier, mtime, size in rows
+    ]
+
+
+def list_indexed_notes():
+    conn = _connect()
+    try:
+        rows = conn.execute(f"SELECT {_NOTE_COLUMNS} FROM notes AS n ORDER BY n.updated_at DESC").fetchall()
+    finally:
+        conn.close()
+    return _rows_to_notes(rows)
+
+
+def is_detailed_note(note):
+    """Doküman türü filtresinin tek kuralı: `detailed` dışındaki her tür (eski kayıtlar dahil) Hızlı Bakış sayılır."""
+    return note.get('analysis_type') == DETAILED_ANALYSIS_TYPE
+
+
+def _build_match_query(field, term):
+    if field == "date":
+        tokens = re.findall(r"\d+", str(term))
+        return f'date : "{" ".join(tokens)}"' if tokens else None
+    tokens = re.findall(r"\w+", turkish_fold(str(term)))
+    if not tokens:
+        return None
+    return f"{field} : (" + " AND ".join(f'"{token}"*' for token in tokens) + ")"
+
+
+def search_notes(term, field="content", limit=None, offset=0, detailed=None):
+    """FTS indeksinde arama yapar; (sıralı notlar, toplam sonuç sayısı) döner.
+
+    `detailed` True/False ise sonuçlar `is_detailed_note` kuralıyla aynı şekilde türe göre süzülür.
+    """
+    if field not in SEARCH_FIELDS:
+        raise ValueError(f"Geçersiz arama alanı: {field}")
+    match_query = _build_match_query(field, term)
+    if not match_query:
+        return [], 0
+
+    where = "notes_fts MATCH ?"
+    params = [match_query]
+    if detailed is not None:
+        where += f" AND n.analysis_type {'IS' if detailed else 'IS NOT'} ?"
+        params.append(DETAILED_ANALYSIS_TYPE)
+
+    conn = _connect()
+    try:
+        total = conn.execute(f"""
+            SELECT COUNT(*) FROM notes_fts JOIN notes AS n ON n.filepath = notes_fts.filepath
+            WHERE {where}
+        """, params).fetchone()[0]
+        rows = conn.execute(f"""
+            SELECT {_NOTE_COLUMNS} FROM notes_fts JOIN notes AS n ON n.filepath = notes_fts.filepath
+            WHERE {where}
+            ORDER BY bm25(notes_fts, 0.0, 10.0, 1.0, 1.0), n.updated_at DESC
+            LIMIT ? OFFSET ?
+        """, params + [-1 if limit is None else limit, offset]).fetchall()
+    finally:
+        conn.close()
+    return _rows_to_notes(rows), total
@@ -0,0 +1,113 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+PDF_CACHE_DIR = os.path.join(".cache", "pdf")
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_MB", "256")) * 1024 * 1024
+PDF_RENDER_FIELDS = ("video_title", "title", "created_at", "analysis_result", "user_notes", "source_url")
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def pdf_cache_key(note_data, style_version):
+    payload = {field: note_data.get(field) for field in PDF_RENDER_FIELDS}
+    payload["style_version"] = style_version
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+
+
+def has_cached_pdf(key):
+    """İsabet/ıska sayacını etkilemeden PDF'in önbellekte olup olmadığını döner."""
+    return os.path.exists(_entry_path(key))
+
+
+def open_cached_pdf(key):
+    """Önbellekteki PDF'i okunmak üzere açık dosya olarak döner; içerik belleğe alınmaz."""
+    path = _entry_path(key)
+    try:
+        pdf_file = open(path, "rb")
+        os.utime(path)
+    except OSError:
+        with _lock:
+            _stats["misses"] += 1
+        return None
+    with _lock:
+        _stats["hits"] += 1
+    return pdf_file
+
+
+def put_cached_pdf(key, data):
+    """PDF'i önbelleğe yazar; başarılıysa dosya yolunu, yazılamazsa None döner."""
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            if hasattr(data, "read"):
+                shutil.copyfileobj(data, f)
+            else:
+                f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    _evict_if_needed()
+    return path
+
+
+def invalidate_cached_pdf(key):
+    try:
+        os.remove(_entry_path(key))
+    except OSError:
+        pass
+
+
+def _list_entries():
+    entries = []
+    if not os.path.exists(PDF_CACHE_DIR):
+        return entries
+    with os.scandir(PDF_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def _evict_if_needed():
+    entries = _list_entries()
+    total = sum(size for _, size, _ in entries)
+    if total <= PDF_CACHE_MAX_BYTES:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        with _lock:
+            _stats["evictions"] += 1
+        if total <= PDF_CACHE_MAX_BYTES:
+            break
+
+
+def get_pdf_cache_stats():
+    entries = _list_entries()
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+    stats["entries"] = len(entries)
+    stats["bytes"] = sum(size for _, size, _ in entries)
+    return stats
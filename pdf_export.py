@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import shutil
+import zipfile
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pdf_cache import pdf_cache_key, has_cached_pdf
+from pdf_utils import PDF_STYLE_VERSION, get_pdf_file, get_pdf_filename, get_pdf_engine
+
+EXPORT_DIR = os.path.join(".cache", "exports")
+EXPORT_MAX_AGE_SECONDS = 24 * 3600
+
+
+def _init_worker():
+    get_pdf_engine()
+
+
+def _render_pdf(note_data):
+    """PDF'i üretip disk önbelleğine yazar; içerik ana sürece taşınmaz."""
+    pdf_file = get_pdf_file(note_data)
+    if pdf_file is None:
+        return False
+    pdf_file.close()
+    return True
+
+
+def _unique_name(name, used_names):
+    base, ext = os.path.splitext(name)
+    candidate, counter = name, 2
+    while candidate in used_names:
+        candidate = f"{base}_{counter}{ext}"
+        counter += 1
+    used_names.add(candidate)
+    return candidate
+
+
+def _load_note(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return None
+
+
+def remove_export(path):
+    try:
+        os.remove(path)
+    except (OSError, TypeError):
+        pass
+
+
+def _remove_stale_exports(max_age=EXPORT_MAX_AGE_SECONDS):
+    """İndirilmeden bırakılmış eski ZIP dosyalarını siler."""
+    if not os.path.exists(EXPORT_DIR):
+        return
+    now = time.time()
+    with os.scandir(EXPORT_DIR) as entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > max_age:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+
+def export_notes_zip(notes, progress_callback=None, max_workers=None):
+    """Notların PDF'lerini paralel üretip diskteki tek bir ZIP dosyasında toplar; `(zip yolu, başarısızlar)` döner.
+
+    İşçiler PDF'leri disk önbelleğine yazar, ana süreç onları sırayla ZIP'e akıtır; hiçbir aşamada PDF içerikleri
+    bellekte toplanmaz. Önbellekteki PDF'ler yeniden üretilmez.
+    """
+    total = len(notes)
+    results = {}
+    to_render = {}
+
+    for position, note in enumerate(notes):
+        note_data = _load_note(note['filepath'])
+        if note_data is None:
+            results[position] = (note, None, False)
+        elif has_cached_pdf(pdf_cache_key(note_data, PDF_STYLE_VERSION)):
+            results[position] = (note, note_data, True)
+        else:
+            to_render[position] = (note, note_data)
+
+    done = len(results)
+    if progress_callback:
+        progress_callback(done, total)
+
+    if to_render:
+        workers = max_workers or min(len(to_render), os.cpu_count() or 1)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as executor:
+            futures = {
+                executor.submit(_render_pdf, note_data): position
+                for position, (note, note_data) in to_render.items()
+            }
+            for future in as_completed(futures):
+                position = futures[future]
+                note, note_data = to_render[position]
+                try:
+                    rendered = future.result()
+                except Exception as e:
+                    print(f"PDF oluşturma hatası ({note['filepath']}): {e}")
+                    rendered = False
+                results[position] = (note, note_data, rendered)
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+
+    _remove_stale_exports()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, zip_path = tempfile.mkstemp(suffix=".zip", dir=EXPORT_DIR)
+    used_names = set()
+    index_lines = []
+    failed = []
+    try:
+        with os.fdopen(fd, "wb") as output, zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+            for position in range(total):
+                note, note_data, rendered = results[position]
+                # Önbellekten silinmiş olabilir; get_pdf_file gerekirse bu süreçte yeniden üretir
+                pdf_file = get_pdf_file(note_data) if rendered else None
+                if pdf_file is None:
+                    failed.append(note['filepath'])
+                    continue
+                name = _unique_name(f"{len(index_lines) + 1:03d}_{get_pdf_filename(note_data)}", used_names)
+                with pdf_file, archive.open(name, 'w') as entry:
+                    shutil.copyfileobj(pdf_file, entry)
+                index_lines.append(f"{name}\t{note['title']}\t{note.get('updated_at', '')[:10]}")
+            archive.writestr("00_icindekiler.txt", "\n".join(index_lines) + "\n")
+    except:
+        remove_export(zip_path)
+        raise
+    return zip_path, failed
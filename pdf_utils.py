@@ -1,218 +1,469 @@
-import os
-import io
-import re
-import json
-import emoji
-import streamlit as st
-import requests
-from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-
-def remove_emojis(text):
-    return emoji.replace_emoji(text, replace='')
-
-
-def clean_text_for_title(text):
-    return ''.join(c for c in remove_emojis(text) if c.isprintable())
-
-
-def register_font():
-    font_name = "Helvetica"
-    try:
-        arial_path = r'C:\Windows\Fonts\arial.ttf'
-        if os.path.exists(arial_path):
-            pdfmetrics.registerFont(TTFont("Arial", arial_path))
-            font_name = "Arial"
-    except:
-        pass
-    return font_name
-
-
-def get_styles(font_name):
-    styles = getSampleStyleSheet()
-    return {
-        "title": ParagraphStyle(
-            'CustomTitle', parent=styles['Heading1'],
-            fontSize=16, spaceAfter=30, alignment=TA_CENTER,
-            textColor=colors.darkblue, fontName=font_name, encoding='utf-8'
-        ),
-        "subtitle": ParagraphStyle(
-            'CustomSubtitle', parent=styles['Heading2'],
-            fontSize=13, spaceBefore=16, spaceAfter=12, leading=16,
-            alignment=TA_LEFT, textColor=colors.HexColor("#2c3e50"),
-            fontName=font_name, encoding='utf-8'
-        ),
-        "normal": ParagraphStyle(
-            'CustomNormal', parent=styles['Normal'],
-            fontSize=11, spaceAfter=12, alignment=TA_JUSTIFY,
-            fontName=font_name, encoding='utf-8'
-        ),
-        "small": ParagraphStyle(
-            'CustomSmall', parent=styles['Normal'],
-            fontSize=9, spaceAfter=6, textColor=colors.grey,
-            fontName=font_name, encoding='utf-8'
-        ),
-    }
-
-
-def add_title_section(story, note_data, styles):
-    title_text = note_data.get("video_title") or note_data.get("title") or "Analiz Dokümanı"
-    if "video_title" in note_data:
-        title = "Video Analizi: " + clean_text_for_title(title_text.strip())
-    elif "title" in note_data:
-        title = "Ön Analiz: " + clean_text_for_title(title_text.strip())
-    else:
-        title = title_text
-    story.append(Paragraph(title, styles["title"]))
-    story.append(Spacer(1, 20))
-
-
-def add_metadata_section(story, note_data, styles):
-    if created := note_data.get("created_at"):
-        story.append(Paragraph(f"Tarih: {created[:10]}", styles["small"]))
-        story.append(Spacer(1, 15))
-
-
-def add_analysis_section(story, note_data, styles):
-    if analysis := note_data.get("analysis_result"):
-        for para in analysis.split('\n\n'):
-            clean_para = remove_emojis(re.sub(r"[`*]", "", para.strip()))
-            if clean_para:
-                story.append(Paragraph(clean_para, styles["normal"]))
-                story.append(Spacer(1, 10))
-
-
-def add_notes_section(story, note_data, styles):
-    if notes := note_data.get("user_notes"):
-        story.append(PageBreak())
-        story.append(Paragraph("Benim Notlarım", styles["subtitle"]))
-        story.append(Spacer(1, 15))
-        for para in notes.split('\n\n'):
-            clean_para = remove_emojis(para.strip())
-            if clean_para:
-                story.append(Paragraph(clean_para, styles["normal"]))
-                story.append(Spacer(1, 10))
-
-
-def add_source_section(story, note_data, styles):
-    if source := note_data.get("source_url"):
-        story.append(Spacer(1, 20))
-        story.append(Paragraph(f"Kaynak: {source}", styles["small"]))
-
-
-def create_pdf_from_analysis(note_data, filename):
-    try:
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        font_name = register_font()
-        styles = get_styles(font_name)
-        story = []
-
-        add_title_section(story, note_data, styles)
-        add_metadata_section(story, note_data, styles)
-        add_analysis_section(story, note_data, styles)
-        add_notes_section(story, note_data, styles)
-        add_source_section(story, note_data, styles)
-
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-
-    except Exception as e:
-        print(f"PDF oluşturma hatası: {e}")
-        return None
-
-
-def send_pdf_to_email(note_data):
-    try:
-        title = note_data.get("video_title") or note_data.get("title") or "Analiz Dokümanı"
-        created = note_data.get("created_at", "")[:10]
-        analysis = note_data.get("analysis_result", "")
-        source = note_data.get("source_url", "")
-
-        def clean_analysis(analysis):
-            cleaned = []
-            for para in analysis.split("\n\n"):
-                para = re.sub(r"`?\d{1,2}[:.]\d{2}`?", "", para).strip()
-
-                if para.startswith("**") and para.endswith("**") and len(para) < 80:
-                    content = para.strip("* ")
-                    para = f"<h3 style='color:#2c3e50;'>{content}</h3>"
-                else:
-                    para = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", para)
-                    para = f"<p style='font-size:15px; line-height:1.8; margin-bottom:14px; color:#333;'>{para}</p>"
-
-                cleaned.append(para)
-            return "\n".join(cleaned)
-
-        html_parts = [f"""
-        <div style="font-family:Segoe UI, sans-serif; background:#ffffff; padding:24px; border-radius:10px; max-width:700px; margin:auto; color:#2c3e50;">
-            <h2 style="color:#2c3e50; font-size:24px; margin-bottom:10px;">📊 {title}</h2>
-            <p style="margin:0; font-size:14px; color:#555;"><strong>📅 Tarih:</strong> {created}</p>
-        """]
-
-        if analysis:
-            html_parts.append("""
-            <h3 style="color:#e74c3c; margin-top:30px; font-size:18px;">📌 Analiz</h3>
-            """)
-            html_parts.append(clean_analysis(analysis))
-
-        if source:
-            html_parts.append(f"""
-            <hr style="margin:30px 0;">
-            <p style="font-size:14px; color:#555;">
-                <strong>🔗 Kaynak:</strong> <a href="{source}" style="color:#1abc9c; text-decoration:none;">{source}</a>
-            </p>
-            """)
-
-        html_parts.append("</div>")
-        html_content = "".join(html_parts)
-
-        payload = {
-            "subject": f"📩 {title}",
-            "html": html_content
-        }
-
-        webhook_url = "your_n8n_url"
-        response = requests.post(webhook_url, json=payload, headers={"Content-Type": "application/json"})
-
-        if response.status_code == 200:
-            st.success("📤 İçerik başarıyla e-posta ile gönderildi!")
-        else:
-            st.error(f"❌ Gönderim hatası: {response.status_code}")
-
-    except Exception as e:
-        st.error(f"⚠️ Hata: {e}")
-
-def generate_pdf_download_button(note_data, index):
-    try:
-        pdf_buffer = create_pdf_from_analysis(note_data, f"analiz_{index}")
-        if not pdf_buffer:
-            st.error("❌ PDF oluşturulamadı")
-            return
-
-        raw_name = note_data.get("video_title") or note_data.get("title") or "analiz"
-        clean_name = re.sub(r'[<>:"/\\|?*]', '_', raw_name[:50])
-        date_suffix = note_data.get("created_at", "")[:10]
-        filename = f"{clean_name}_{date_suffix}.pdf"
-
-        st.download_button(
-            label="📄 PDF İndir",
-            data=pdf_buffer.getvalue(),
-            file_name=filename,
-            mime="application/pdf",
-            key=f"download_pdf_file_{index}"
-        )
-
-        if st.button("📧 PDF'yi Mail Gönder", key=f"email_pdf_file_{index}"):
-            send_pdf_to_email(note_data)
-
-    except Exception as e:
-        st.error(f"❌ PDF hatası: {e}")
+import os
+import io
+import re
+import json
+import base64
+import tempfile
+import functools
+import emoji
+import streamlit as st
+import requests
+from datetime import datetime
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Preformatted, Table, TableStyle
+from reportlab.platypus.flowables import HRFlowable
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+from pdf_cache import pdf_cache_key, open_cached_pdf, put_cached_pdf, invalidate_cached_pdf
+
+PDF_STYLE_VERSION = "2"
+PDF_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+FONT_CANDIDATES = [
+    (os.path.join(FONTS_DIR, "DejaVuSans.ttf"), os.path.join(FONTS_DIR, "DejaVuSans-Bold.ttf")),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    (r"C:\Windows\Fonts\arial.ttf", r"C:\Windows\Fonts\arialbd.ttf"),
+]
+MONO_FONT_CANDIDATES = [
+    os.path.join(FONTS_DIR, "DejaVuSansMono.ttf"),
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    r"C:\Windows\Fonts\consola.ttf",
+]
+
+
+def remove_emojis(text):
+    return emoji.replace_emoji(text, replace='')
+
+
+def clean_text_for_title(text):
+    return ''.join(c for c in remove_emojis(text) if c.isprintable())
+
+
+def register_fonts():
+    font_name, bold_font_name, mono_font_name = "Helvetica", "Helvetica-Bold", "Courier"
+    for regular_path, bold_path in FONT_CANDIDATES:
+        if not os.path.exists(regular_path):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont("DocSans", regular_path))
+            font_name = bold_font_name = "DocSans"
+            if os.path.exists(bold_path):
+                pdfmetrics.registerFont(TTFont("DocSans-Bold", bold_path))
+                bold_font_name = "DocSans-Bold"
+            addMapping("DocSans", 0, 0, font_name)
+            addMapping("DocSans", 0, 1, font_name)
+            addMapping("DocSans", 1, 0, bold_font_name)
+            addMapping("DocSans", 1, 1, bold_font_name)
+            break
+        except:
+            continue
+    for mono_path in MONO_FONT_CANDIDATES:
+        if not os.path.exists(mono_path):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont("DocMono", mono_path))
+            mono_font_name = "DocMono"
+            break
+        except:
+            continue
+    return font_name, bold_font_name, mono_font_name
+
+
+def get_styles(font_name, bold_font_name, mono_font_name):
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle', parent=styles['Heading1'],
+            fontSize=16, spaceAfter=30, alignment=TA_CENTER,
+            textColor=colors.darkblue, fontName=bold_font_name, encoding='utf-8'
+        ),
+        "subtitle": ParagraphStyle(
+            'CustomSubtitle', parent=styles['Heading2'],
+            fontSize=13, spaceBefore=16, spaceAfter=12, leading=16,
+            alignment=TA_LEFT, textColor=colors.HexColor("#2c3e50"),
+            fontName=bold_font_name, encoding='utf-8'
+        ),
+        "heading1": ParagraphStyle(
+            'CustomHeading1', parent=styles['Heading2'],
+            fontSize=14, spaceBefore=14, spaceAfter=10, leading=18,
+            textColor=colors.HexColor("#2c3e50"), fontName=bold_font_name, encoding='utf-8'
+        ),
+        "heading2": ParagraphStyle(
+            'CustomHeading2', parent=styles['Heading3'],
+            fontSize=12, spaceBefore=12, spaceAfter=8, leading=15,
+            textColor=colors.HexColor("#2c3e50"), fontName=bold_font_name, encoding='utf-8'
+        ),
+        "heading3": ParagraphStyle(
+            'CustomHeading3', parent=styles['Heading4'],
+            fontSize=11, spaceBefore=10, spaceAfter=6, leading=14,
+            textColor=colors.HexColor("#34495e"), fontName=bold_font_name, encoding='utf-8'
+        ),
+        "normal": ParagraphStyle(
+            'CustomNormal', parent=styles['Normal'],
+            fontSize=11, spaceAfter=12, alignment=TA_JUSTIFY,
+            fontName=font_name, encoding='utf-8'
+        ),
+        "bullet": ParagraphStyle(
+            'CustomBullet', parent=styles['Normal'],
+            fontSize=11, spaceAfter=4, leading=14, leftIndent=18, bulletIndent=6,
+            fontName=font_name, encoding='utf-8'
+        ),
+        "code": ParagraphStyle(
+            'CustomCode', parent=styles['Code'],
+            fontSize=8.5, leading=11, spaceBefore=4, spaceAfter=10, leftIndent=6,
+            backColor=colors.HexColor("#f4f4f4"), fontName=mono_font_name
+        ),
+        "table": ParagraphStyle(
+            'CustomTable', parent=styles['Normal'],
+            fontSize=9, leading=11, fontName=font_name, encoding='utf-8'
+        ),
+        "small": ParagraphStyle(
+            'CustomSmall', parent=styles['Normal'],
+            fontSize=9, spaceAfter=6, textColor=colors.grey,
+            fontName=font_name, encoding='utf-8'
+        ),
+    }
+
+
+def escape_markup(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def format_inline_markdown(text, mono_font_name):
+    code_spans = []
+
+    def _stash_code(match):
+        code_spans.append(f'<font name="{mono_font_name}">{match.group(1)}</font>')
+        return f"\x00{len(code_spans) - 1}\x00"
+
+    text = escape_markup(remove_emojis(text))
+    text = re.sub(r"`([^`]+)`", _stash_code, text)
+    text = re.sub(r"\[([^\]]+)\]\((https?://[^)\s]+)\)", r'<link href="\2" color="blue">\1</link>', text)
+    text = re.sub(r"\*\*(.+?)\*\*|__(.+?)__", lambda m: f"<b>{m.group(1) or m.group(2)}</b>", text)
+    text = re.sub(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])", r"<i>\1</i>", text)
+    return re.sub(r"\x00(\d+)\x00", lambda m: code_spans[int(m.group(1))], text)
+
+
+def markdown_paragraph(text, style, mono_font_name, **kwargs):
+    """Satır içi markdown'lı paragraf; iç içe geçmiş hatalı işaretleme ReportLab'i bozarsa blok düz metin basılır."""
+    lines = text.splitlines() or [""]
+    try:
+        return Paragraph("<br/>".join(format_inline_markdown(line.strip(), mono_font_name) for line in lines), style, **kwargs)
+    except ValueError:
+        return Paragraph("<br/>".join(escape_markup(remove_emojis(line.strip())) for line in lines), style, **kwargs)
+
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET_RE = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+
+
+def _table_cells(line):
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _build_table(rows, styles):
+    mono_font_name = styles["code"].fontName
+    width = max(len(row) for row in rows)
+    data = [
+        [markdown_paragraph(cell, styles["table"], mono_font_name) for cell in row + [""] * (width - len(row))]
+        for row in rows
+    ]
+    table = Table(data, repeatRows=1, hAlign="LEFT")
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#ecf0f1")),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]))
+    return table
+
+
+def markdown_to_flowables(text, styles):
+    """Gemini'nin ürettiği markdown metnini başlık, liste, kod ve tablo flowable'larına çevirir."""
+    mono_font_name = styles["code"].fontName
+    flowables = []
+    paragraph_lines, table_rows, code_lines = [], [], None
+
+    def flush_paragraph():
+        if paragraph_lines:
+            if any(line.strip() for line in paragraph_lines):
+                flowables.append(markdown_paragraph("\n".join(paragraph_lines), styles["normal"], mono_font_name))
+            paragraph_lines.clear()
+
+    def flush_table():
+        if table_rows:
+            flowables.append(_build_table(table_rows, styles))
+            flowables.append(Spacer(1, 10))
+            table_rows.clear()
+
+    for line in text.splitlines():
+        if code_lines is not None:
+            if line.strip().startswith("```"):
+                flowables.append(Preformatted("\n".join(code_lines), styles["code"], maxLineLength=95))
+                code_lines = None
+            else:
+                code_lines.append(remove_emojis(line))
+            continue
+
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            flush_paragraph()
+            flush_table()
+            code_lines = []
+            continue
+        if stripped.startswith("|"):
+            flush_paragraph()
+            if not _TABLE_SEPARATOR_RE.match(stripped):
+                table_rows.append(_table_cells(stripped))
+            continue
+        flush_table()
+
+        if not stripped:
+            flush_paragraph()
+        elif heading := _HEADING_RE.match(stripped):
+            flush_paragraph()
+            level = min(len(heading.group(1)), 3)
+            flowables.append(markdown_paragraph(heading.group(2), styles[f"heading{level}"], mono_font_name))
+        elif _RULE_RE.match(stripped):
+            flush_paragraph()
+            flowables.append(HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey, spaceBefore=6, spaceAfter=6))
+        elif bullet := _BULLET_RE.match(line):
+            flush_paragraph()
+            indent, marker, content = bullet.groups()
+            level = len(indent.expandtabs(4)) // 2
+            bullet_text = marker if marker[0].isdigit() else "•"
+            style = styles.setdefault(f"bullet{level}", ParagraphStyle(
+                f"CustomBullet{level}", parent=styles["bullet"],
+                leftIndent=18 + level * 14, bulletIndent=6 + level * 14
+            ))
+            flowables.append(markdown_paragraph(content, style, mono_font_name, bulletText=bullet_text))
+        else:
+            paragraph_lines.append(line)
+
+    if code_lines is not None:
+        flowables.append(Preformatted("\n".join(code_lines), styles["code"], maxLineLength=95))
+    flush_paragraph()
+    flush_table()
+    return flowables
+
+
+def add_title_section(story, note_data, styles):
+    title_text = note_data.get("video_title") or note_data.get("title") or "Analiz Dokümanı"
+    if "video_title" in note_data:
+        title = "Video Analizi: " + clean_text_for_title(title_text.strip())
+    elif "title" in note_data:
+        title = "Ön Analiz: " + clean_text_for_title(title_text.strip())
+    else:
+        title = title_text
+    story.append(Paragraph(escape_markup(title), styles["title"]))
+    story.append(Spacer(1, 20))
+
+
+def add_metadata_section(story, note_data, styles):
+    if created := note_data.get("created_at"):
+        story.append(Paragraph(f"Tarih: {created[:10]}", styles["small"]))
+        story.append(Spacer(1, 15))
+
+
+def add_analysis_section(story, note_data, styles):
+    if analysis := note_data.get("analysis_result"):
+        story.extend(markdown_to_flowables(analysis, styles))
+
+
+def add_notes_section(story, note_data, styles):
+    if notes := note_data.get("user_notes"):
+        story.append(PageBreak())
+        story.append(Paragraph("Benim Notlarım", styles["subtitle"]))
+        story.append(Spacer(1, 15))
+        story.extend(markdown_to_flowables(notes, styles))
+
+
+def add_source_section(story, note_data, styles):
+    if source := note_data.get("source_url"):
+        story.append(Spacer(1, 20))
+        story.append(Paragraph(f"Kaynak: {escape_markup(source)}", styles["small"]))
+
+
+class PdfEngine:
+    """Fontları ve stilleri süreç başına bir kez hazırlar; her not için yalnızca story kurar."""
+
+    def __init__(self):
+        self.font_name, self.bold_font_name, self.mono_font_name = register_fonts()
+        self.styles = get_styles(self.font_name, self.bold_font_name, self.mono_font_name)
+
+    def build_story(self, note_data):
+        story = []
+        add_title_section(story, note_data, self.styles)
+        add_metadata_section(story, note_data, self.styles)
+        add_analysis_section(story, note_data, self.styles)
+        add_notes_section(story, note_data, self.styles)
+        add_source_section(story, note_data, self.styles)
+        return story
+
+    def render(self, note_data, output):
+        doc = SimpleDocTemplate(output, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+        doc.build(self.build_story(note_data))
+
+
+@functools.lru_cache(maxsize=1)
+def get_pdf_engine():
+    return PdfEngine()
+
+
+def create_pdf_from_analysis(note_data, filename):
+    output = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    try:
+        get_pdf_engine().render(note_data, output)
+        output.seek(0)
+        return output
+
+    except Exception as e:
+        output.close()
+        print(f"PDF oluşturma hatası: {e}")
+        return None
+
+
+def get_pdf_file(note_data):
+    """PDF'i okunabilir dosya nesnesi olarak döner; üretilen PDF önce disk önbelleğine yazılır, oradan açılır."""
+    key = pdf_cache_key(note_data, PDF_STYLE_VERSION)
+    cached = open_cached_pdf(key)
+    if cached is not None:
+        return cached
+    pdf_file = create_pdf_from_analysis(note_data, key)
+    if not pdf_file:
+        return None
+    with pdf_file:
+        path = put_cached_pdf(key, pdf_file)
+        try:
+            return open(path, "rb")
+        except (OSError, TypeError):
+            # Önbelleğe yazılamadı: üretilen içerik doğrudan döner
+            pdf_file.seek(0)
+            return io.BytesIO(pdf_file.read())
+
+
+def get_pdf_bytes(note_data):
+    pdf_file = get_pdf_file(note_data)
+    if pdf_file is None:
+        return None
+    with pdf_file:
+        return pdf_file.read()
+
+
+def invalidate_note_pdf(note_data):
+    invalidate_cached_pdf(pdf_cache_key(note_data, PDF_STYLE_VERSION))
+
+
+def get_pdf_filename(note_data):
+    raw_name = note_data.get("video_title") or note_data.get("title") or "analiz"
+    clean_name = re.sub(r'[<>:"/\\|?*]', '_', raw_name[:50])
+    date_suffix = note_data.get("created_at", "")[:10]
+    return f"{clean_name}_{date_suffix}.pdf"
+
+
+def send_pdf_to_email(note_data):
+    try:
+        title = note_data.get("video_title") or note_data.get("title") or "Analiz Dokümanı"
+        created = note_data.get("created_at", "")[:10]
+        analysis = note_data.get("analysis_result", "")
+        source = note_data.get("source_url", "")
+
+        def clean_analysis(analysis):
+            cleaned = []
+            for para in analysis.split("\n\n"):
+                para = re.sub(r"`?\d{1,2}[:.]\d{2}`?", "", para).strip()
+
+                if para.startswith("**") and para.endswith("**") and len(para) < 80:
+                    content = para.strip("* ")
+                    para = f"<h3 style='color:#2c3e50;'>{content}</h3>"
+                else:
+                    para = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", para)
+                    para = f"<p style='font-size:15px; line-height:1.8; margin-bottom:14px; color:#333;'>{para}</p>"
+
+                cleaned.append(para)
+            return "\n".join(cleaned)
+
+        html_parts = [f"""
+        <div style="font-family:Segoe UI, sans-serif; background:#ffffff; padding:24px; border-radius:10px; max-width:700px; margin:auto; color:#2c3e50;">
+            <h2 style="color:#2c3e50; font-size:24px; margin-bottom:10px;">📊 {title}</h2>
+            <p style="margin:0; font-size:14px; color:#555;"><strong>📅 Tarih:</strong> {created}</p>
+        """]
+
+        if analysis:
+            html_parts.append("""
+            <h3 style="color:#e74c3c; margin-top:30px; font-size:18px;">📌 Analiz</h3>
+            """)
+            html_parts.append(clean_analysis(analysis))
+
+        if source:
+            html_parts.append(f"""
+            <hr style="margin:30px 0;">
+            <p style="font-size:14px; color:#555;">
+                <strong>🔗 Kaynak:</strong> <a href="{source}" style="color:#1abc9c; text-decoration:none;">{source}</a>
+            </p>
+            """)
+
+        html_parts.append("</div>")
+        html_content = "".join(html_parts)
+
+        payload = {
+            "subject": f"📩 {title}",
+            "html": html_content
+        }
+
+        pdf_bytes = get_pdf_bytes(note_data)
+        if pdf_bytes:
+            payload["attachment_name"] = get_pdf_filename(note_data)
+            payload["attachment_base64"] = base64.b64encode(pdf_bytes).decode("ascii")
+
+        webhook_url = "your_n8n_url"
+        response = requests.post(webhook_url, json=payload, headers={"Content-Type": "application/json"})
+
+        if response.status_code == 200:
+            st.success("📤 İçerik başarıyla e-posta ile gönderildi!")
+        else:
+            st.error(f"❌ Gönderim hatası: {response.status_code}")
+
+    except Exception as e:
+        st.error(f"⚠️ Hata: {e}")
+
+def generate_pdf_download_button(note_data, index):
+    pdf_key = f"pdf_data_{index}_{note_data.get('updated_at', '')}"
+    try:
+        pdf_file = None
+        if pdf_key not in st.session_state:
+            if st.button("📄 PDF Hazırla", key=f"prepare_pdf_file_{index}"):
+                with st.spinner("📄 PDF hazırlanıyor..."):
+                    pdf_file = get_pdf_file(note_data)
+                if not pdf_file:
+                    st.error("❌ PDF oluşturulamadı")
+                    return
+                # Oturumda yalnızca hazır olduğu bilgisi tutulur; içerik her çizimde önbellekteki dosyadan okunur
+                st.session_state[pdf_key] = True
+
+        if pdf_key in st.session_state:
+            pdf_file = pdf_file or get_pdf_file(note_data)
+            if not pdf_file:
+                del st.session_state[pdf_key]
+                st.error("❌ PDF oluşturulamadı")
+                return
+            with pdf_file:
+                st.download_button(
+                    label="📄 PDF İndir",
+                    data=pdf_file,
+                    file_name=get_pdf_filename(note_data),
+                    mime="application/pdf",
+                    key=f"download_pdf_file_{index}"
+                )
+
+        if st.button("📧 PDF'yi Mail Gönder", key=f"email_pdf_file_{index}"):
+            send_pdf_to_email(note_data)
+
+    except Exception as e:
+        st.error(f"❌ PDF hatası: {e}")
\ No newline at end of file
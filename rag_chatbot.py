@@ -1,256 +1,348 @@
-import streamlit as st
-import json
-import os
-import hashlib
-from typing import List, Dict
-from langchain.vectorstores import FAISS
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.chains import ConversationalRetrievalChain
-from langchain.prompts.prompt import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.docstore.document import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.memory import ConversationSummaryBufferMemory
-
-
-@st.cache_resource
-def get_embeddings():
-    return HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
-
-@st.cache_resource
-def get_llm():
-    return ChatGoogleGenerativeAI(
-        model="gemini-2.5-pro",
-        temperature=0.3,
-        max_tokens=2048
-    )
-
-def create_document_hash(notes_list: List[Dict]) -> str:
-    content = ""
-    for note in notes_list:
-        filepath = note.get('filepath', '')
-        if filepath and os.path.exists(filepath):
-            content += f"{filepath}_{os.path.getmtime(filepath)}"
-    return hashlib.md5(content.encode()).hexdigest()
-
-
-def load_documents_optimized(notes_list: List[Dict]) -> List[Document]:
-    docs = []
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1200,
-        chunk_overlap=300,
-        separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
-        length_function=len
-    )
-
-    for note in notes_list:
-        filepath = note.get('filepath')
-        if not filepath or not os.path.exists(filepath):
-            continue
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            sections = []
-
-            if data.get("video_title"):
-                sections.append(f"Video Başlığı: {data['video_title']}")
-
-            if data.get("analysis_result"):
-                sections.append(f"İçerik Analizi:\n{data['analysis_result']}")
-
-            if data.get("user_notes"):
-                sections.append(f"Kullanıcı Notları:\n{data['user_notes']}")
-
-            raw_text = "\n\n".join(sections)
-
-            metadata = {
-                "source": data.get("source_url", "bilinmiyor"),
-                "title": data.get("video_title", data.get("title", "Bilinmeyen")),
-                "file_path": filepath,
-                "doc_type": "video_analysis"
-            }
-
-            if raw_text.strip():
-                chunks = splitter.split_text(raw_text)
-                for i, chunk in enumerate(chunks):
-                    chunk_metadata = metadata.copy()
-                    chunk_metadata["chunk_id"] = i
-                    docs.append(Document(page_content=chunk, metadata=chunk_metadata))
-
-        except Exception as e:
-            st.warning(f"Doküman okuma hatası ({filepath}): {str(e)}")
-            continue
-
-    return docs
-
-
-@st.cache_resource
-def build_vectorstore(_docs: List[Document], _embeddings):
-    if not _docs:
-        return None
-    return FAISS.from_documents(_docs, _embeddings)
-
-
-def get_optimized_prompt():
-    return PromptTemplate(
-        input_variables=["context", "question", "chat_history"],
-        template="""Sen uzman bir video analizi asistanısın. Kullanıcının dokümanlarından bilgi alarak sorularını yanıtlıyorsun.
-
-    KAYNAK BELGELER:
-    {context}
-    
-    GEÇMİŞ SOHBET:
-    {chat_history}
-    
-    KULLANICI SORUSU:
-    {question}
-    
-    YANIT KURALLARI:
-    1. SADECE ve SADECE verilen kaynak belgelerindeki bilgileri kullan
-    2. Bilgiyi direkt olarak belgelerden al, kendi yorumunu katma
-    3. Emin olmadığın veya belgede olmayan bilgiler için "Bu bilgi dokümanlarımda mevcut değil" de
-    4. Cevaplarını detaylı ver - belgede varsa tüm ilgili bilgiyi aktar
-    5. Önceki sohbet geçmişini dikkate al ama yine sadece belgelerden bilgi ver
-    6. Çok net ve kesin cevaplar ver, belirsizlik ifadeleri kullanma
-    
-    YANIT FORMAT:
-    [Detaylı cevap buraya]
-    
-    """
-    )
-
-
-def create_rag_chain_optimized(vectorstore, llm):
-    if not vectorstore:
-        return None
-
-    memory = ConversationSummaryBufferMemory(
-        llm=llm,
-        memory_key="chat_history",
-        return_messages=True,
-        output_key="answer",
-        max_token_limit=800
-    )
-
-    retriever = vectorstore.as_retriever(
-        search_type="mmr",
-        search_kwargs={
-            "k": 6,
-            "lambda_mult": 0.8,
-            "fetch_k": 20
-        }
-    )
-
-    qa_chain = ConversationalRetrievalChain.from_llm(
-        llm=llm,
-        retriever=retriever,
-        memory=memory,
-        return_source_documents=True,
-        combine_docs_chain_kwargs={"prompt": get_optimized_prompt()},
-        output_key="answer",
-        verbose=False
-    )
-
-    return qa_chain
-
-def render_chatbot_page(get_saved_notes_list_func, model=None):
-    st.header("🚀🤖 AI Asistan")
-
-    notes_list = get_saved_notes_list_func()
-
-    if not notes_list:
-        st.warning("⚠️ Henüz analiz dokümanınız yok.")
-        st.info("💡 Önce video analizi yaparak doküman oluşturun.")
-        return
-
-    current_hash = create_document_hash(notes_list)
-
-    embeddings = get_embeddings()
-    llm = get_llm()
-
-    if ("doc_hash" not in st.session_state or
-            st.session_state.doc_hash != current_hash or
-            "vectorstore" not in st.session_state):
-
-        if "vectorstore" not in st.session_state:
-            progress_placeholder = st.empty()
-            with progress_placeholder:
-                st.info("📊 Sistem ilk kez hazırlanıyor, lütfen bekleyin...")
-
-        docs = load_documents_optimized(notes_list)
-        st.session_state.vectorstore = build_vectorstore(docs, embeddings)
-        st.session_state.doc_hash = current_hash
-
-        st.session_state.qa_chain = create_rag_chain_optimized(
-            st.session_state.vectorstore, llm
-        )
-
-        if "vectorstore" in st.session_state:
-            if 'progress_placeholder' in locals():
-                progress_placeholder.empty()
-
-    if "qa_chain" not in st.session_state:
-        st.session_state.qa_chain = create_rag_chain_optimized(
-            st.session_state.vectorstore, llm
-        )
-
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-        welcome_msg = """👋 Merhaba! Ben fikir galaksisinin chatbotuyum. Sizi gördüğüme memnun oldum 😊
-        Dokümanlarınız hakkında herhangi bir sorunuz var mı?"""
-
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": welcome_msg
-        })
-
-    for msg in st.session_state.messages:
-        with st.chat_message(msg["role"]):
-            st.markdown(msg["content"])
-
-    if prompt := st.chat_input("💬 Dokümanlarınız hakkında soru sorun..."):
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        st.rerun()
-
-    if (st.session_state.messages and
-            st.session_state.messages[-1]["role"] == "user"):
-
-        last_msg = st.session_state.messages[-1]
-
-        with st.chat_message("assistant"):
-            with st.spinner("🔍 Dokümanlarınızı analiz ediyorum..."):
-                try:
-                    result = st.session_state.qa_chain({"question": last_msg["content"]})
-                    response = result["answer"]
-                    sources = result.get("source_documents", [])
-
-                    st.markdown(response)
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
-
-                    st.rerun()
-
-                except Exception as e:
-                    error_msg = f"❌ Üzgünüm, yanıt oluştururken bir hata oluştu: {str(e)}"
-                    st.error(error_msg)
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": error_msg
-                    })
-                    st.rerun()
-
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        if st.button("🗑️ Sohbet Geçmişini Temizle", use_container_width=True):
-            st.session_state.messages = []
-            if "qa_chain" in st.session_state:
-                st.session_state.qa_chain.memory.clear()
-            st.rerun()
\ No newline at end of file
+import streamlit as st
+import json
+import os
+import hashlib
+from typing import List, Dict
+from langchain.chains import ConversationalRetrievalChain
+from langchain.chains.conversational_retrieval.base import _get_chat_history
+from langchain.prompts.prompt import PromptTemplate
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain.memory import ConversationSummaryBufferMemory
+from vector_index import PersistentVectorIndex
+from embedding_cache import CachedEmbeddings
+from embedding_backends import create_embedding_backend, get_embedding_backend_status
+from hybrid_retriever import HybridRetriever
+from reranker import RerankingRetriever, load_cross_encoder, get_rerank_stats, RERANK_ENABLED
+from metrics import timed_stream, format_ttft_caption
+from answer_cache import SemanticAnswerCache
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+RAG_RETRIEVER = os.getenv("RAG_RETRIEVER", "hybrid")
+
+
+@st.cache_resource
+def get_embeddings():
+    base, model_label = create_embedding_backend(EMBEDDING_MODEL_NAME, normalize=True)
+    return CachedEmbeddings(
+        base,
+        model_name=model_label,
+        normalize=True,
+        dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+    )
+
+@st.cache_resource
+def get_llm():
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-pro",
+        temperature=0.3,
+        max_tokens=2048
+    )
+
+def create_document_hash(notes_list: List[Dict]) -> str:
+    content = ""
+    for note in notes_list:
+        filepath = note.get('filepath', '')
+        if not filepath:
+            continue
+        if 'mtime' in note:
+            content += f"{filepath}_{note['mtime']}_{note.get('size', '')}"
+        elif os.path.exists(filepath):
+            content += f"{filepath}_{os.path.getmtime(filepath)}"
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+@st.cache_resource
+def get_reranker():
+    return load_cross_encoder()
+
+
+@st.cache_resource
+def get_answer_cache():
+    return SemanticAnswerCache(get_embeddings())
+
+
+@st.cache_resource
+def get_vector_index():
+    return PersistentVectorIndex(get_embeddings())
+
+
+def update_note_vectors(filepath, deleted=False):
+    index = get_vector_index()
+    if deleted:
+        index.delete_file(filepath)
+    else:
+        index.upsert_file(filepath)
+    index.save()
+
+
+def get_optimized_prompt():
+    return PromptTemplate(
+        input_variables=["context", "question", "chat_history"],
+        template="""Sen uzman bir video analizi asistanısın. Kullanıcının dokümanlarından bilgi alarak sorularını yanıtlıyorsun.
+
+    KAYNAK BELGELER:
+    {context}
+    
+    GEÇMİŞ SOHBET:
+    {chat_history}
+    
+    KULLANICI SORUSU:
+    {question}
+    
+    YANIT KURALLARI:
+    1. SADECE ve SADECE verilen kaynak belgelerindeki bilgileri kullan
+    2. Bilgiyi direkt olarak belgelerden al, kendi yorumunu katma
+    3. Emin olmadığın veya belgede olmayan bilgiler için "Bu bilgi dokümanlarımda mevcut değil" de
+    4. Cevaplarını detaylı ver - belgede varsa tüm ilgili bilgiyi aktar
+    5. Önceki sohbet geçmişini dikkate al ama yine sadece belgelerden bilgi ver
+    6. Çok net ve kesin cevaplar ver, belirsizlik ifadeleri kullanma
+    
+    YANIT FORMAT:
+    [Detaylı cevap buraya]
+    
+    """
+    )
+
+
+def create_retriever(vectorstore, retriever_type=RAG_RETRIEVER, keyword_index=None, reranker=None):
+    fetch_k = 20
+    if reranker is not None:
+        if retriever_type == "hybrid" and keyword_index is not None:
+            candidates = HybridRetriever(vectorstore=vectorstore, keyword_index=keyword_index, k=fetch_k, fetch_k=fetch_k)
+        else:
+            candidates = vectorstore.as_retriever(search_kwargs={"k": fetch_k})
+        return RerankingRetriever(base_retriever=candidates, cross_encoder=reranker)
+
+    if retriever_type == "hybrid" and keyword_index is not None:
+        return HybridRetriever(vectorstore=vectorstore, keyword_index=keyword_index, k=4, fetch_k=fetch_k)
+    return vectorstore.as_retriever(
+        search_type="mmr",
+        search_kwargs={
+            "k": 6,
+            "lambda_mult": 0.8,
+            "fetch_k": fetch_k
+        }
+    )
+
+
+def create_rag_chain_optimized(vectorstore, llm, retriever_type=RAG_RETRIEVER, keyword_index=None, reranker=None):
+    if not vectorstore:
+        return None
+
+    memory = ConversationSummaryBufferMemory(
+        llm=llm,
+        memory_key="chat_history",
+        return_messages=True,
+        output_key="answer",
+        max_token_limit=800
+    )
+
+    retriever = create_retriever(vectorstore, retriever_type, keyword_index, reranker)
+
+    qa_chain = ConversationalRetrievalChain.from_llm(
+        llm=llm,
+        retriever=retriever,
+        memory=memory,
+        return_source_documents=True,
+        combine_docs_chain_kwargs={"prompt": get_optimized_prompt()},
+        output_key="answer",
+        verbose=False
+    )
+
+    return qa_chain
+
+
+def condense_question(qa_chain, question):
+    """Sohbet geçmişi varsa soruyu zincirin yeniden yazıcısıyla bağımsız hale getirir; (soru, geçmiş metni) döner."""
+    chat_history = qa_chain.memory.load_memory_variables({})["chat_history"]
+    chat_history_str = (qa_chain.get_chat_history or _get_chat_history)(chat_history)
+    if chat_history:
+        generator = qa_chain.question_generator
+        question = generator.invoke({"question": question, "chat_history": chat_history_str})[generator.output_key]
+    return question, chat_history_str
+
+
+def prepare_rag_prompt(qa_chain, standalone_question, chat_history_str):
+    """Zincirin retrieval adımını çalıştırır; (prompt, dokümanlar) döner."""
+    docs = qa_chain.retriever.invoke(standalone_question)
+    combine_chain = qa_chain.combine_docs_chain
+    inputs = combine_chain._get_inputs(docs, question=standalone_question, chat_history=chat_history_str)
+    return combine_chain.llm_chain.prompt.format_prompt(**inputs), docs
+
+
+def stream_rag_answer(qa_chain, prompt_value):
+    llm = qa_chain.combine_docs_chain.llm_chain.llm
+    for chunk in llm.stream(prompt_value):
+        yield chunk.content
+
+def render_chatbot_page(get_saved_notes_list_func, model=None):
+    st.header("🚀🤖 AI Asistan")
+
+    notes_list = get_saved_notes_list_func()
+
+    if not notes_list:
+        st.warning("⚠️ Henüz analiz dokümanınız yok.")
+        st.info("💡 Önce video analizi yaparak doküman oluşturun.")
+        return
+
+    current_hash = create_document_hash(notes_list)
+
+    llm = get_llm()
+    get_embeddings()
+    backend_status = get_embedding_backend_status()
+    if backend_status["error"]:
+        st.warning(f"⚠️ {backend_status['error']}. Embedding için HuggingFace backend'i kullanılıyor.")
+
+    if ("doc_hash" not in st.session_state or
+            st.session_state.doc_hash != current_hash or
+            "vectorstore" not in st.session_state):
+
+        if "vectorstore" not in st.session_state:
+            progress_placeholder = st.empty()
+            with progress_placeholder:
+                st.info("📊 Sistem ilk kez hazırlanıyor, lütfen bekleyin...")
+
+        vector_index = get_vector_index()
+        vector_index.sync(
+            notes_list,
+            on_error=lambda filepath, e: st.warning(f"Doküman okuma hatası ({filepath}): {str(e)}")
+        )
+        st.session_state.vectorstore = vector_index.vectorstore
+        st.session_state.doc_hash = current_hash
+
+        st.session_state.qa_chain = create_rag_chain_optimized(
+            st.session_state.vectorstore, llm,
+            keyword_index=get_vector_index().keyword_index,
+            reranker=get_reranker() if RERANK_ENABLED else None
+        )
+
+        if "vectorstore" in st.session_state:
+            if 'progress_placeholder' in locals():
+                progress_placeholder.empty()
+
+    if "qa_chain" not in st.session_state:
+        st.session_state.qa_chain = create_rag_chain_optimized(
+            st.session_state.vectorstore, llm,
+            keyword_index=get_vector_index().keyword_index,
+            reranker=get_reranker() if RERANK_ENABLED else None
+        )
+
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+        welcome_msg = """👋 Merhaba! Ben fikir galaksisinin chatbotuyum. Sizi gördüğüme memnun oldum 😊
+        Dokümanlarınız hakkında herhangi bir sorunuz var mı?"""
+
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": welcome_msg
+        })
+
+    for msg in st.session_state.messages:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+            if msg.get("meta"):
+                st.caption(msg["meta"])
+
+    if prompt := st.chat_input("💬 Dokümanlarınız hakkında soru sorun..."):
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.rerun()
+
+    if (st.session_state.messages and
+            st.session_state.messages[-1]["role"] == "user"):
+
+        last_msg = st.session_state.messages[-1]
+
+        with st.chat_message("assistant"):
+            try:
+                qa_chain = st.session_state.qa_chain
+                answer_cache = get_answer_cache()
+                with st.spinner("🔍 Dokümanlarınızı analiz ediyorum..."):
+                    # Önbellek süreçler arası paylaşıldığı için takip soruları bağımsız hale getirilmeden aranmaz
+                    standalone_question, chat_history_str = condense_question(qa_chain, last_msg["content"])
+                    question_vector = answer_cache.embed(standalone_question)
+                    cached, similarity = answer_cache.lookup(standalone_question, current_hash, vector=question_vector)
+
+                if cached:
+                    response = cached["answer"]
+                    st.markdown(response)
+                    meta = f"♻️ Önbellekten yanıtlandı (benzerlik {similarity:.2f})"
+                    if cached["sources"]:
+                        meta += " · Kaynaklar: " + ", ".join(cached["sources"])
+                else:
+                    with st.spinner("🔍 Dokümanlarınızı analiz ediyorum..."):
+                        prompt_value, docs = prepare_rag_prompt(qa_chain, standalone_question, chat_history_str)
+
+                    response = st.write_stream(
+                        timed_stream(stream_rag_answer(qa_chain, prompt_value), "chatbot")
+                    )
+                    sources = list(dict.fromkeys(doc.metadata.get("title", "Bilinmeyen") for doc in docs))
+                    answer_cache.store(standalone_question, current_hash, response, sources, vector=question_vector)
+                    meta = _format_rerank_report(qa_chain.retriever)
+
+                qa_chain.memory.save_context({"question": last_msg["content"]}, {"answer": response})
+
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": response,
+                    "meta": meta
+                })
+
+                st.rerun()
+
+            except Exception as e:
+                error_msg = f"❌ Üzgünüm, yanıt oluştururken bir hata oluştu: {str(e)}"
+                st.error(error_msg)
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": error_msg
+                })
+                st.rerun()
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("🗑️ Sohbet Geçmişini Temizle", use_container_width=True):
+            st.session_state.messages = []
+            if "qa_chain" in st.session_state:
+                st.session_state.qa_chain.memory.clear()
+            st.rerun()
+
+    _render_index_status()
+
+
+def _format_rerank_report(retriever):
+    report = getattr(retriever, "last_report", None)
+    if not report:
+        return None
+    return (
+        f"⚡ Rerank: {report['latency_ms']:.0f} ms · {report['kept']}/{report['candidates']} parça · "
+        f"~{report['tokens_saved']} prompt token tasarrufu"
+    )
+
+
+def _render_index_status():
+    with st.expander("🔧 Vektör İndeksi"):
+        vector_index = get_vector_index()
+        stats = vector_index.stats()
+        st.caption(
+            f"Tür: {stats['index_type']} ({stats['active_index'] or '-'}) · "
+            f"Vektör: {stats['vectors']} · Bellek eşlemeli: {'evet' if stats['mmap'] else 'hayır'}"
+        )
+        if st.button("📏 Recall ölç", key="measure_index_recall"):
+            with st.spinner("📏 Tam arama ile karşılaştırılıyor..."):
+                recall = vector_index.measure_recall()
+            if recall is not None:
+                st.caption(f"recall@6: {recall:.3f}")
+        cache_stats = get_answer_cache().stats()
+        st.caption(
+            f"Cevap önbelleği: {cache_stats['entries']} kayıt · isabet oranı {cache_stats['hit_rate']:.0%} "
+            f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']})"
+        )
+        ttft_caption = format_ttft_caption("chatbot")
+        if ttft_caption:
+            st.caption(ttft_caption)
+        if RERANK_ENABLED:
+            rerank_stats = get_rerank_stats()
+            st.caption(
+                f"Rerank: {rerank_stats['queries']} soru · ort. {rerank_stats['avg_latency_ms']:.0f} ms · "
+                f"toplam ~{rerank_stats['tokens_saved']} prompt token tasarrufu"
+            )
\ No newline at end of file
@@ -0,0 +1,89 @@
+import os
+import time
+import threading
+from typing import Any, List
+from langchain.schema.retriever import BaseRetriever
+from langchain.callbacks.manager import CallbackManagerForRetrieverRun
+from langchain.docstore.document import Document
+
+RERANK_ENABLED = os.getenv("RAG_RERANK", "0") == "1"
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+RERANK_SCORE_THRESHOLD = float(os.getenv("RERANK_SCORE_THRESHOLD", "0.0"))
+RERANK_TOKEN_BUDGET = int(os.getenv("RERANK_TOKEN_BUDGET", "1500"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+RERANK_MAX_DOCS = 6
+
+_stats_lock = threading.Lock()
+_stats = {"queries": 0, "latency_ms": 0.0, "baseline_tokens": 0, "kept_tokens": 0}
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def load_cross_encoder(model_name=RERANKER_MODEL):
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(model_name, device="cpu", max_length=512)
+
+
+def _record(latency_ms, baseline_tokens, kept_tokens):
+    with _stats_lock:
+        _stats["queries"] += 1
+        _stats["latency_ms"] += latency_ms
+        _stats["baseline_tokens"] += baseline_tokens
+        _stats["kept_tokens"] += kept_tokens
+
+
+def get_rerank_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    queries = stats["queries"]
+    stats["avg_latency_ms"] = stats["latency_ms"] / queries if queries else 0.0
+    stats["tokens_saved"] = stats["baseline_tokens"] - stats["kept_tokens"]
+    return stats
+
+
+class RerankingRetriever(BaseRetriever):
+    """Aday chunk'ları yerel cross-encoder ile puanlar; eşik ve token bütçesine sığanları LLM'e iletir."""
+
+    base_retriever: Any
+    cross_encoder: Any
+    score_threshold: float = RERANK_SCORE_THRESHOLD
+    token_budget: int = RERANK_TOKEN_BUDGET
+    max_docs: int = RERANK_MAX_DOCS
+    batch_size: int = RERANK_BATCH_SIZE
+    last_report: Any = None
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        candidates = self.base_retriever.invoke(query)
+        if not candidates:
+            return []
+
+        start = time.perf_counter()
+        scores = self.cross_encoder.predict(
+            [(query, doc.page_content) for doc in candidates],
+            batch_size=self.batch_size,
+            show_progress_bar=False
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        ranked = sorted(zip(candidates, scores), key=lambda item: float(item[1]), reverse=True)
+        kept, kept_tokens = [], 0
+        for doc, score in ranked:
+            tokens = estimate_tokens(doc.page_content)
+            if kept and (float(score) < self.score_threshold or kept_tokens + tokens > self.token_budget):
+                break
+            kept.append(doc)
+            kept_tokens += tokens
+            if len(kept) >= self.max_docs:
+                break
+
+        baseline_tokens = sum(estimate_tokens(doc.page_content) for doc in candidates[:self.max_docs])
+        _record(latency_ms, baseline_tokens, kept_tokens)
+        self.last_report = {
+            "candidates": len(candidates),
+            "kept": len(kept),
+            "latency_ms": latency_ms,
+            "tokens_saved": baseline_tokens - kept_tokens
+        }
+        return kept
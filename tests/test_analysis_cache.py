@@ -0,0 +1,35 @@
+import pytest
+import analysis_cache
+from analysis_cache import analysis_fingerprint, get_analysis_cache_stats, get_cached_analysis, put_cached_analysis
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_cache, "ANALYSIS_CACHE_PATH", str(tmp_path / "analysis_cache.sqlite"))
+
+
+def test_fingerprint_depends_on_every_part():
+    base = analysis_fingerprint("detailed", "vid", "hash", "1")
+    assert base == analysis_fingerprint("detailed", "vid", "hash", "1")
+    assert len({
+        base,
+        analysis_fingerprint("youtube_preliminary", "vid", "hash", "1"),
+        analysis_fingerprint("detailed", "vid2", "hash", "1"),
+        analysis_fingerprint("detailed", "vid", "hash2", "1"),
+        analysis_fingerprint("detailed", "vid", "hash", "2"),
+    }) == 5
+
+
+def test_round_trip_and_hit_rate():
+    fingerprint = analysis_fingerprint("detailed", "vid", "hash", "1")
+    assert get_cached_analysis(fingerprint, "detailed") is None
+
+    put_cached_analysis(fingerprint, "detailed", "vid", "Başlık", "Sonuç")
+    put_cached_analysis("bos", "detailed", "vid", "Başlık", "")
+    cached = get_cached_analysis(fingerprint, "detailed")
+    assert (cached["title"], cached["result"]) == ("Başlık", "Sonuç")
+    assert get_cached_analysis("bos", "detailed") is None
+
+    stats = get_analysis_cache_stats(("detailed",))
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 2)
+    assert get_analysis_cache_stats(("github_preliminary",))["hits"] == 0
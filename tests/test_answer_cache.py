@@ -0,0 +1,54 @@
+import numpy as np
+from answer_cache import SemanticAnswerCache
+
+VECTORS = {
+    "faiss nedir": [1.0, 0.0, 0.0],
+    "faiss ne demek": [0.99, 0.1, 0.0],
+    "streamlit nedir": [0.0, 1.0, 0.0],
+}
+
+
+class FixedEmbeddings:
+    def __init__(self):
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return VECTORS[text]
+
+
+def test_similar_question_hits_for_same_documents():
+    cache = SemanticAnswerCache(FixedEmbeddings(), threshold=0.9)
+    cache.store("faiss nedir", "docs1", "Vektör arama kütüphanesi", sources=["a.json"])
+
+    entry, score = cache.lookup("faiss ne demek", "docs1")
+    assert entry["answer"] == "Vektör arama kütüphanesi" and score > 0.9
+    assert cache.lookup("streamlit nedir", "docs1")[0] is None
+    assert cache.lookup("faiss nedir", "docs2")[0] is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_precomputed_vector_skips_embedding():
+    embeddings = FixedEmbeddings()
+    cache = SemanticAnswerCache(embeddings)
+    vector = cache.embed("faiss nedir")
+    cache.store("faiss nedir", "docs", "cevap", vector=vector)
+    assert cache.lookup("faiss nedir", "docs", vector=vector)[0]["answer"] == "cevap"
+    assert embeddings.queries == ["faiss nedir"]
+
+
+def test_expired_and_least_recently_used_entries_are_dropped():
+    cache = SemanticAnswerCache(FixedEmbeddings(), max_entries=2)
+    for question in VECTORS:
+        cache.store(question, "docs", question.upper())
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("faiss nedir", "docs")[0]["answer"] == "FAISS NE DEMEK"
+
+    cache.ttl_seconds = -1
+    assert cache.lookup("faiss nedir", "docs")[0] is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_vectors_are_normalized():
+    cache = SemanticAnswerCache(FixedEmbeddings())
+    assert np.isclose(np.linalg.norm(cache.embed("faiss ne demek")), 1.0)
@@ -0,0 +1,66 @@
+import os
+import numpy as np
+import pytest
+from embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings:
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), float(i), 1.0, 0.5][:self.dim] for i, text in enumerate(texts)]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_cache(tmp_path, base=None, **kwargs):
+    return CachedEmbeddings(base or CountingEmbeddings(), "test/model", cache_dir=str(tmp_path), **kwargs)
+
+
+def test_cached_vectors_are_not_recomputed(tmp_path):
+    base = CountingEmbeddings()
+    cache = make_cache(tmp_path, base)
+    first = cache.embed_documents(["a", "bb", "a"])
+    assert base.embedded == ["a", "bb"]
+
+    second = make_cache(tmp_path, base).embed_documents(["bb", "ccc", "a"])
+    assert base.embedded == ["a", "bb", "ccc"]
+    assert second[0] == first[1] and second[2] == first[0]
+
+
+def test_stats_report_hits_and_entries(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.embed_documents(["a", "b"])
+    cache.embed_documents(["a", "c"])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+    assert stats["bytes"] == 3 * 4 * 4
+
+
+def test_dimension_change_is_rejected(tmp_path):
+    make_cache(tmp_path).embed_documents(["a"])
+    with pytest.raises(ValueError):
+        make_cache(tmp_path, CountingEmbeddings(dim=3)).embed_documents(["b"])
+
+
+def test_compact_moves_live_rows_to_new_generation(tmp_path):
+    cache = make_cache(tmp_path)
+    vectors = dict(zip(["a", "bb", "ccc"], cache.embed_documents(["a", "bb", "ccc"])))
+
+    assert cache.compact(["ccc", "a"]) == 1
+    files = sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".bin"))
+    assert files == ["vectors.1.bin"]
+    assert cache.stats()["entries"] == 2
+    assert cache.embed_documents(["a", "ccc"]) == [vectors["a"], vectors["ccc"]]
+    assert cache.compact(["a", "ccc"]) == 0
+
+
+def test_float16_storage_round_trips_approximately(tmp_path):
+    cache = make_cache(tmp_path, dtype="float16")
+    computed = cache.embed_documents(["abc"])
+    cached = make_cache(tmp_path, dtype="float16").embed_documents(["abc"])
+    assert np.allclose(computed, cached, atol=1e-2)
@@ -0,0 +1,105 @@
+import json
+import pytest
+import requests
+import github_cache
+from github_cache import cached_get, get_github_cache_stats
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, *responses, headers=None):
+        self.responses = list(responses)
+        self.headers = headers or {"Accept": "application/vnd.github+json"}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(github_cache, "GITHUB_CACHE_PATH", str(tmp_path / "github_http.sqlite"))
+    monkeypatch.setattr(github_cache, "_stats", dict.fromkeys(github_cache._stats, 0))
+    monkeypatch.setattr(github_cache, "_rate_limit", {})
+
+
+def ok(body=b'{"a": 1}', etag='"v1"'):
+    return FakeResponse(200, body, {"ETag": etag, "Content-Type": "application/json",
+                                    "X-RateLimit-Remaining": "59", "X-RateLimit-Limit": "60"})
+
+
+URL = "https://api.github.com/repos/o/r"
+
+
+def test_fresh_entry_is_served_without_network():
+    session = FakeSession(ok())
+    assert cached_get(session, URL).status_code == 200
+    cached = cached_get(session, URL)
+    assert cached.from_cache and cached.json() == {"a": 1}
+    assert len(session.requests) == 1
+    assert get_github_cache_stats()["rate_limit"]["remaining"] == 59
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    session = FakeSession(ok(), FakeResponse(304))
+    cached_get(session, URL, ttl_seconds=0)
+    response = cached_get(session, URL, ttl_seconds=0)
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert response.from_cache and response.json() == {"a": 1}
+    assert get_github_cache_stats()["revalidated"] == 1
+
+
+def test_changed_resource_replaces_entry():
+    session = FakeSession(ok(), ok(b'{"a": 2}', '"v2"'))
+    cached_get(session, URL, ttl_seconds=0)
+    assert cached_get(session, URL, ttl_seconds=0).json() == {"a": 2}
+    assert cached_get(session, URL).json() == {"a": 2}
+
+
+@pytest.mark.parametrize("failure", [FakeResponse(429), FakeResponse(503), requests.ConnectionError("down")])
+def test_stale_entry_served_on_rate_limit_server_or_network_error(failure):
+    session = FakeSession(ok(), failure)
+    cached_get(session, URL, ttl_seconds=0)
+    response = cached_get(session, URL, ttl_seconds=0)
+    assert response.status_code == 200 and response.json() == {"a": 1}
+    assert get_github_cache_stats()["stale_served"] == 1
+
+
+def test_errors_without_cache_are_passed_through():
+    assert cached_get(FakeSession(FakeResponse(404)), URL).status_code == 404
+    with pytest.raises(requests.ConnectionError):
+        cached_get(FakeSession(requests.ConnectionError("down")), URL)
+
+
+def test_cache_is_keyed_by_credentials():
+    anonymous = FakeSession(ok(b'{"private": false}'))
+    authorized = FakeSession(ok(b'{"private": true}'),
+                             headers={"Accept": "application/vnd.github+json", "Authorization": "Bearer t"})
+    cached_get(authorized, URL)
+    assert cached_get(anonymous, URL).json() == {"private": False}
+    assert len(anonymous.requests) == 1
+
+
+def test_oldest_entries_are_pruned():
+    session = FakeSession(*[ok() for _ in range(5)])
+    for i in range(5):
+        cached_get(session, f"{URL}/{i}", max_entries=3)
+    conn = github_cache._connect()
+    try:
+        keys = [row[0].split("|")[0] for row in conn.execute("SELECT cache_key FROM responses ORDER BY fetched_at")]
+    finally:
+        conn.close()
+    assert keys == [f"{URL}/{i}" for i in (2, 3, 4)]
@@ -0,0 +1,81 @@
+import json
+import pytest
+import github_utils
+from concurrent.futures import ThreadPoolExecutor
+from github_utils import fetch_repo_snapshot, snapshot_path_matches
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    @property
+    def text(self):
+        return self.body if isinstance(self.body, str) else json.dumps(self.body)
+
+
+TREE = [
+    {"path": "README.md", "type": "blob", "size": 100},
+    {"path": "pkg/sub/setup.py", "type": "blob", "size": 100},
+    {"path": "pkg", "type": "tree"},
+    {"path": "node_modules/x/package.json", "type": "blob", "size": 10},
+    {"path": "src/main.py", "type": "blob", "size": 5000},
+    {"path": "big/app.py", "type": "blob", "size": 10 ** 7},
+]
+
+
+@pytest.fixture
+def requests_log(monkeypatch):
+    log = []
+
+    def fake_get(url, headers=None):
+        log.append(url)
+        if "/git/trees/" in url:
+            if "missing" in url:
+                return FakeResponse(404, {})
+            return FakeResponse(200, {"truncated": "truncated" in url, "tree": TREE})
+        if url.endswith("/contents"):
+            return FakeResponse(200, [{"name": "pyproject.toml", "type": "file", "size": 50}, {"name": "src", "type": "dir"}])
+        if url.startswith(github_utils.GITHUB_RAW_BASE):
+            return FakeResponse(200, "x" * 3000)
+        return FakeResponse(404, {})
+
+    monkeypatch.setattr(github_utils, "github_get", fake_get)
+    return log
+
+
+def test_snapshot_path_matches_names_at_any_depth_but_skips_vendored_dirs():
+    assert snapshot_path_matches("a/b/package.json")
+    assert snapshot_path_matches("Dockerfile")
+    assert not snapshot_path_matches("node_modules/x/package.json")
+    assert not snapshot_path_matches("docs/guide.md")
+    assert snapshot_path_matches("docs/conf.py", ["docs/*.py"])
+
+
+def test_snapshot_fetches_only_matching_files_within_limits(requests_log):
+    with ThreadPoolExecutor(2) as pool:
+        files = fetch_repo_snapshot("o", "r", "main", pool)
+    assert sorted(files) == ["pkg/sub/setup.py", "src/main.py"]
+    assert all(len(content) == github_utils.SNAPSHOT_FILE_CHARS for content in files.values())
+    assert len(requests_log) == 1 + 2
+
+
+def test_truncated_tree_merges_root_listing(requests_log):
+    with ThreadPoolExecutor(2) as pool:
+        files = fetch_repo_snapshot("o", "r", "truncated", pool)
+    assert "pyproject.toml" in files
+
+
+def test_budget_prefers_shallow_paths(requests_log):
+    with ThreadPoolExecutor(2) as pool:
+        files = fetch_repo_snapshot("o", "r", "main", pool, max_files=1)
+    assert list(files) == ["src/main.py"]
+
+
+def test_failed_tree_returns_none_for_fallback(requests_log):
+    with ThreadPoolExecutor(2) as pool:
+        assert fetch_repo_snapshot("o", "r", "missing", pool) is None
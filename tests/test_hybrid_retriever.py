@@ -0,0 +1,59 @@
+from langchain.docstore.document import Document
+from hybrid_retriever import HybridRetriever, KeywordIndex, reciprocal_rank_fusion, tokenize
+
+
+def doc(file_path, chunk_id, text):
+    return Document(page_content=text, metadata={"file_path": file_path, "chunk_id": chunk_id})
+
+
+class FakeDocstore:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def search(self, doc_id):
+        return self.docs.get(doc_id, f"ID {doc_id} bulunamadı")
+
+
+class FakeVectorStore:
+    def __init__(self, ranked_docs, all_docs):
+        self.ranked_docs = ranked_docs
+        self.docstore = FakeDocstore(all_docs)
+
+    def similarity_search(self, query, k):
+        return self.ranked_docs[:k]
+
+
+def test_tokenize_keeps_compound_technical_terms():
+    tokens = tokenize("st.write_stream ile LangChain/FAISS ŞEMASI")
+    assert {"st.write_stream", "langchain/faiss", "semasi"} <= set(tokens)
+
+
+def test_keyword_index_ranks_by_bm25_and_supports_removal():
+    index = KeywordIndex()
+    index.add("a", "faiss faiss faiss")
+    index.add("b", "faiss")
+    index.add("c", "streamlit arayüz")
+    assert [doc_id for doc_id, _ in index.search("FAISS", 5)] == ["a", "b"]
+
+    index.remove("a")
+    index.add("b", "streamlit")
+    assert index.search("faiss", 5) == []
+    assert len(index) == 2
+    assert index.total_length == 3
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    assert reciprocal_rank_fusion([["a", "b"], ["b", "c"]]) == ["b", "a", "c"]
+
+
+def test_hybrid_retriever_adds_keyword_only_hits_from_docstore():
+    dense = [doc("x", 0, "genel anlatım"), doc("x", 1, "başka bir bölüm")]
+    keyword_only = doc("y", 0, "nprobe parametresi")
+    keyword_index = KeywordIndex()
+    for item in dense + [keyword_only]:
+        keyword_index.add(f"{item.metadata['file_path']}#{item.metadata['chunk_id']}", item.page_content)
+    vectorstore = FakeVectorStore(dense, {"y#0": keyword_only})
+
+    retriever = HybridRetriever(vectorstore=vectorstore, keyword_index=keyword_index, k=2, fetch_k=5)
+    results = retriever.invoke("nprobe")
+    assert [item.page_content for item in results] == ["genel anlatım", "nprobe parametresi"]
@@ -0,0 +1,69 @@
+import pytest
+import map_reduce
+from map_reduce import analyze_sections, build_reduce_prompt, group_sections
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(map_reduce, "MAP_REDUCE_CACHE_DIR", str(tmp_path / "map_reduce"))
+
+
+def section(start, text):
+    return {"start": start, "end": start + 60, "text": text}
+
+
+class FakeModel:
+    def __init__(self, fail_on=()):
+        self.prompts = []
+        self.fail_on = fail_on
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        if any(marker in prompt for marker in self.fail_on):
+            raise RuntimeError("kota aşıldı")
+        return type("Response", (), {"text": f"özet {len(self.prompts)}"})()
+
+
+def test_group_sections_is_lazy_and_respects_limit():
+    produced = []
+
+    def sections():
+        for i in range(5):
+            produced.append(i)
+            yield section(i * 60, "x" * 40)
+
+    groups = group_sections(sections(), max_chars=100)
+    first = next(groups)
+    assert (first["start"], first["end"]) == (0, 120)
+    assert produced == [0, 1, 2]
+    assert [group["start"] for group in groups] == [120, 240]
+
+
+def test_oversized_section_is_not_split():
+    groups = list(group_sections([section(0, "x" * 300), section(60, "y")], max_chars=100))
+    assert [len(group["text"]) for group in groups] == [300, 1]
+
+
+def test_analyze_sections_caches_and_retries_only_failures():
+    sections = [section(0, "bölüm-a"), section(60, "bölüm-b"), section(120, "bölüm-c")]
+    failing = FakeModel(fail_on=("bölüm-b",))
+    analyses, failed, cached = analyze_sections(failing, "vid", "Başlık", iter(sections), concurrency=2)
+    assert [item[0]["start"] for item in analyses] == [0, 120]
+    assert [item[0]["start"] for item in failed] == [60]
+    assert cached == 0
+
+    retry = FakeModel()
+    progress = []
+    analyses, failed, cached = analyze_sections(retry, "vid", "Başlık", iter(sections), progress_callback=progress.append)
+    assert (len(analyses), failed, cached) == (3, [], 2)
+    assert len(retry.prompts) == 1 and "bölüm-b" in retry.prompts[0]
+    assert progress[-1] == 1.0
+
+    fresh = FakeModel()
+    analyze_sections(fresh, "vid", "Başlık", iter(sections), use_cache=False)
+    assert len(fresh.prompts) == 3
+
+
+def test_reduce_prompt_keeps_section_order():
+    prompt = build_reduce_prompt("Başlık", [(section(0, "a"), "İLK ÖZET"), (section(60, "b"), "İKİNCİ ÖZET")])
+    assert prompt.index("İLK ÖZET") < prompt.index("İKİNCİ ÖZET")
@@ -0,0 +1,73 @@
+import json
+import os
+import pytest
+import metrics
+from metrics import format_ttft_caption, gemini_text_stream, get_metric_summary, record_metric, timed_stream
+
+
+@pytest.fixture(autouse=True)
+def metrics_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_PATH", str(tmp_path / "metrics.jsonl"))
+    monkeypatch.setattr(metrics, "_recent", None)
+    return tmp_path / "metrics.jsonl"
+
+
+def test_summary_reads_file_once_then_tracks_new_records(metrics_path):
+    metrics_path.write_text("".join(json.dumps({"name": "x", "value": v}) + "\n" for v in (1, 2, 3)) + "bozuk\n")
+    assert get_metric_summary("x")["count"] == 3
+
+    metrics_path.write_text("")
+    record_metric("x", 10)
+    summary = get_metric_summary("x")
+    assert (summary["count"], summary["p95"], summary["avg"]) == (4, 10, 4)
+    assert get_metric_summary("x", window=2)["avg"] == 6.5
+    assert get_metric_summary("yok") is None
+
+
+def test_file_rotates_when_it_grows_too_large(metrics_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_MAX_BYTES", 200)
+    assert get_metric_summary("x") is None
+    for i in range(10):
+        record_metric("x", i)
+    assert os.path.exists(f"{metrics_path}.1")
+    assert os.path.getsize(metrics_path) <= 200
+    # Özet dosyadan değil bellekteki pencereden gelir; döndürme kayıt kaybettirmez
+    assert get_metric_summary("x")["count"] == 10
+
+
+def test_timed_stream_records_ttft_and_total():
+    assert list(timed_stream(iter(["", "a", "b"]), "chat")) == ["a", "b"]
+    assert get_metric_summary("chat.ttft_ms")["count"] == 1
+    assert get_metric_summary("chat.total_ms")["count"] == 1
+    assert format_ttft_caption("chat").endswith("(1 istek)")
+    assert format_ttft_caption("yok") is None
+
+
+class Chunk:
+    def __init__(self, text, usage=None):
+        self._text = text
+        self.usage_metadata = usage
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("metin yok")
+        return self._text
+
+
+class Usage:
+    def __init__(self, prompt, output):
+        self.prompt_token_count = prompt
+        self.candidates_token_count = output
+
+
+class StreamingModel:
+    def generate_content(self, prompt, stream=False):
+        assert stream
+        return [Chunk("Mer"), Chunk(None), Chunk("haba", Usage(120, 2))]
+
+
+def test_gemini_text_stream_skips_empty_chunks_and_captures_usage():
+    usage = {}
+    assert "".join(gemini_text_stream(StreamingModel(), "prompt", usage)) == "Merhaba"
+    assert usage == {"prompt_tokens": 120, "output_tokens": 2}
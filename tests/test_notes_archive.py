@@ -0,0 +1,65 @@
+import json
+import os
+from notes_archive import compact_notes_archive, merge_note_versions, note_filename, result_hash
+
+
+def note(result, updated_at, **extra):
+    return dict({"analysis_type": "detailed", "identifier": "vid", "video_id": "vid", "analysis_result": result,
+                 "created_at": updated_at, "updated_at": updated_at}, **extra)
+
+
+def test_note_filename_is_stable_per_type_and_identifier():
+    assert note_filename("detailed", "vid", "notes", mode="upsert") == "notes/vid.json"
+    assert note_filename("github_preliminary", "o_r", "notes", mode="upsert") == "notes/github_preliminary_o_r.json"
+    assert note_filename("detailed", "vid", "notes", mode="append").startswith("notes/vid_")
+
+
+def test_first_save_has_empty_history():
+    merged = merge_note_versions(None, note("ilk", "2024-01-01"))
+    assert merged["versions"] == [] and merged["result_hash"] == result_hash("ilk")
+
+
+def test_unchanged_body_is_not_rewritten():
+    existing = merge_note_versions(None, note("aynı", "2024-01-01"))
+    assert merge_note_versions(existing, note(" aynı\n", "2024-02-01")) is None
+
+
+def test_new_body_moves_previous_into_bounded_history():
+    current = merge_note_versions(None, note("v0", "2024-01-01", user_notes="notum"))
+    for i in range(1, 5):
+        current = merge_note_versions(current, note(f"v{i}", f"2024-01-0{i + 1}"), max_versions=2)
+
+    assert current["analysis_result"] == "v4"
+    assert [version["analysis_result"] for version in current["versions"]] == ["v3", "v2"]
+    assert current["created_at"] == "2024-01-01"
+    assert current["user_notes"] == "notum"
+
+
+def test_returning_to_an_old_body_does_not_duplicate_it():
+    current = merge_note_versions(None, note("a", "2024-01-01"))
+    current = merge_note_versions(current, note("b", "2024-01-02"))
+    current = merge_note_versions(current, note("a", "2024-01-03"))
+    assert [version["analysis_result"] for version in current["versions"]] == ["b"]
+
+
+def test_compact_merges_timestamped_copies(tmp_path):
+    notes_dir = str(tmp_path)
+    for name, data in {
+        "vid_20240101_100000.json": note("eski", "2024-01-01", user_notes="not"),
+        "vid_20240102_100000.json": note("yeni", "2024-01-02"),
+        "vid_20240103_100000.json": note("yeni", "2024-01-03"),
+    }.items():
+        with open(os.path.join(notes_dir, name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    report = compact_notes_archive(notes_dir, dry_run=True)
+    assert report["groups"] == 1 and len(os.listdir(notes_dir)) == 3
+
+    report = compact_notes_archive(notes_dir)
+    assert report["duplicate_bodies"] == 1
+    assert os.listdir(notes_dir) == ["vid.json"]
+    with open(os.path.join(notes_dir, "vid.json"), encoding="utf-8") as f:
+        merged = json.load(f)
+    assert merged["analysis_result"] == "yeni"
+    assert [version["analysis_result"] for version in merged["versions"]] == ["eski"]
+    assert (merged["created_at"], merged["user_notes"]) == ("2024-01-01", "not")
@@ -0,0 +1,105 @@
+import json
+import os
+import pytest
+import notes_index
+from notes_index import (
+    index_note, is_detailed_note, list_indexed_notes, normalize_note_path, note_path, refresh_notes_index,
+    remove_note_from_index, search_notes, turkish_fold
+)
+
+
+@pytest.fixture
+def notes_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(notes_index, "INDEX_PATH", str(tmp_path / "cache" / "notes_index.sqlite"))
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("notes")
+    return "notes"
+
+
+def write_note(notes_dir, name, **data):
+    data.setdefault("created_at", "2024-05-01T10:00:00")
+    data.setdefault("updated_at", data["created_at"])
+    path = os.path.join(notes_dir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+def test_turkish_fold_matches_dotted_and_dotless_i():
+    assert turkish_fold("İSTANBUL Işık ŞEHİR") == "istanbul isik sehir"
+    assert turkish_fold(None) == ""
+
+
+def test_note_paths_are_normalized():
+    assert normalize_note_path(os.path.join(".", "notes", "..", "notes", "a.json")) == "notes/a.json"
+    assert note_path("notes", "a.json") == "notes/a.json"
+
+
+def test_refresh_tracks_added_changed_and_removed_files(notes_dir):
+    first = write_note(notes_dir, "a.json", video_title="Birinci", analysis_result="içerik")
+    write_note(notes_dir, "b.json", video_title="İkinci", analysis_result="içerik", updated_at="2024-06-01")
+    refresh_notes_index(notes_dir)
+    assert [note["filename"] for note in list_indexed_notes()] == ["b.json", "a.json"]
+
+    os.remove(first)
+    refresh_notes_index(notes_dir)
+    notes = list_indexed_notes()
+    assert [note["filepath"] for note in notes] == ["notes/b.json"]
+    assert notes[0]["title"] == "📊 Detaylı Analiz: İkinci"
+
+
+def test_search_folds_turkish_characters_and_prefixes(notes_dir):
+    write_note(notes_dir, "a.json", video_title="Işık Hızı", analysis_result="Görelilik kuramı ve ŞEHİR ışıkları")
+    write_note(notes_dir, "b.json", video_title="Başka", analysis_result="alakasız")
+    refresh_notes_index(notes_dir)
+
+    notes, total = search_notes("sehir isik", "content")
+    assert total == 1 and notes[0]["filename"] == "a.json"
+    assert search_notes("ISI", "title")[1] == 1
+    assert search_notes("2024-05", "date")[1] == 2
+    assert search_notes("!!!", "content") == ([], 0)
+    with pytest.raises(ValueError):
+        search_notes("x", "filepath")
+
+
+def test_search_paginates_and_counts(notes_dir):
+    for i in range(5):
+        write_note(notes_dir, f"n{i}.json", video_title=f"Not {i}", analysis_result="ortak kelime",
+                   updated_at=f"2024-05-0{i + 1}")
+    refresh_notes_index(notes_dir)
+
+    page, total = search_notes("ortak", "content", limit=2, offset=2)
+    assert total == 5
+    assert len(page) == 2
+    assert search_notes("ortak", "content", limit=0)[0] == []
+
+
+def test_index_note_and_remove_use_normalized_paths(notes_dir):
+    path = write_note(notes_dir, "a.json", video_title="Tek", analysis_result="kelime")
+    index_note(os.path.join(".", path))
+    assert [note["filepath"] for note in list_indexed_notes()] == ["notes/a.json"]
+
+    remove_note_from_index(path)
+    assert list_indexed_notes() == []
+    assert search_notes("kelime", "content") == ([], 0)
+
+
+def test_index_note_reports_unreadable_file(notes_dir, capsys):
+    index_note(os.path.join(notes_dir, "yok.json"))
+    assert "Not indekse yazılamadı" in capsys.readouterr().out
+    assert list_indexed_notes() == []
+
+
+def test_type_filter_matches_list_rule_for_legacy_types(notes_dir):
+    write_note(notes_dir, "d.json", video_title="Detay", analysis_result="ortak", analysis_type="detailed")
+    write_note(notes_dir, "q.json", video_title="Hızlı", analysis_result="ortak", analysis_type="youtube_preliminary")
+    write_note(notes_dir, "l.json", video_title="Eski", analysis_result="ortak", analysis_type="legacy_summary")
+    refresh_notes_index(notes_dir)
+
+    notes = list_indexed_notes()
+    for detailed in (True, False):
+        listed = {note["filename"] for note in notes if is_detailed_note(note) == detailed}
+        searched = {note["filename"] for note in search_notes("ortak", "content", detailed=detailed)[0]}
+        assert listed == searched
+    assert {note["filename"] for note in search_notes("ortak", "content", detailed=False)[0]} == {"q.json", "l.json"}
+    assert search_notes("ortak", "content")[1] == 3
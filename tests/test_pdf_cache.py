@@ -0,0 +1,38 @@
+import os
+import pytest
+import pdf_cache
+from pdf_cache import get_pdf_cache_stats, has_cached_pdf, open_cached_pdf, pdf_cache_key, put_cached_pdf
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_DIR", str(tmp_path / "pdf"))
+    monkeypatch.setattr(pdf_cache, "_stats", {"hits": 0, "misses": 0, "evictions": 0})
+
+
+def test_key_ignores_fields_that_do_not_affect_rendering():
+    note = {"video_title": "Başlık", "analysis_result": "metin", "updated_at": "2024-01-01"}
+    assert pdf_cache_key(note, "1") == pdf_cache_key(dict(note, updated_at="2025-01-01"), "1")
+    assert pdf_cache_key(note, "1") != pdf_cache_key(dict(note, analysis_result="yeni"), "1")
+    assert pdf_cache_key(note, "1") != pdf_cache_key(note, "2")
+
+
+def test_put_open_and_has(tmp_path):
+    assert not has_cached_pdf("k")
+    assert open_cached_pdf("k") is None
+    assert put_cached_pdf("k", b"%PDF-1") == str(tmp_path / "pdf" / "k.pdf")
+    assert has_cached_pdf("k")
+    with open_cached_pdf("k") as f:
+        assert f.read() == b"%PDF-1"
+    stats = get_pdf_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_oldest_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_MAX_BYTES", 10)
+    for i, key in enumerate(("a", "b", "c")):
+        put_cached_pdf(key, b"x" * 4)
+        path = pdf_cache._entry_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    put_cached_pdf("d", b"x" * 4)
+    assert [has_cached_pdf(key) for key in "abcd"] == [False, False, True, True]
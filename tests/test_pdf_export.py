@@ -0,0 +1,50 @@
+import json
+import os
+import zipfile
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("reportlab")
+
+import pdf_cache
+import pdf_export
+from pdf_export import export_notes_zip
+
+
+@pytest.fixture(autouse=True)
+def cache_dirs(tmp_path, monkeypatch):
+    # Önbellek yolları görecelidir; spawn ile başlayan işçiler de aynı çalışma dizinini paylaşır
+    monkeypatch.chdir(tmp_path)
+
+
+def write_note(tmp_path, name, title):
+    path = tmp_path / name
+    path.write_text(json.dumps({
+        "video_title": title, "created_at": "2024-05-01T10:00:00", "analysis_result": f"**{title}** analizi"
+    }), encoding="utf-8")
+    return {"filepath": str(path), "title": title, "updated_at": "2024-05-01T10:00:00"}
+
+
+def test_export_writes_zip_to_disk_and_reports_failures(tmp_path):
+    notes = [write_note(tmp_path, "a.json", "Birinci"), {"filepath": str(tmp_path / "yok.json"), "title": "Yok"},
+             write_note(tmp_path, "b.json", "Birinci")]
+    progress = []
+    zip_path, failed = export_notes_zip(notes, progress_callback=lambda done, total: progress.append((done, total)),
+                                        max_workers=2)
+
+    assert os.path.dirname(zip_path) == os.path.abspath(pdf_export.EXPORT_DIR)
+    assert failed == [str(tmp_path / "yok.json")]
+    assert progress[-1] == (3, 3)
+    with zipfile.ZipFile(zip_path) as archive:
+        names = archive.namelist()
+        assert names[:2] == ["001_Birinci_2024-05-01.pdf", "002_Birinci_2024-05-01.pdf"]
+        assert archive.read(names[0]).startswith(b"%PDF")
+        assert archive.read("00_icindekiler.txt").decode("utf-8").count("\tBirinci\t") == 2
+
+    # İkinci dışa aktarma önbellekteki PDF'leri kullanır, süreç havuzu açılmaz
+    note_data = json.loads((tmp_path / "a.json").read_text(encoding="utf-8"))
+    assert pdf_cache.has_cached_pdf(pdf_cache.pdf_cache_key(note_data, pdf_export.PDF_STYLE_VERSION))
+    second_path, _ = export_notes_zip(notes[:1], max_workers=1)
+    assert second_path != zip_path
+    pdf_export.remove_export(second_path)
+    assert not os.path.exists(second_path)
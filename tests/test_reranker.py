@@ -0,0 +1,47 @@
+from langchain.docstore.document import Document
+from reranker import RerankingRetriever
+
+
+class ListRetriever:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def invoke(self, query):
+        return list(self.docs)
+
+
+class LengthScorer:
+    """Daha uzun metne daha yüksek puan veren sahte cross-encoder."""
+
+    def predict(self, pairs, batch_size=16, show_progress_bar=False):
+        return [float(len(text)) for _, text in pairs]
+
+
+def make_retriever(docs, **kwargs):
+    return RerankingRetriever(base_retriever=ListRetriever(docs), cross_encoder=LengthScorer(), **kwargs)
+
+
+def test_candidates_are_reordered_by_score():
+    docs = [Document(page_content="a" * n) for n in (4, 12, 8)]
+    kept = make_retriever(docs, token_budget=100).invoke("soru")
+    assert [len(doc.page_content) for doc in kept] == [12, 8, 4]
+
+
+def test_threshold_and_token_budget_trim_results():
+    docs = [Document(page_content="a" * n) for n in (40, 20, 8)]
+    retriever = make_retriever(docs, score_threshold=10.0, token_budget=100)
+    assert [len(doc.page_content) for doc in retriever.invoke("soru")] == [40, 20]
+
+    retriever = make_retriever(docs, token_budget=12)
+    assert [len(doc.page_content) for doc in retriever.invoke("soru")] == [40]
+    assert retriever.last_report["kept"] == 1
+    assert retriever.last_report["tokens_saved"] == 5 + 2
+
+
+def test_best_candidate_is_kept_even_over_budget():
+    retriever = make_retriever([Document(page_content="a" * 400)], token_budget=10, score_threshold=1000.0)
+    assert len(retriever.invoke("soru")) == 1
+
+
+def test_empty_candidates():
+    assert make_retriever([]).invoke("soru") == []
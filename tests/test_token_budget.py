@@ -0,0 +1,45 @@
+import json
+import pytest
+import metrics
+import token_budget
+from token_budget import TokenCounter, approximate_tokens, record_prompt_tokens
+
+
+@pytest.fixture(autouse=True)
+def cache_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_PATH", str(tmp_path / "metrics.jsonl"))
+    monkeypatch.setattr(token_budget, "TOKEN_CALIBRATION_PATH", str(tmp_path / "token_calibration.json"))
+    return tmp_path
+
+
+def test_approximate_tokens_counts_words_and_symbols():
+    assert approximate_tokens("") == 0
+    assert approximate_tokens("abcd efghi!") == 1 + 2 + 1
+
+
+def test_stream_usage_calibrates_and_persists(cache_paths):
+    prompt = "abcd " * 100
+    counter = TokenCounter()
+    estimated, actual = record_prompt_tokens(prompt, 200, counter, "test")
+
+    assert (estimated, actual) == (approximate_tokens(prompt), 200)
+    assert counter.count(prompt) == 200
+    stored = json.loads((cache_paths / "token_calibration.json").read_text(encoding="utf-8"))
+    assert stored[token_budget.TOKEN_MODEL_NAME] == {"ratio": 2.0, "samples": 1}
+    assert TokenCounter().ratio == pytest.approx(2.0)
+
+    names = [json.loads(line)["name"] for line in (cache_paths / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert names == ["test.prompt_tokens_estimated", "test.prompt_tokens_actual", "test.prompt_tokens_error_pct"]
+
+
+def test_later_observations_are_smoothed():
+    counter = TokenCounter(persist=False)
+    counter.observe("abcd " * 100, 200)
+    counter.observe("abcd " * 100, 100)
+    assert counter.ratio == pytest.approx(2.0 + token_budget.CALIBRATION_SMOOTHING * (1.0 - 2.0))
+
+
+def test_missing_usage_only_records_estimate():
+    counter = TokenCounter(persist=False)
+    assert record_prompt_tokens("bir iki", None, counter, "test") == (2, None)
+    assert counter.samples == 0
@@ -0,0 +1,46 @@
+import os
+import pytest
+import transcript_cache
+from transcript_cache import Segment, save_segments, load_segments
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_cache, "TRANSCRIPT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+SEGMENTS = [Segment("merhaba dünya", 0.0, 1.5), Segment("ikinci satır", 1.5, 2.0)]
+
+
+def test_save_and_load_round_trip(cache_dir):
+    save_segments("abc", "en", True, SEGMENTS)
+    segments, language_code = load_segments("abc")
+    assert language_code == "en"
+    assert [segment.text for segment in segments] == ["merhaba dünya", "ikinci satır"]
+    assert segments[1].start == pytest.approx(1.5)
+    assert sorted(os.listdir(cache_dir)) == ["abc.en.npz"]
+
+
+def test_prefers_manual_track_over_generated(cache_dir):
+    save_segments("abc", "en", True, SEGMENTS)
+    save_segments("abc", "tr", False, [Segment("elle", 0.0, 1.0)])
+    segments, language_code = load_segments("abc")
+    assert language_code == "tr"
+    assert segments[0].text == "elle"
+
+
+def test_ignores_orphaned_temp_and_truncated_files(cache_dir):
+    save_segments("abc", "en", True, SEGMENTS)
+    valid = (cache_dir / "abc.en.npz").read_bytes()
+    (cache_dir / "abc.tr.npz.123.tmp").write_bytes(valid[:20])
+    (cache_dir / "abc.tr.npz").write_bytes(valid[: len(valid) // 2])
+    (cache_dir / "abc.de.npz").write_bytes(b"")
+
+    segments, language_code = load_segments("abc")
+    assert language_code == "en"
+    assert len(segments) == 2
+
+
+def test_missing_video_returns_none():
+    assert load_segments("yok") == (None, None)
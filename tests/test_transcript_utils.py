@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("youtube_transcript_api")
+
+from token_budget import TokenCounter
+from transcript_utils import collect_sections, format_sections
+
+
+def sections(count, produced=None):
+    for i in range(count):
+        if produced is not None:
+            produced.append(i)
+        yield {"start": i * 60, "end": i * 60 + 60, "text": f"bölüm{i} " + "abcd " * 9}
+
+
+def test_collect_sections_stops_pulling_once_budget_is_full():
+    produced = []
+    counter = TokenCounter(persist=False)
+    per_section = counter.count(next(sections(1))["text"])
+
+    text = collect_sections(sections(10, produced), max_tokens=per_section * 3, counter=counter)
+    assert text.count("bölüm") == 3
+    assert text.endswith("(Transkript kısaltıldı)")
+    assert produced == [0, 1, 2, 3]
+
+
+def test_collect_sections_keeps_first_section_even_over_budget():
+    text = collect_sections(sections(2), max_tokens=1, counter=TokenCounter(persist=False))
+    assert text.startswith("bölüm0") and "bölüm1" not in text
+
+
+def test_collect_sections_without_truncation():
+    text = collect_sections(sections(2), max_tokens=10 ** 6, counter=TokenCounter(persist=False))
+    assert "kısaltıldı" not in text and text.count("bölüm") == 2
+
+
+def test_format_sections_adds_timestamps():
+    formatted = list(format_sections([{"start": 65, "end": 130, "lines": [(65, "merhaba"), (90, "dünya")]}]))
+    assert formatted[0]["text"] == "**🕒 01:05 – 02:10**\n`01:05` merhaba\n`01:30` dünya\n"
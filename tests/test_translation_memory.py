@@ -0,0 +1,47 @@
+from translation_memory import TranslationMemory, memory_key
+
+
+def make_memory(tmp_path, **kwargs):
+    return TranslationMemory(path=str(tmp_path / "memory.sqlite"), **kwargs)
+
+
+def test_memory_key_normalizes_whitespace_and_case():
+    assert memory_key("en", "tr", "  Hello   World ") == memory_key("en", "tr", "hello world")
+    assert memory_key("en", "tr", "hello") != memory_key("de", "tr", "hello")
+
+
+def test_translate_only_sends_missing_unique_texts(tmp_path):
+    memory = make_memory(tmp_path)
+    sent = []
+
+    def translate_fn(texts):
+        sent.append(list(texts))
+        return [f"tr:{text}" for text in texts]
+
+    assert memory.translate(["hello", "Hello ", "", "world"], translate_fn, "en") == ["tr:hello", "tr:hello", "", "tr:world"]
+    assert memory.translate(["world", "new"], translate_fn, "en") == ["tr:world", "tr:new"]
+    assert sent == [["hello", "world"], ["new"]]
+    assert memory.stats()["hits"] == 1
+
+
+def test_untranslated_lines_are_not_stored(tmp_path):
+    memory = make_memory(tmp_path)
+    memory.translate(["same"], lambda texts: list(texts), "en")
+    assert memory.stats()["entries"] == 0
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    memory = make_memory(tmp_path, max_entries=10)
+    memory.store_many([(f"text {i}", f"metin {i}") for i in range(11)], "en")
+    assert memory.stats()["entries"] == 9
+
+
+def test_export_import_round_trip(tmp_path):
+    memory = make_memory(tmp_path)
+    memory.store_many([("hello", "merhaba")], "en")
+    export_path = str(tmp_path / "export.jsonl")
+    assert memory.export_jsonl(export_path) == 1
+
+    other = TranslationMemory(path=str(tmp_path / "other.sqlite"))
+    assert other.import_jsonl(export_path) == 1
+    assert other.translate(["Hello"], lambda texts: [], "en") == ["merhaba"]
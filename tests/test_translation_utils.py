@@ -0,0 +1,59 @@
+import time
+import pytest
+import translation_utils
+from translation_utils import CircuitBreaker, LocalTranslator, make_batches, translate_lines
+
+
+class FailingTranslator:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        raise ConnectionError("çevirmen erişilemez")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    slept = []
+    monkeypatch.setattr(translation_utils.time, "sleep", slept.append)
+    return slept
+
+
+def test_make_batches_respects_limit_and_skips_blank_lines():
+    texts = ["aaaa", "", "bbbb", "cccc", "   ", "dd"]
+    assert make_batches(texts, max_chars=9) == [[0, 2], [3, 5]]
+
+
+def test_translate_lines_keeps_order_and_blank_lines():
+    translator = LocalTranslator(transform=str.upper)
+    texts = ["bir", "", "iki\nüç", "dört"]
+    assert translate_lines(texts, translator, max_chars=8, workers=2) == ["BIR", "", "IKI ÜÇ", "DÖRT"]
+
+
+def test_line_fallback_when_batch_changes_line_count():
+    assert translate_lines(["a", "b"], lambda text: "tek satır" if "\n" in text else text.upper()) == ["A", "B"]
+
+
+def test_unreachable_translator_trips_breaker(no_sleep):
+    translator = FailingTranslator()
+    texts = [f"satır {i}" for i in range(200)]
+    breaker = CircuitBreaker(max_failures=3, retry_budget=1.0)
+
+    assert translate_lines(texts, translator, max_chars=20, workers=1, retries=3, breaker=breaker) == texts
+    assert breaker.is_open
+    # 1 toplu çağrı + art arda başarısız 2 satır; yeniden denemeler 1 saniyelik bütçeyle sınırlı
+    assert translator.calls <= 3 * 3
+    assert sum(no_sleep) <= 1.0
+
+    calls = translator.calls
+    assert translate_lines(texts, translator, breaker=breaker) == texts
+    assert translator.calls == calls
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(max_failures=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
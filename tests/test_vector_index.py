@@ -0,0 +1,86 @@
+import hashlib
+import json
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+import vector_index
+from vector_index import PersistentVectorIndex, _compact_ivf_labels, train_index
+
+DIM = 16
+
+
+class HashEmbeddings(Embeddings):
+    """Metnin hash'inden türetilen, ağ gerektirmeyen deterministik embedding."""
+
+    model_name = "test-hash"
+
+    def _embed(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        vector = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def _write_notes(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"note_{i}.json"
+        path.write_text(json.dumps({"video_title": f"Video {i}", "analysis_result": f"Analiz içeriği {i}"}), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def ivf_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "FAISS_TRAIN_THRESHOLD", 0)
+    index = PersistentVectorIndex(HashEmbeddings(), index_dir=str(tmp_path / "index"), index_type="ivf_flat")
+    paths = _write_notes(tmp_path, 120)
+    index.sync([{"filepath": path} for path in paths])
+    return index, paths
+
+
+def test_ivf_index_supports_mmr_retrieval(ivf_index):
+    index, _ = ivf_index
+    assert index.stats()["active_index"] == "IndexIVFFlat"
+    retriever = index.vectorstore.as_retriever(search_type="mmr", search_kwargs={"k": 6, "fetch_k": 20})
+    docs = retriever.invoke("Analiz içeriği 7")
+    assert len(docs) == 6
+
+
+def test_ivf_mmr_after_delete_and_reload(ivf_index, tmp_path):
+    index, paths = ivf_index
+    index.delete_files(paths[:10])
+    index.save()
+
+    reloaded = PersistentVectorIndex(HashEmbeddings(), index_dir=str(tmp_path / "index"), index_type="ivf_flat")
+    docs = reloaded.vectorstore.max_marginal_relevance_search("Analiz içeriği 50", k=4, fetch_k=20)
+    assert len(docs) == 4
+    assert all(doc.metadata["file_path"] not in paths[:10] for doc in docs)
+
+
+def test_ivf_delete_keeps_labels_in_sync_with_docstore(ivf_index):
+    index, paths = ivf_index
+    index.delete_files(paths[3:8])
+    store = index.vectorstore
+    for label in (0, 40, store.index.ntotal - 1):
+        doc = store.docstore.search(store.index_to_docstore_id[label])
+        expected = np.asarray(index.embeddings.embed_query(doc.page_content), dtype=np.float32)
+        assert np.allclose(store.index.reconstruct(label), expected, atol=1e-5)
+
+
+def test_compact_ivf_labels_makes_labels_contiguous():
+    vectors = np.random.default_rng(0).standard_normal((200, DIM)).astype(np.float32)
+    index = train_index(vectors, "ivf_flat")
+    removed = np.array([0, 5, 199], dtype=np.int64)
+    index.remove_ids(removed)
+    _compact_ivf_labels(index, removed)
+
+    kept = np.delete(vectors, removed, axis=0)
+    assert index.ntotal == len(kept)
+    for label in (0, 4, 5, len(kept) - 1):
+        assert np.allclose(index.reconstruct(label), kept[label])
@@ -0,0 +1,95 @@
+import os
+import re
+import json
+import math
+import threading
+from functools import lru_cache
+from metrics import record_metric
+
+TOKEN_MODEL_NAME = "gemini-2.5-pro"
+DETAILED_PROMPT_TOKEN_BUDGET = int(os.getenv("DETAILED_PROMPT_TOKEN_BUDGET", "800000"))
+TOKEN_CALIBRATION_PATH = os.path.join(".cache", "token_calibration.json")
+CHARS_PER_TOKEN = 4
+CALIBRATION_SMOOTHING = 0.2
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_calibration_lock = threading.Lock()
+
+
+def approximate_tokens(text):
+    """Kelimeleri ~4 karakterlik parçalara, noktalama ve sembolleri tek tokena sayan kaba tokenizer yaklaşımı."""
+    return sum(math.ceil(len(piece) / CHARS_PER_TOKEN) if piece[0].isalnum() or piece[0] == "_" else 1
+               for piece in _TOKEN_RE.findall(text or ""))
+
+
+def _load_calibration():
+    try:
+        with open(TOKEN_CALIBRATION_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class TokenCounter:
+    """Yerel yaklaşımı modelin gerçek sayacına göre ölçeklenen token sayacı.
+
+    `ratio` = gerçek / yaklaşık token oranıdır; `observe` ile her gerçek sayımda güncellenir ve diske yazılır.
+    """
+
+    def __init__(self, model_name=TOKEN_MODEL_NAME, ratio=None, persist=True):
+        self.model_name = model_name
+        self.persist = persist
+        stored = _load_calibration().get(model_name, {}) if persist else {}
+        self.ratio = ratio if ratio is not None else stored.get("ratio", 1.0)
+        self.samples = stored.get("samples", 0)
+
+    def count(self, text):
+        return int(math.ceil(approximate_tokens(text) * self.ratio))
+
+    def observe(self, text, actual_tokens):
+        raw = approximate_tokens(text)
+        if not raw or not actual_tokens:
+            return
+        observed = actual_tokens / raw
+        if self.samples:
+            self.ratio += CALIBRATION_SMOOTHING * (observed - self.ratio)
+        else:
+            self.ratio = observed
+        self.samples += 1
+        if self.persist:
+            self._save()
+
+    def _save(self):
+        with _calibration_lock:
+            calibration = _load_calibration()
+            calibration[self.model_name] = {"ratio": round(self.ratio, 4), "samples": self.samples}
+            os.makedirs(os.path.dirname(TOKEN_CALIBRATION_PATH), exist_ok=True)
+            tmp_path = f"{TOKEN_CALIBRATION_PATH}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(calibration, f, indent=2)
+            os.replace(tmp_path, TOKEN_CALIBRATION_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model_name=TOKEN_MODEL_NAME):
+    return TokenCounter(model_name)
+
+
+def prompt_overhead(build_prompt, counter):
+    """Transkript boşken prompt şablonunun kapladığı token sayısı."""
+    return counter.count(build_prompt(""))
+
+
+def record_prompt_tokens(prompt, actual, counter, metric_prefix):
+    """Tahmini ve gerçek prompt token sayısını metrik olarak kaydeder, sayacı gerçek değere göre kalibre eder.
+
+    `actual`, akış yanıtının `usage_metadata.prompt_token_count` değeridir; yoksa yalnızca tahmin kaydedilir.
+    """
+    estimated = counter.count(prompt)
+    record_metric(f"{metric_prefix}.prompt_tokens_estimated", estimated)
+    if not actual:
+        return estimated, None
+    record_metric(f"{metric_prefix}.prompt_tokens_actual", actual)
+    record_metric(f"{metric_prefix}.prompt_tokens_error_pct", (estimated - actual) / max(actual, 1) * 100)
+    counter.observe(prompt, actual)
+    return estimated, actual
@@ -0,0 +1,71 @@
+import os
+import glob
+import time
+import zipfile
+from collections import namedtuple
+import numpy as np
+
+TRANSCRIPT_CACHE_DIR = os.path.join(".cache", "transcripts")
+TRANSCRIPT_CACHE_TTL_SECONDS = int(os.getenv("TRANSCRIPT_CACHE_TTL_DAYS", "30")) * 24 * 3600
+PREFERRED_LANGUAGES = ["tr", "en", "en-US", "en-GB"]
+
+Segment = namedtuple("Segment", ["text", "start", "duration"])
+
+
+def track_rank(language_code, is_generated):
+    """Küçük değer daha iyi: tercih edilen dillerde elle hazırlanmış > otomatik, sonra diğer diller."""
+    if language_code in PREFERRED_LANGUAGES:
+        return 0, is_generated, PREFERRED_LANGUAGES.index(language_code)
+    return 1, is_generated, 0
+
+
+def _cache_path(video_id, language_code):
+    return os.path.join(TRANSCRIPT_CACHE_DIR, f"{video_id}.{language_code}.npz")
+
+
+def save_segments(video_id, language_code, is_generated, segments):
+    """Ham segmentleri tek metin bloğu + başlangıç/süre dizileri olarak sıkıştırılmış tek dosyada saklar."""
+    texts = [segment.text.replace("\n", " ") for segment in segments]
+    os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+    path = _cache_path(video_id, language_code)
+    # Geçici dosya `.npz` ile bitmez, yükleme glob'una takılmaz; açık dosyaya yazıldığı için numpy uzantı eklemez
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            text=np.frombuffer("\n".join(texts).encode("utf-8"), dtype=np.uint8),
+            start=np.asarray([segment.start for segment in segments], dtype=np.float32),
+            duration=np.asarray([segment.duration for segment in segments], dtype=np.float32),
+            language=np.asarray(language_code),
+            is_generated=np.asarray(bool(is_generated))
+        )
+    os.replace(tmp_path, path)
+
+
+def _load(path):
+    with np.load(path, allow_pickle=False) as data:
+        blob = data["text"].tobytes().decode("utf-8")
+        texts = blob.split("\n") if blob or len(data["start"]) else []
+        segments = [
+            Segment(text, float(start), float(duration))
+            for text, start, duration in zip(texts, data["start"], data["duration"])
+        ]
+        return segments, str(data["language"]), bool(data["is_generated"])
+
+
+def load_segments(video_id, ttl_seconds=TRANSCRIPT_CACHE_TTL_SECONDS):
+    """Videonun süresi dolmamış kayıtlı izlerinden en iyisini `(segmentler, dil)` olarak döner; yoksa (None, None)."""
+    candidates = []
+    now = time.time()
+    for path in glob.glob(os.path.join(TRANSCRIPT_CACHE_DIR, f"{glob.escape(video_id)}.*.npz")):
+        try:
+            if now - os.path.getmtime(path) > ttl_seconds:
+                continue
+            segments, language_code, is_generated = _load(path)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            continue
+        candidates.append((track_rank(language_code, is_generated), segments, language_code))
+    if not candidates:
+        return None, None
+    _, segments, language_code = min(candidates, key=lambda item: item[0])
+    return segments, language_code
@@ -1,100 +1,204 @@
-import re
-from youtube_transcript_api import YouTubeTranscriptApi
-from deep_translator import GoogleTranslator
-
-def get_enhanced_transcript(video_id):
-    transcript_api = YouTubeTranscriptApi()
-    transcript_list, detected_language = get_smart_transcript(video_id, transcript_api)
-    if not transcript_list:
-        return None, None
-
-    total_duration = transcript_list[-1].start + transcript_list[-1].duration
-    strategy = determine_length_strategy(total_duration)
-
-    if strategy == "long_video":
-        transcript_list = select_optimal_sections(transcript_list, total_duration)
-
-    translator = GoogleTranslator()
-    formatted_transcript = ""
-    current_section_start = 0
-    last_text = ""
-
-    for i, transcript in enumerate(transcript_list):
-        if not hasattr(transcript, 'text'): continue
-
-        text = transcript.text
-        start_time = transcript.start
-        cleaned_text = clean_transcript_text(text)
-
-        if detected_language == "tr":
-            translated_text = cleaned_text
-        else:
-            try:
-                translated = translator.translate(cleaned_text, dest='tr')
-                translated_text = improve_translation(cleaned_text, translated.text)
-            except:
-                translated_text = cleaned_text
-
-        if check_semantic_break_with_strategy(last_text, cleaned_text, start_time, current_section_start, strategy):
-            section_header = f"\n**🕒 {int(current_section_start//60):02d}:{int(current_section_start%60):02d} – {int(start_time//60):02d}:{int(start_time%60):02d}**\n"
-            formatted_transcript += section_header
-            current_section_start = start_time
-
-        time_stamp = f"`{int(start_time//60):02d}:{int(start_time%60):02d}`"
-        formatted_transcript += f"{time_stamp} {translated_text}\n"
-        last_text = cleaned_text
-
-    return check_and_truncate_transcript(formatted_transcript), strategy
-
-
-def get_smart_transcript(video_id, transcript_api):
-    for lang in [['tr'], ['en', 'en-US'], ['en-US'], ['auto']]:
-        try:
-            transcripts = transcript_api.fetch(video_id, languages=lang)
-            if transcripts:
-                return transcripts, lang[0]
-        except: pass
-    return None, None
-
-
-def determine_length_strategy(duration_seconds):
-    return "normal" if duration_seconds/60 <= 30 else "long_video"
-
-
-def select_optimal_sections(transcripts, total_duration):
-    target = 1800
-    start_time = 0 if total_duration/60 <= 60 else (total_duration - target) / 2
-    end_time = start_time + target
-    selected = [t for t in transcripts if start_time <= t.start <= end_time]
-    return selected[::4] if len(selected) > 100 else selected
-
-
-def check_semantic_break_with_strategy(last_text, current_text, now, start, strategy):
-    min_d = 180 if strategy == "normal" else 300
-    max_d = 600 if strategy == "normal" else 900
-    if now - start < min_d: return False
-    if now - start > max_d: return True
-    if not last_text or not current_text: return False
-    return any(w in current_text.lower() and w in last_text.lower() for w in ['now', 'next', 'finally', 'so', 'okay', 'right'])
-
-
-def clean_transcript_text(text):
-    text = re.sub(r'\b(um+|uh+|ah+|hmm+|huh+)\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b(like|you know|i mean|basically|actually)\b', '', text, flags=re.IGNORECASE)
-    return re.sub(r'\s+', ' ', text).strip()
-
-
-def improve_translation(original, translated):
-    corrections = {"I'm": "Ben", "I am": "Ben", "So": "Yani", "Now": "Şimdi", "Okay": "Tamam"}
-    for eng, tr in corrections.items():
-        if eng.lower() in original.lower():
-            translated = translated.replace(eng, tr)
-    return translated
-
-
-def check_and_truncate_transcript(transcript, max_tokens=800000):
-    estimated = len(transcript.split()) * 1.3
-    if estimated <= max_tokens:
-        return transcript
-    target = int(len(transcript) * (0.5 if estimated < 2 * max_tokens else 0.3))
-    return transcript[:target] + "\n\n... (Transkript kısaltıldı)"
+import re
+import hashlib
+from youtube_transcript_api import YouTubeTranscriptApi
+from translation_utils import translate_lines, CircuitBreaker
+from translation_memory import get_translation_memory
+from token_budget import get_token_counter, DETAILED_PROMPT_TOKEN_BUDGET
+from transcript_cache import Segment, load_segments, save_segments, track_rank
+
+PIPELINE_WINDOW_LINES = 400
+
+
+def get_enhanced_transcript(video_id, translator=None, progress_callback=None, max_tokens=DETAILED_PROMPT_TOKEN_BUDGET):
+    sections, strategy = iter_transcript_sections(video_id, translator, progress_callback)
+    if sections is None:
+        return None, None
+    return collect_sections(sections, max_tokens), strategy
+
+
+def get_transcript_sections(video_id, translator=None, progress_callback=None):
+    """Uzun videolarda pencere seçmeden transkriptin tamamını bölüm generator'ı olarak döner (map-reduce için);
+    bölümler map adımı tarafından hazır oldukça tüketilir."""
+    return iter_transcript_sections(video_id, translator, progress_callback, select_window=False)
+
+
+def iter_transcript_sections(video_id, translator=None, progress_callback=None, select_window=True):
+    """fetch → clean → translate → sectionize → format hattını kurar; bölümleri hazır oldukça üreten
+    bir generator ve uzunluk stratejisini döner. Transkript yoksa (None, None)."""
+    transcript_api = YouTubeTranscriptApi()
+    transcript_list, detected_language = get_smart_transcript(video_id, transcript_api)
+    if not transcript_list:
+        return None, None
+
+    total_duration = transcript_list[-1].start + transcript_list[-1].duration
+    strategy = determine_length_strategy(total_duration)
+
+    if strategy == "long_video" and select_window:
+        transcript_list = select_optimal_sections(transcript_list, total_duration)
+
+    segments = clean_segments(iter_segments(transcript_list))
+    segments = translate_segments(segments, detected_language, translator)
+    sections = sectionize_segments(segments, strategy)
+    if progress_callback:
+        sections = _report_progress(sections, transcript_list, progress_callback)
+    return format_sections(sections), strategy
+
+
+def iter_segments(transcript_list):
+    for transcript in transcript_list:
+        if hasattr(transcript, 'text'):
+            yield transcript.start, transcript.text
+
+
+def clean_segments(segments):
+    for start, text in segments:
+        yield start, clean_transcript_text(text)
+
+
+def translate_segments(segments, detected_language, translator=None, window=PIPELINE_WINDOW_LINES):
+    """Satırları `window` büyüklüğünde pencereler halinde çevirir; bellek kullanımı pencereyle sınırlı kalır.
+    Devre kesici tüm pencerelerde ortaktır: çevirmen düşerse transkriptin kalanı kaynak metinle devam eder."""
+    breaker = CircuitBreaker()
+    buffer = []
+    for segment in segments:
+        buffer.append(segment)
+        if len(buffer) >= window:
+            yield from _translate_window(buffer, detected_language, translator, breaker)
+            buffer = []
+    if buffer:
+        yield from _translate_window(buffer, detected_language, translator, breaker)
+
+
+def _translate_window(window, detected_language, translator, breaker=None):
+    cleaned_texts = [text for _, text in window]
+    if detected_language == "tr":
+        translated = cleaned_texts
+    else:
+        translated = get_translation_memory().translate(
+            cleaned_texts,
+            lambda missing: translate_lines(missing, translator, breaker=breaker),
+            source_lang=detected_language
+        )
+        translated = [improve_translation(cleaned, text) for cleaned, text in zip(cleaned_texts, translated)]
+    for (start, cleaned), text in zip(window, translated):
+        yield start, cleaned, text
+
+
+def sectionize_segments(segments, strategy):
+    """Anlamsal kırılma noktalarında biten bölümleri {start, end, lines} olarak, tamamlandıkça üretir."""
+    lines = []
+    current_section_start = 0
+    last_text = ""
+    for start_time, cleaned_text, translated_text in segments:
+        if lines and check_semantic_break_with_strategy(last_text, cleaned_text, start_time, current_section_start, strategy):
+            yield {"start": current_section_start, "end": start_time, "lines": lines}
+            lines = []
+            current_section_start = start_time
+        lines.append((start_time, translated_text))
+        last_text = cleaned_text
+    if lines:
+        yield {"start": current_section_start, "end": lines[-1][0], "lines": lines}
+
+
+def _format_timestamp(seconds):
+    return f"{int(seconds//60):02d}:{int(seconds%60):02d}"
+
+
+def format_sections(sections):
+    for section in sections:
+        header = f"**🕒 {_format_timestamp(section['start'])} – {_format_timestamp(section['end'])}**"
+        body = "\n".join(f"`{_format_timestamp(start)}` {text}" for start, text in section["lines"])
+        yield {"start": section["start"], "end": section["end"], "text": f"{header}\n{body}\n"}
+
+
+def _report_progress(sections, transcript_list, progress_callback):
+    first_start = transcript_list[0].start
+    span = max(transcript_list[-1].start - first_start, 1)
+    for section in sections:
+        progress_callback(min(1.0, (section["end"] - first_start) / span))
+        yield section
+    progress_callback(1.0)
+
+
+def collect_sections(sections, max_tokens=DETAILED_PROMPT_TOKEN_BUDGET, counter=None):
+    """Yalnızca bütün bölümleri token bütçesine sığdığı kadar birleştirir; bütçe dolunca hattı durdurur ve kısaltma notu ekler."""
+    counter = counter or get_token_counter()
+    parts = []
+    estimated = 0
+    for section in sections:
+        section_tokens = counter.count(section["text"])
+        if parts and estimated + section_tokens > max_tokens:
+            parts.append("\n... (Transkript kısaltıldı)")
+            break
+        parts.append(section["text"])
+        estimated += section_tokens
+    return "\n".join(parts)
+
+
+def transcript_hash(video_id):
+    """Videonun ham transkriptinin (dil + segment metinleri) özetini döner; transkript yoksa None."""
+    segments, language_code = get_smart_transcript(video_id, YouTubeTranscriptApi())
+    if not segments:
+        return None
+    digest = hashlib.sha256(language_code.encode("utf-8"))
+    for segment in segments:
+        digest.update(b"\n" + segment.text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_smart_transcript(video_id, transcript_api):
+    """Önce disk önbelleğine bakar; yoksa tek `list` çağrısıyla izleri alıp en uygun olanı (elle hazırlanmış
+    izler otomatiklere tercih edilir) indirir ve ham segmentleri önbelleğe yazar."""
+    segments, language_code = load_segments(video_id)
+    if segments:
+        return segments, language_code
+
+    try:
+        tracks = list(transcript_api.list(video_id))
+    except:
+        return None, None
+
+    for track in sorted(tracks, key=lambda track: track_rank(track.language_code, track.is_generated)):
+        try:
+            segments = [Segment(snippet.text.replace("\n", " "), snippet.start, snippet.duration) for snippet in track.fetch()]
+        except:
+            continue
+        if segments:
+            save_segments(video_id, track.language_code, track.is_generated, segments)
+            return segments, track.language_code
+    return None, None
+
+
+def determine_length_strategy(duration_seconds):
+    return "normal" if duration_seconds/60 <= 30 else "long_video"
+
+
+def select_optimal_sections(transcripts, total_duration):
+    target = 1800
+    start_time = 0 if total_duration/60 <= 60 else (total_duration - target) / 2
+    end_time = start_time + target
+    selected = [t for t in transcripts if start_time <= t.start <= end_time]
+    return selected[::4] if len(selected) > 100 else selected
+
+
+def check_semantic_break_with_strategy(last_text, current_text, now, start, strategy):
+    min_d = 180 if strategy == "normal" else 300
+    max_d = 600 if strategy == "normal" else 900
+    if now - start < min_d: return False
+    if now - start > max_d: return True
+    if not last_text or not current_text: return False
+    return any(w in current_text.lower() and w in last_text.lower() for w in ['now', 'next', 'finally', 'so', 'okay', 'right'])
+
+
+def clean_transcript_text(text):
+    text = re.sub(r'\b(um+|uh+|ah+|hmm+|huh+)\b', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\b(like|you know|i mean|basically|actually)\b', '', text, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def improve_translation(original, translated):
+    corrections = {"I'm": "Ben", "I am": "Ben", "So": "Yani", "Now": "Şimdi", "Okay": "Tamam"}
+    for eng, tr in corrections.items():
+        if eng.lower() in original.lower():
+            translated = translated.replace(eng, tr)
+    return translated
@@ -0,0 +1,200 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+TRANSLATION_MEMORY_PATH = os.path.join(".cache", "translation_memory.sqlite")
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "200000"))
+EVICTION_RATIO = 0.9
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    return _WHITESPACE_RE.sub(" ", text or "").strip().lower()
+
+
+def memory_key(source_lang, target_lang, text):
+    raw = f"{source_lang}\x1f{target_lang}\x1f{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """(kaynak dil, hedef dil, normalize metin hash'i) anahtarlı, videolar arası paylaşılan kalıcı çeviri belleği.
+
+    Kayıt sayısı `max_entries`'i aşınca en uzun süredir kullanılmayanlar silinir.
+    """
+
+    def __init__(self, path=TRANSLATION_MEMORY_PATH, max_entries=TRANSLATION_MEMORY_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory (
+                    key TEXT PRIMARY KEY,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_last_used ON memory(last_used)")
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Bağlantıyı tek bir işlem için açar; gövde hata verse de bağlantı kapanır."""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup_many(self, texts, source_lang, target_lang="tr"):
+        """Bellekte bulunan metinler için {anahtar: çeviri} döner ve kullanım zamanlarını günceller."""
+        keys = list(dict.fromkeys(memory_key(source_lang, target_lang, text) for text in texts))
+        found = {}
+        with self._transaction() as conn:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                found.update(conn.execute(
+                    f"SELECT key, translated_text FROM memory WHERE key IN ({placeholders})", batch
+                ).fetchall())
+            now = time.time()
+            conn.executemany(
+                "UPDATE memory SET hits = hits + 1, last_used = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+        return found
+
+    def store_many(self, pairs, source_lang, target_lang="tr"):
+        now = time.time()
+        rows = [
+            (memory_key(source_lang, target_lang, source), source_lang, target_lang, normalize_text(source), translated, now)
+            for source, translated in pairs
+        ]
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO memory (key, source_lang, target_lang, source_text, translated_text, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._evict_if_needed(conn)
+
+    def _evict_if_needed(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICTION_RATIO)
+        conn.execute(
+            "DELETE FROM memory WHERE key IN (SELECT key FROM memory ORDER BY last_used LIMIT ?)", (excess,)
+        )
+
+    def translate(self, texts, translate_fn, source_lang, target_lang="tr"):
+        """Önce belleğe bakar, yalnızca eksik (tekilleştirilmiş) metinleri `translate_fn`'e gönderir.
+
+        Çevirisi kaynakla aynı dönen metinler (çeviri hatası olabilir) belleğe yazılmaz.
+        """
+        keys = [memory_key(source_lang, target_lang, text) if text.strip() else None for text in texts]
+        found = self.lookup_many([text for text, key in zip(texts, keys) if key], source_lang, target_lang)
+
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key and key not in found and key not in missing:
+                missing[key] = text
+
+        with self._stats_lock:
+            self.hits += sum(1 for key in keys if key and key in found)
+            self.misses += sum(1 for key in keys if key and key not in found)
+
+        if missing:
+            translated = translate_fn(list(missing.values()))
+            pairs = list(zip(missing.values(), translated))
+            found.update(zip(missing.keys(), translated))
+            self.store_many(
+                [(source, target) for source, target in pairs if normalize_text(source) != normalize_text(target)],
+                source_lang, target_lang
+            )
+
+        return [found[key] if key else text for text, key in zip(texts, keys)]
+
+    def export_jsonl(self, path):
+        count = 0
+        with self._transaction() as conn, open(path, "w", encoding="utf-8") as f:
+            for source_lang, target_lang, source_text, translated_text in conn.execute(
+                "SELECT source_lang, target_lang, source_text, translated_text FROM memory ORDER BY hits DESC"
+            ):
+                f.write(json.dumps({
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "source": source_text,
+                    "translation": translated_text
+                }, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, path):
+        """Dışa aktarılmış veya elle hazırlanmış çeviri çiftlerini belleğe ekler; eklenen satır sayısını döner."""
+        grouped = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                langs = (entry.get("source_lang", "en"), entry.get("target_lang", "tr"))
+                grouped.setdefault(langs, []).append((entry["source"], entry["translation"]))
+        for (source_lang, target_lang), pairs in grouped.items():
+            self.store_many(pairs, source_lang, target_lang)
+        return sum(len(pairs) for pairs in grouped.values())
+
+    def stats(self):
+        with self._transaction() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory():
+    return TranslationMemory()
+
+
+def main(argv):
+    if len(argv) != 2 or argv[0] not in ("import", "export"):
+        print("Kullanım: python translation_memory.py import|export <dosya.jsonl>")
+        return
+    memory = get_translation_memory()
+    if argv[0] == "export":
+        print(f"{memory.export_jsonl(argv[1])} çeviri dışa aktarıldı: {argv[1]}")
+    else:
+        print(f"{memory.import_jsonl(argv[1])} çeviri içe aktarıldı.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
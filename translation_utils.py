@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TRANSLATION_BATCH_CHARS = int(os.getenv("TRANSLATION_BATCH_CHARS", "4500"))
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_RETRIES = int(os.getenv("TRANSLATION_RETRIES", "3"))
+TRANSLATION_RETRY_DELAY = 0.5
+TRANSLATION_MAX_CONSECUTIVE_FAILURES = int(os.getenv("TRANSLATION_MAX_CONSECUTIVE_FAILURES", "3"))
+TRANSLATION_RETRY_BUDGET_SECONDS = float(os.getenv("TRANSLATION_RETRY_BUDGET_SECONDS", "10"))
+BATCH_DELIMITER = "\n"
+
+
+class GoogleTextTranslator:
+    """deep_translator üzerinden Google Translate; her iş parçacığı kendi istemcisini kullanır."""
+
+    def __init__(self, target="tr", source="auto"):
+        self.target = target
+        self.source = source
+        self._local = threading.local()
+
+    def __call__(self, text):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            from deep_translator import GoogleTranslator
+            client = self._local.client = GoogleTranslator(source=self.source, target=self.target)
+        return client.translate(text) or ""
+
+
+class LocalTranslator:
+    """Ağa çıkmayan yerel çevirmen; test ve benchmark için gecikme ve dönüşüm taklit eder."""
+
+    def __init__(self, latency=0.0, transform=None):
+        self.latency = latency
+        self.transform = transform or (lambda text: text)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return BATCH_DELIMITER.join(self.transform(line) for line in text.split(BATCH_DELIMITER))
+
+
+def make_batches(texts, max_chars=TRANSLATION_BATCH_CHARS, delimiter=BATCH_DELIMITER):
+    """Boş olmayan satır indekslerini, birleştirilmiş uzunluğu `max_chars`'ı aşmayan gruplara böler."""
+    batches, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        if not text.strip():
+            continue
+        added = len(text) + (len(delimiter) if current else 0)
+        if current and size + added > max_chars:
+            batches.append(current)
+            current, size = [], 0
+            added = len(text)
+        current.append(i)
+        size += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+class CircuitBreaker:
+    """Çevirmen erişilemez olduğunda transkriptin kalanını beklemeden kaynak metinle bitirmek için devre kesici.
+
+    Art arda `max_failures` toplu/satır çevirisi başarısız olursa açılır ve sonraki çağrılar hiç yapılmaz.
+    Yeniden denemelerin toplam bekleme süresi `retry_budget` saniyeyle sınırlıdır; bütçe bitince tek deneme yapılır.
+    """
+
+    def __init__(self, max_failures=TRANSLATION_MAX_CONSECUTIVE_FAILURES, retry_budget=TRANSLATION_RETRY_BUDGET_SECONDS):
+        self.max_failures = max_failures
+        self.retry_budget = retry_budget
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.failures >= self.max_failures
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures == self.max_failures:
+                print("UYARI: Çeviri servisine ulaşılamıyor; kalan satırlar çevrilmeden kullanılacak.")
+
+    def take_delay(self, delay):
+        with self._lock:
+            if delay > self.retry_budget:
+                return False
+            self.retry_budget -= delay
+            return True
+
+
+def _with_retry(translator, text, retries, breaker):
+    for attempt in range(retries):
+        try:
+            return translator(text)
+        except Exception:
+            delay = TRANSLATION_RETRY_DELAY * 2 ** attempt
+            if attempt == retries - 1 or breaker.is_open or not breaker.take_delay(delay):
+                raise
+            time.sleep(delay)
+
+
+def _translate_batch(translator, lines, retries, delimiter, breaker):
+    """Toplu çeviri satır sayısını korumazsa eşleme kaymasın diye satır satır çeviriye düşer;
+    devre kesici açıksa kalan satırlar kaynak metinle döner."""
+    if breaker.is_open:
+        return list(lines)
+    try:
+        translated = _with_retry(translator, delimiter.join(lines), retries, breaker).split(delimiter)
+        breaker.record_success()
+        if len(translated) == len(lines):
+            return [line.strip() for line in translated]
+    except Exception:
+        breaker.record_failure()
+
+    results = []
+    for line in lines:
+        if breaker.is_open:
+            results.append(line)
+            continue
+        try:
+            results.append(_with_retry(translator, line, retries, breaker).strip() or line)
+            breaker.record_success()
+        except Exception:
+            breaker.record_failure()
+            results.append(line)
+    return results
+
+
+def translate_lines(texts, translator=None, max_chars=TRANSLATION_BATCH_CHARS, workers=TRANSLATION_WORKERS,
+                    retries=TRANSLATION_RETRIES, delimiter=BATCH_DELIMITER, breaker=None):
+    """Satırları toplu ve eşzamanlı çevirir; sonuç listesi girdiyle aynı sırada ve uzunluktadır.
+
+    Boş satırlar olduğu gibi döner; çevrilemeyen satırlar orijinal metniyle kalır. Aynı transkriptin
+    pencereleri arasında `breaker` paylaşılırsa çevirmen düştüğünde kalan pencereler hiç beklemez.
+    """
+    translator = translator or GoogleTextTranslator()
+    breaker = breaker or CircuitBreaker()
+    texts = [text.replace(delimiter, " ") for text in texts]
+    results = list(texts)
+    batches = make_batches(texts, max_chars, delimiter)
+    if not batches:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as pool:
+        futures = [
+            (batch, pool.submit(_translate_batch, translator, [texts[i] for i in batch], retries, delimiter, breaker))
+            for batch in batches
+        ]
+        for batch, future in futures:
+            for i, translated in zip(batch, future.result()):
+                results[i] = translated
+    return results
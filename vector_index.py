@@ -0,0 +1,405 @@
+import os
+import json
+import math
+import pickle
+import random
+import threading
+import faiss
+import numpy as np
+from langchain.vectorstores import FAISS
+from langchain.docstore.document import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from hybrid_retriever import KeywordIndex
+
+VECTOR_INDEX_DIR = os.path.join(".cache", "vector_index")
+MANIFEST_FILENAME = "manifest.json"
+CHUNK_SIZE = 1200
+CHUNK_OVERLAP = 300
+CHUNKER_VERSION = f"recursive-{CHUNK_SIZE}-{CHUNK_OVERLAP}-v1"
+EMBEDDING_COMPACTION_RATIO = 2.0
+EMBEDDING_COMPACTION_MIN_ENTRIES = 1000
+
+FAISS_INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat").lower()
+FAISS_TRAIN_THRESHOLD = int(os.getenv("FAISS_TRAIN_THRESHOLD", "20000"))
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+FAISS_EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "64"))
+FAISS_HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+FAISS_PQ_M = int(os.getenv("FAISS_PQ_M", "48"))
+FAISS_MMAP = os.getenv("FAISS_MMAP", "0") == "1"
+# FAISS kümeleme merkez başına ~39 eğitim noktası ister; PQ alt kodlayıcıları 256 merkezlidir
+FAISS_MIN_TRAIN_POINTS = {"ivf_flat": 39, "ivf_pq": 39 * 256}
+
+
+def get_text_splitter():
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
+        length_function=len
+    )
+
+
+def load_note_documents(filepath, splitter=None):
+    splitter = splitter or get_text_splitter()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    sections = []
+
+    if data.get("video_title"):
+        sections.append(f"Video Başlığı: {data['video_title']}")
+
+    if data.get("analysis_result"):
+        sections.append(f"İçerik Analizi:\n{data['analysis_result']}")
+
+    if data.get("user_notes"):
+        sections.append(f"Kullanıcı Notları:\n{data['user_notes']}")
+
+    raw_text = "\n\n".join(sections)
+
+    metadata = {
+        "source": data.get("source_url", "bilinmiyor"),
+        "title": data.get("video_title", data.get("title", "Bilinmeyen")),
+        "file_path": filepath,
+        "doc_type": "video_analysis"
+    }
+
+    docs = []
+    if raw_text.strip():
+        for i, chunk in enumerate(splitter.split_text(raw_text)):
+            chunk_metadata = metadata.copy()
+            chunk_metadata["chunk_id"] = i
+            docs.append(Document(page_content=chunk, metadata=chunk_metadata))
+    return docs
+
+
+def _chunk_id(filepath, i):
+    return f"{filepath}#{i}"
+
+
+def _embedding_model_name(embeddings):
+    return getattr(embeddings, "model_name", type(embeddings).__name__)
+
+
+def index_factory_string(index_type, ntotal, dim):
+    if index_type == "hnsw":
+        return f"HNSW{FAISS_HNSW_M}"
+    nlist = max(1, min(int(4 * math.sqrt(ntotal)), ntotal // 39))
+    if index_type == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if index_type == "ivf_pq":
+        pq_m = max(m for m in range(1, FAISS_PQ_M + 1) if dim % m == 0)
+        return f"IVF{nlist},PQ{pq_m}"
+    return "Flat"
+
+
+def apply_search_params(index):
+    params = faiss.ParameterSpace()
+    for name, value in (("nprobe", FAISS_NPROBE), ("efSearch", FAISS_EF_SEARCH)):
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass
+
+
+def ensure_direct_map(index, rebuild=False):
+    """IVF indekslerinde etiket → ters liste eşlemesini (Hashtable) kurar.
+
+    MMR araması aday vektörleri `reconstruct` ile geri okur; bu eşleme olmadan IVF indeksleri
+    "direct map not initialized" hatası verir. Hashtable türü `remove_ids` ile uyumludur.
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is None:
+        return
+    if rebuild or ivf.direct_map.type != faiss.DirectMap.Hashtable:
+        ivf.set_direct_map_type(faiss.DirectMap.NoMap)
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+
+
+def training_threshold(index_type):
+    return max(FAISS_TRAIN_THRESHOLD, FAISS_MIN_TRAIN_POINTS.get(index_type, 0))
+
+
+def _compact_ivf_labels(index, removed_labels):
+    """`remove_ids` sonrası IVF listelerindeki etiketleri Flat'teki gibi ardışık hale getirir.
+
+    LangChain silmeden sonra docstore eşlemesini 0..n-1 olarak yeniden numaralandırır; IVF ise etiketleri
+    kaydırmaz. Etiketler ters listelerde yerinde güncellenir, vektörler yeniden kodlanmaz.
+    """
+    invlists = faiss.extract_index_ivf(index).invlists
+    for list_no in range(invlists.nlist):
+        size = invlists.list_size(list_no)
+        if not size:
+            continue
+        ids_ptr = invlists.get_ids(list_no)
+        labels = faiss.rev_swig_ptr(ids_ptr, size)
+        labels -= np.searchsorted(removed_labels, labels)
+        invlists.release_ids(list_no, ids_ptr)
+    ensure_direct_map(index, rebuild=True)
+
+
+def delete_from_ivf(vectorstore, doc_ids):
+    reverse = {doc_id: label for label, doc_id in vectorstore.index_to_docstore_id.items()}
+    doc_ids = [doc_id for doc_id in doc_ids if doc_id in reverse]
+    if not doc_ids:
+        return
+    removed_labels = np.sort(np.asarray([reverse[doc_id] for doc_id in doc_ids], dtype=np.int64))
+    vectorstore.delete(doc_ids)
+    _compact_ivf_labels(vectorstore.index, removed_labels)
+
+
+def train_index(vectors, index_type):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1]
+    index = faiss.index_factory(dim, index_factory_string(index_type, len(vectors), dim), faiss.METRIC_L2)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    ensure_direct_map(index)
+    apply_search_params(index)
+    return index
+
+
+class PersistentVectorIndex:
+    """Not dosyası bazında güncellenen, diske kaydedilen FAISS indeksi.
+
+    Korpus `FAISS_TRAIN_THRESHOLD` chunk'ı (IVF türleri için en az `FAISS_MIN_TRAIN_POINTS`) geçene kadar düz
+    (Flat) indeks kullanılır; sonra `FAISS_INDEX_TYPE` ayarına göre IVF-Flat, HNSW veya IVF-PQ indeksi eğitilir.
+    Flat ve IVF indekslerinden silme `remove_ids` ile yapılır; silmeyi desteklemeyen HNSW, önbellekteki
+    embedding'lerle yeniden kurulur.
+    """
+
+    def __init__(self, embeddings, index_dir=VECTOR_INDEX_DIR, index_type=FAISS_INDEX_TYPE):
+        if index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(f"Geçersiz FAISS indeks türü: {index_type}")
+        self.embeddings = embeddings
+        self.index_dir = index_dir
+        self.index_type = index_type
+        self.vectorstore = None
+        self.keyword_index = KeywordIndex()
+        self.files = {}
+        self._mmap_loaded = False
+        self._lock = threading.RLock()
+        self._splitter = get_text_splitter()
+        self._load()
+
+    def _manifest_header(self):
+        return {
+            "chunker": CHUNKER_VERSION,
+            "embedding_model": _embedding_model_name(self.embeddings),
+            "index_type": self.index_type
+        }
+
+    def _load(self):
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if any(manifest.get(key) != value for key, value in self._manifest_header().items()):
+                return
+            if any(entry["ids"] for entry in manifest.get("files", {}).values()):
+                self.vectorstore = self._load_vectorstore()
+                for doc_id in self.vectorstore.index_to_docstore_id.values():
+                    self.keyword_index.add(doc_id, self.vectorstore.docstore.search(doc_id).page_content)
+            self.files = manifest.get("files", {})
+        except Exception as e:
+            print(f"Vektör indeksi yüklenemedi, yeniden oluşturulacak: {e}")
+            self.vectorstore = None
+            self.keyword_index = KeywordIndex()
+            self.files = {}
+
+    def _load_vectorstore(self):
+        index_path = os.path.join(self.index_dir, "index.faiss")
+        index = None
+        if FAISS_MMAP:
+            try:
+                index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                self._mmap_loaded = True
+            except RuntimeError:
+                index = None
+        if index is None:
+            index = faiss.read_index(index_path)
+        ensure_direct_map(index)
+        apply_search_params(index)
+        with open(os.path.join(self.index_dir, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return FAISS(self.embeddings, index, docstore, index_to_docstore_id)
+
+    def _ensure_writable(self):
+        if self._mmap_loaded and self.vectorstore is not None:
+            self.vectorstore.index = faiss.read_index(os.path.join(self.index_dir, "index.faiss"))
+            ensure_direct_map(self.vectorstore.index)
+            apply_search_params(self.vectorstore.index)
+        self._mmap_loaded = False
+
+    def _is_flat(self):
+        return self.vectorstore is not None and isinstance(self.vectorstore.index, faiss.IndexFlat)
+
+    def _maybe_train(self):
+        if (self.index_type == "flat" or not self._is_flat()
+                or self.vectorstore.index.ntotal < training_threshold(self.index_type)):
+            return
+        vectors = self.vectorstore.index.reconstruct_n(0, self.vectorstore.index.ntotal)
+        try:
+            self.vectorstore.index = train_index(vectors, self.index_type)
+        except RuntimeError as e:
+            print(f"FAISS {self.index_type} indeksi eğitilemedi, Flat indeks kullanılmaya devam ediliyor: {e}")
+
+    def _build_vectorstore(self, docs, ids):
+        if not docs:
+            return None
+        self.vectorstore = FAISS.from_documents(docs, self.embeddings, ids=ids)
+        self._maybe_train()
+        return self.vectorstore
+
+    def save(self):
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            if self.vectorstore is not None and not self._mmap_loaded:
+                self._maybe_train()
+                index_path = os.path.join(self.index_dir, "index.faiss")
+                faiss.write_index(self.vectorstore.index, f"{index_path}.tmp")
+                os.replace(f"{index_path}.tmp", index_path)
+                pkl_path = os.path.join(self.index_dir, "index.pkl")
+                with open(f"{pkl_path}.tmp", "wb") as f:
+                    pickle.dump((self.vectorstore.docstore, self.vectorstore.index_to_docstore_id), f)
+                os.replace(f"{pkl_path}.tmp", pkl_path)
+            manifest = dict(self._manifest_header(), files=self.files)
+            manifest_path = os.path.join(self.index_dir, MANIFEST_FILENAME)
+            tmp_path = f"{manifest_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, manifest_path)
+
+    def delete_files(self, filepaths):
+        with self._lock:
+            ids = []
+            for filepath in filepaths:
+                entry = self.files.pop(filepath, None)
+                if entry:
+                    ids.extend(entry["ids"])
+            for doc_id in ids:
+                self.keyword_index.remove(doc_id)
+            if not ids or self.vectorstore is None:
+                return
+            self._ensure_writable()
+            if self._is_flat():
+                self.vectorstore.delete(ids)
+                return
+            if faiss.try_extract_index_ivf(self.vectorstore.index) is not None:
+                delete_from_ivf(self.vectorstore, ids)
+                return
+            remaining_ids = [doc_id for entry in self.files.values() for doc_id in entry["ids"]]
+            docs = [self.vectorstore.docstore.search(doc_id) for doc_id in remaining_ids]
+            self.vectorstore = self._build_vectorstore(docs, remaining_ids)
+
+    def delete_file(self, filepath):
+        self.delete_files([filepath])
+
+    def _add_file(self, filepath):
+        if not os.path.exists(filepath):
+            return 0
+        stat = os.stat(filepath)
+        docs = load_note_documents(filepath, self._splitter)
+        ids = [_chunk_id(filepath, i) for i in range(len(docs))]
+        if docs:
+            if self.vectorstore is None:
+                self._build_vectorstore(docs, ids)
+            else:
+                self._ensure_writable()
+                self.vectorstore.add_documents(docs, ids=ids)
+            for doc_id, doc in zip(ids, docs):
+                self.keyword_index.add(doc_id, doc.page_content)
+        self.files[filepath] = {"mtime": stat.st_mtime, "size": stat.st_size, "ids": ids}
+        return len(docs)
+
+    def upsert_file(self, filepath):
+        with self._lock:
+            self.delete_files([filepath])
+            return self._add_file(filepath)
+
+    def sync(self, notes_list, on_error=None):
+        """Not listesini manifest ile karşılaştırır; sadece değişen dosyaları yeniden gömer."""
+        with self._lock:
+            current = {}
+            for note in notes_list:
+                filepath = note.get('filepath')
+                if not filepath:
+                    continue
+                if 'mtime' in note:
+                    current[filepath] = (note['mtime'], note.get('size'))
+                elif os.path.exists(filepath):
+                    stat = os.stat(filepath)
+                    current[filepath] = (stat.st_mtime, stat.st_size)
+
+            removed = [filepath for filepath in self.files if filepath not in current]
+            changed = [
+                filepath for filepath, (mtime, size) in current.items()
+                if filepath not in self.files
+                or (self.files[filepath]["mtime"], self.files[filepath]["size"]) != (mtime, size)
+            ]
+
+            self.delete_files(removed + changed)
+            for filepath in changed:
+                try:
+                    self._add_file(filepath)
+                except Exception as e:
+                    if on_error:
+                        on_error(filepath, e)
+
+            if removed or changed:
+                self.save()
+                self.compact_embeddings_if_needed()
+            return {"upserted": len(changed), "deleted": len(removed)}
+
+    def live_texts(self):
+        if self.vectorstore is None:
+            return []
+        return [doc.page_content for doc in self.vectorstore.docstore._dict.values()]
+
+    def compact_embeddings_if_needed(self):
+        """Embedding önbelleğindeki sahipsiz vektörler canlı chunk sayısını belirgin şekilde aşarsa önbelleği sıkıştırır."""
+        if not hasattr(self.embeddings, "compact"):
+            return 0
+        live_count = sum(len(entry["ids"]) for entry in self.files.values())
+        entries = self.embeddings.stats()["entries"]
+        if entries < EMBEDDING_COMPACTION_MIN_ENTRIES or entries <= live_count * EMBEDDING_COMPACTION_RATIO:
+            return 0
+        return self.embeddings.compact(self.live_texts())
+
+    def stats(self):
+        if self.vectorstore is None:
+            return {"index_type": self.index_type, "active_index": None, "vectors": 0, "mmap": False}
+        return {
+            "index_type": self.index_type,
+            "active_index": type(self.vectorstore.index).__name__,
+            "vectors": self.vectorstore.index.ntotal,
+            "mmap": self._mmap_loaded
+        }
+
+    def measure_recall(self, sample_size=100, k=6, seed=0):
+        """Rastgele chunk vektörleriyle sorgulayıp aktif indeksin sonuçlarını tam (Flat) aramayla karşılaştırır; recall@k döner."""
+        with self._lock:
+            if self.vectorstore is None:
+                return None
+            labels = sorted(self.vectorstore.index_to_docstore_id)
+            texts = [
+                self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[label]).page_content
+                for label in labels
+            ]
+            vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+            exact = faiss.IndexFlatL2(vectors.shape[1])
+            exact.add(vectors)
+            sample = random.Random(seed).sample(range(len(labels)), min(sample_size, len(labels)))
+            queries = vectors[sample]
+            k = min(k, len(labels))
+            _, approx_ids = self.vectorstore.index.search(queries, k)
+            _, exact_rows = exact.search(queries, k)
+            hits = sum(
+                len(set(approx_row) & {labels[row] for row in exact_row})
+                for approx_row, exact_row in zip(approx_ids.tolist(), exact_rows.tolist())
+            )
+            return hits / (len(sample) * k)
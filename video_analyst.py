@@ -1,59 +1,106 @@
-def generate_quick_preview_prompt(title, description, comments, user_language="tr"):
-    short_comments = []
-    for comment in comments[:1]:
-        if len(comment) > 80:
-            short_comments.append(comment[:80] + "...")
-        else:
-            short_comments.append(comment)
-    
-    joined_comments = "\n".join([f"- {c}" for c in short_comments]) if short_comments else "Yorum bulunamadı"
-
-    prompt = f"""
-Bu video hakkında metadata analizi yap:
-
-📌 Başlık: {title}
-📝 Açıklama: {description[:200]}...
-💬 Yorumlar: {joined_comments}
-
-Video gerçekten ne anlatıyor?
-Neleri kullanıyor, ne hedefleniyor?
-Ben ne için bu videoyu izlemeli ve zaman ayırmalıyım?
-
-Hadi başlayalım, iyi talep vb. başlangıçlar yapma. Doğrudan analiz içeriğine başla! Başlık ve açıklamadaki anahtar kelimeleri analiz ederek akıcı bir şekilde cevap ver. Her başlık altında maksimum 1-2 cümle olsun. 
-"""
-    return prompt
-
-
-def generate_detailed_analysis_prompt(title, description, comments, transcript, user_language="tr"):
-    prompt = f"""
-Bu video transkriptini temiz ve anlamlı bir dokümana dönüştür:
-
-📌 Video: {title}
-📄 Transkript: {transcript}
-
-Kurallar:
-1. **Doğrudan içeriğe başla** - Video başlığı, Giriş cümleleri, açıklama veya chatbot tarzı ifadeler kullanma
-2. **Orijinal Anlatım Düzenini Koru:**
-   - Video nasıl anlatıyorsa o şekilde yaz
-   - Video'nun doğal akışını bozma
-3. **Temizle ve Düzenle:**
-   - Gereksiz sesleri çıkar (ummm, ahh)
-   - Devrik cümleleri düzelt
-   - Anlamsız tekrarları temizle
-   - Akıcı ve anlaşılır yap
-4. **Teknik İçeriği Koru:**
-   - Teknik terimleri açıkla
-   - Kod örneklerini düzgün formatla
-   - Önemli noktaları vurgula
-5. **Zaman Damgalarını Kullan:**
-   - Video akışını takip et
-   - Bölümleri belirt
-   - Önemli geçişleri göster
-
-ÖNEMLİ: Doğrudan video içeriğini yazmaya başla. "Harika bir fikir!", "İşte...", "Bu video..." gibi giriş cümleleri kullanma.
-"""
-    return prompt
-
-
-
-
+QUICK_PREVIEW_PROMPT_VERSION = "1"
+DETAILED_ANALYSIS_PROMPT_VERSION = "1"
+MAP_REDUCE_PROMPT_VERSION = "2"
+
+
+def generate_quick_preview_prompt(title, description, comments, user_language="tr"):
+    short_comments = []
+    for comment in comments[:1]:
+        if len(comment) > 80:
+            short_comments.append(comment[:80] + "...")
+        else:
+            short_comments.append(comment)
+    
+    joined_comments = "\n".join([f"- {c}" for c in short_comments]) if short_comments else "Yorum bulunamadı"
+
+    prompt = f"""
+Bu video hakkında metadata analizi yap:
+
+📌 Başlık: {title}
+📝 Açıklama: {description[:200]}...
+💬 Yorumlar: {joined_comments}
+
+Video gerçekten ne anlatıyor?
+Neleri kullanıyor, ne hedefleniyor?
+Ben ne için bu videoyu izlemeli ve zaman ayırmalıyım?
+
+Hadi başlayalım, iyi talep vb. başlangıçlar yapma. Doğrudan analiz içeriğine başla! Başlık ve açıklamadaki anahtar kelimeleri analiz ederek akıcı bir şekilde cevap ver. Her başlık altında maksimum 1-2 cümle olsun. 
+"""
+    return prompt
+
+
+def generate_detailed_analysis_prompt(title, description, comments, transcript, user_language="tr"):
+    prompt = f"""
+Bu video transkriptini temiz ve anlamlı bir dokümana dönüştür:
+
+📌 Video: {title}
+📄 Transkript: {transcript}
+
+Kurallar:
+1. **Doğrudan içeriğe başla** - Video başlığı, Giriş cümleleri, açıklama veya chatbot tarzı ifadeler kullanma
+2. **Orijinal Anlatım Düzenini Koru:**
+   - Video nasıl anlatıyorsa o şekilde yaz
+   - Video'nun doğal akışını bozma
+3. **Temizle ve Düzenle:**
+   - Gereksiz sesleri çıkar (ummm, ahh)
+   - Devrik cümleleri düzelt
+   - Anlamsız tekrarları temizle
+   - Akıcı ve anlaşılır yap
+4. **Teknik İçeriği Koru:**
+   - Teknik terimleri açıkla
+   - Kod örneklerini düzgün formatla
+   - Önemli noktaları vurgula
+5. **Zaman Damgalarını Kullan:**
+   - Video akışını takip et
+   - Bölümleri belirt
+   - Önemli geçişleri göster
+
+ÖNEMLİ: Doğrudan video içeriğini yazmaya başla. "Harika bir fikir!", "İşte...", "Bu video..." gibi giriş cümleleri kullanma.
+"""
+    return prompt
+
+
+def _format_seconds(seconds):
+    return f"{int(seconds//60):02d}:{int(seconds%60):02d}"
+
+
+def generate_section_analysis_prompt(title, section_text, section_index, user_language="tr"):
+    prompt = f"""
+Bu, uzun bir videonun transkriptinin {section_index}. bölümü. Bu bölümü temiz ve anlamlı bir doküman parçasına dönüştür:
+
+📌 Video: {title}
+📄 Transkript bölümü: {section_text}
+
+Kurallar:
+1. Sadece bu bölümdeki içeriği yaz; videonun geri kalanı hakkında tahminde bulunma
+2. Anlatım sırasını ve zaman damgalarını koru
+3. Gereksiz sesleri, devrik cümleleri ve tekrarları temizle
+4. Teknik terimleri ve kod örneklerini koru, kodu düzgün formatla
+5. Giriş veya kapanış cümlesi kullanma, doğrudan içeriğe başla
+"""
+    return prompt
+
+
+def generate_map_reduce_prompt(title, section_analyses, user_language="tr"):
+    """section_analyses: (başlangıç sn, bitiş sn, bölüm analizi) üçlüleri, zaman sırasıyla."""
+    sections_text = "\n\n".join(
+        f"### 🕒 {_format_seconds(start)} – {_format_seconds(end)}\n{analysis}"
+        for start, end, analysis in section_analyses
+    )
+    prompt = f"""
+Aşağıda uzun bir videonun bölüm bölüm hazırlanmış analizleri var. Bunları tek, tutarlı ve anlamlı bir dokümanda birleştir:
+
+📌 Video: {title}
+
+{sections_text}
+
+Kurallar:
+1. **Doğrudan içeriğe başla** - Video başlığı, giriş cümleleri veya chatbot tarzı ifadeler kullanma
+2. Bölümlerin zaman sırasını ve zaman damgalarını koru
+3. Bölümler arasında tekrar eden açıklamaları birleştir, çelişkileri giderecek şekilde düzenle
+4. Teknik terimleri, kod örneklerini ve önemli noktaları koru
+5. Bölüm analizlerinde olmayan bilgi ekleme
+
+ÖNEMLİ: Doğrudan video içeriğini yazmaya başla. "Harika bir fikir!", "İşte...", "Bu video..." gibi giriş cümleleri kullanma.
+"""
+    return prompt